@@ -0,0 +1,275 @@
+"""
+Benchmark of the parsing and validation pipeline of the scanner over
+synthetic pages, see benchmarks.synthetic.
+"""
+import json
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.stand_in import StandInServer
+from benchmarks.synthetic import make_jobs_page, make_profile_page
+from resources.blocking import BlockingPolicy
+from resources.models import JobsAndProfileSchema, JobSchema, JobsSchemaList, ProfileSchema
+from resources.session import SessionCache
+from scanners.upwork import UpWorkScanner
+from settings import BASE_DIR, logger as log
+from utils.columnar import export_columnar, pyarrow, read_columnar
+from utils.file_utils import export_json, export_ndjson, remove_folder
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+END_TO_END_SIZES = (10, 100, 500)
+
+STAND_IN_INFO = {'username': 'stand-in@example.com', 'password': 'stand-in', 'secret_answer': 'stand-in'}
+
+BASELINE_PATH = BASE_DIR / 'benchmarks' / 'baseline.json'
+
+
+@dataclass
+class Measure:
+    stage: str
+    size: int
+    seconds: float
+    peak_kib: float
+
+    @property
+    def key(self) -> str:
+        return f'{self.stage}@{self.size}'
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second."""
+        return self.size / self.seconds if self.seconds else 0.0
+
+
+def measure(stage: str, size: int, func: Callable[[], Any], repeat: int = 3) -> tuple[Measure, Any]:
+    """
+    Execute func repeat times keeping the best time, and once more tracing
+    the memory in order to get the peak of memory allocated.
+    :param stage: Name of the stage of the pipeline. Ex.: 'catch_jobs'
+    :param size: Number of items processed by func, used for the throughput.
+    :param func: Function without arguments to be measured.
+    :param repeat: Number of times that func is timed.
+    :return: Measure and value returned by func.
+    """
+    best = float('inf')
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measure(stage, size, best, peak / 1024), value
+
+
+def bench_size(scanner: UpWorkScanner, size: int, profile: ProfileSchema,
+               repeat: int = 3) -> List[Measure]:
+    """Measure every stage of the pipeline with a feed of size jobs."""
+    html_content = make_jobs_page(size)
+    measures = []
+
+    def run(stage, func):
+        result, value = measure(stage, size, func, repeat)
+        measures.append(result)
+        return value
+
+    soup = run('prepare_data', lambda: scanner.prepare_data(html_content, 'jobs_page',
+                                                            scanner.parser, archive=False))
+    tiles = run('catch_jobs', lambda: scanner.catch_jobs(soup))
+    run('parse_job', lambda: [scanner.parse_job(tile) for tile in tiles])
+    extracted = [scanner.job_extractor.extract(tile) for tile in tiles]
+    jobs = run('normalize_job', lambda: [scanner.normalize_job(job) for job in extracted])
+    schemas = run('job_schema', lambda: [JobSchema(**job) for job in jobs])
+
+    with tempfile.TemporaryDirectory() as folder:
+        filename = str(Path(folder) / 'upwork')
+        run('export_json', lambda: export_json(
+            JobsAndProfileSchema(jobs=schemas, profile=profile).model_dump_json(indent=2),
+            filename=filename))
+        run('export_ndjson', lambda: export_ndjson(iter(schemas), filename))
+    return measures
+
+
+def run_benchmarks(sizes: Sequence[int] = DEFAULT_SIZES, repeat: int = 3,
+                   parser: Optional[str] = None) -> List[Measure]:
+    """
+    Measure the pipeline with synthetic feeds of every size in sizes, and
+    the parsing of a synthetic profile.
+    :param sizes: Quantities of jobs of the feeds. Ex.: (10, 100, 1000, 10000)
+    :param repeat: Number of times that every stage is timed.
+    :param parser: Name of the parser backend, see resources.parsers.
+    :return: Measures of every stage for every size.
+    """
+    scanner = UpWorkScanner({}, parser)
+    profile_soup = scanner.prepare_data(make_profile_page(), 'profile_page', parser, archive=False)
+    profile_measure, profile = measure('parse_profile', 1,
+                                       lambda: ProfileSchema(**scanner.parse_profile(profile_soup)),
+                                       repeat)
+    measures = [profile_measure]
+    for size in sizes:
+        measures.extend(bench_size(scanner, size, profile, repeat))
+    return measures
+
+
+def stand_in_scanner(url: str, parser: Optional[str], folder: Path) -> UpWorkScanner:
+    """
+    Scanner of the stand-in of the site which keeps nothing out of folder, so
+    the synthetic jobs and the session never reach the data of the real site,
+    and every run parses the whole feed and goes through the login.
+    """
+    scanner = UpWorkScanner(STAND_IN_INFO, parser, url=url)
+    scanner.job_index = None
+    scanner.session = SessionCache(STAND_IN_INFO['username'], folder / 'sessions')
+    return scanner
+
+
+def run_end_to_end(sizes: Sequence[int] = END_TO_END_SIZES, page_size: int = 10,
+                   latency: float = 0.0, parser: Optional[str] = None) -> List[Measure]:
+    """
+    Measure the whole scanner (login, scroll, scan of the jobs and of the
+    profile) against a local stand-in of the site, see benchmarks.stand_in.
+    Every size is executed once, with a new browser.
+    :param sizes: Quantities of jobs of the feeds. Ex.: (10, 100, 500)
+    :param page_size: Jobs loaded on every scroll.
+    :param latency: Seconds added to every request to the stand-in.
+    :param parser: Name of the parser backend, see resources.parsers.
+    :return: Measures of the stage 'end_to_end' for every size. The peak of
+             memory isn't traced, the browser runs in another process.
+    """
+    measures = []
+    for size in sizes:
+        with StandInServer(jobs=size, page_size=page_size, latency=latency) as server, \
+                tempfile.TemporaryDirectory() as folder:
+            scanner = stand_in_scanner(server.url, parser, Path(folder))
+            start = time.perf_counter()
+            scanner.run()
+            seconds = time.perf_counter() - start
+        scanned = len(scanner.scanned_data.get('jobs', []))
+        if scanned != size:
+            log.warning(f'End to end with {size} jobs scanned {scanned} of them')
+        measures.append(Measure('end_to_end', size, seconds, 0.0))
+    return measures
+
+
+def compare_blocking(jobs: int = 30, page_size: int = 10, latency: float = 0.0,
+                     parser: Optional[str] = None) -> str:
+    """
+    Execute the scanner against the stand-in of the site, which serves images,
+    fonts and a stylesheet with every page, without blocking requests and with
+    the policy of the settings, see resources.blocking. It needs Chrome.
+    :param jobs: Quantity of jobs of the feed.
+    :param page_size: Jobs loaded on every scroll.
+    :param latency: Seconds added to every request to the stand-in.
+    :param parser: Name of the parser backend, see resources.parsers.
+    :return: Text of the table with the network stats of both runs.
+    """
+    policies = {'none': BlockingPolicy(), 'settings': BlockingPolicy.from_settings()}
+    lines = [f'{"policy":<10}{"seconds":>10}{"requests":>10}{"KiB":>10}{"saved":>8}'
+             f'{"saved KiB":>12}{"assets":>8}']
+    for name, policy in policies.items():
+        with StandInServer(jobs=jobs, page_size=page_size, latency=latency) as server, \
+                tempfile.TemporaryDirectory() as folder:
+            scanner = stand_in_scanner(server.url, parser, Path(folder))
+            scanner.blocking = policy
+            start = time.perf_counter()
+            scanner.run()
+            seconds = time.perf_counter() - start
+        stats = scanner.network_stats.report()
+        lines.append(f'{name:<10}{seconds:>10.2f}{stats["requests_loaded"]:>10}'
+                     f'{stats["bytes_loaded"] / 1024:>10.1f}{stats["requests_saved"]:>8}'
+                     f'{stats["bytes_saved_estimated"] / 1024:>12.1f}{server.assets_served:>8}')
+    return '\n'.join(lines)
+
+
+def export_and_reader(fmt: str, schemas: List[JobSchema],
+                      filename: str) -> tuple[Callable[[], Any], Callable[[], Any], Path]:
+    """Functions to write and read back the jobs in the format, and the path written."""
+    if fmt == 'json':
+        path = Path(f'{filename}.json')
+        return (lambda: export_json(JobsSchemaList(jobs=schemas).model_dump_json(), filename),
+                lambda: JobsSchemaList.model_validate_json(path.read_text(encoding='utf-8-sig')),
+                path)
+    if fmt == 'ndjson':
+        path = Path(f'{filename}.ndjson')
+        return (lambda: export_ndjson(schemas, filename),
+                lambda: [JobSchema.model_validate_json(line) for line in path.read_text().splitlines()],
+                path)
+
+    path = Path(f'{filename}.{fmt}')
+
+    def write():
+        # The columnar formats append, so every write starts from scratch.
+        if path.is_dir():
+            remove_folder(path)
+        path.unlink(missing_ok=True)
+        export_columnar(schemas, filename, fmt)
+
+    return write, lambda: read_columnar(path), path
+
+
+def compare_exports(size: int = 10000, repeat: int = 3) -> str:
+    """
+    Compare the formats of export of a feed of size jobs by the time to write
+    them, the size of the file and the time to read them back.
+    :return: Text of the table.
+    """
+    scanner = UpWorkScanner({})
+    tiles = scanner.catch_jobs(scanner.prepare_data(make_jobs_page(size), 'jobs_page', archive=False))
+    schemas = [JobSchema(**scanner.parse_job(tile)) for tile in tiles]
+    formats = ['json', 'ndjson', 'csv'] + (['parquet'] if pyarrow is not None else [])
+
+    lines = [f'{"format":<10}{"write s":>12}{"size KiB":>12}{"read s":>12}']
+    with tempfile.TemporaryDirectory() as folder:
+        for fmt in formats:
+            write, read, path = export_and_reader(fmt, schemas, str(Path(folder) / fmt))
+            written, _ = measure(f'write_{fmt}', size, write, repeat)
+            loaded, _ = measure(f'read_{fmt}', size, read, repeat)
+            files = path.rglob('*') if path.is_dir() else [path]
+            kib = sum(file.stat().st_size for file in files if file.is_file()) / 1024
+            lines.append(f'{fmt:<10}{written.seconds:>12.4f}{kib:>12.1f}{loaded.seconds:>12.4f}')
+    return '\n'.join(lines)
+
+
+def save_baseline(measures: List[Measure], path: Path = BASELINE_PATH) -> None:
+    """Keep the measures in a json file, to compare next runs against them.
+    The measures of other stages or sizes already saved are kept."""
+    saved = {key: asdict(m) for key, m in load_baseline(path).items()}
+    path.write_text(json.dumps({**saved, **{m.key: asdict(m) for m in measures}}, indent=2))
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Measure]:
+    """Read the measures saved with save_baseline, empty if there aren't."""
+    if not path.exists():
+        return {}
+    return {key: Measure(**value) for key, value in json.loads(path.read_text()).items()}
+
+
+def report(measures: List[Measure], baseline: Optional[Dict[str, Measure]] = None,
+           tolerance: float = 0.2) -> str:
+    """
+    Render a table with the measures and, when there is a baseline, the
+    change of time against it. Slower than tolerance is marked as regression.
+    :param measures: Measures of the current run.
+    :param baseline: Measures of a previous run, by key.
+    :param tolerance: Ratio of change accepted. Ex.: 0.2 means 20%
+    :return: Text of the table.
+    """
+    baseline = baseline or {}
+    lines = [f'{"stage":<14}{"size":>7}{"seconds":>12}{"items/s":>14}{"peak KiB":>12}{"vs baseline":>14}']
+    for m in measures:
+        change = ''
+        if previous := baseline.get(m.key):
+            ratio = m.seconds / previous.seconds - 1 if previous.seconds else 0.0
+            change = f'{ratio:+.1%}' + (' !' if ratio > tolerance else '')
+        lines.append(f'{m.stage:<14}{m.size:>7}{m.seconds:>12.5f}'
+                     f'{m.throughput:>14.1f}{m.peak_kib:>12.1f}{change:>14}')
+    return '\n'.join(lines)
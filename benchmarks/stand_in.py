@@ -0,0 +1,223 @@
+"""
+Local stand-in of upwork.com serving the login steps, an infinitely
+scrolling feed of synthetic jobs and a profile page, with the images,
+fonts and stylesheets of a real page, so the whole scanner can be
+executed and benchmarked offline, see benchmarks.synthetic.
+"""
+import secrets
+import threading
+import time
+from collections import Counter
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.synthetic import make_job_tiles, make_page, make_profile_page
+from settings import logger as log
+
+LOGIN_PATH = '/ab/account-security/login'
+SECRET_ANSWER_PATH = '/ab/account-security/device-authorization'
+FEED_PATH = '/nx/find-work/'
+TILES_PATH = '/nx/find-work/api/tiles'
+PROFILE_PATH = '/freelancers/~011cfba3bd0cf44f8d'
+ASSETS_PATH = '/static/'
+
+# Name of the asset -> content type and kilobytes, requested by every page after the login.
+ASSETS = {
+    'app.css': ('text/css', 20),
+    'inter.woff2': ('font/woff2', 60),
+    'logo.png': ('image/png', 15),
+    'banner.jpg': ('image/jpeg', 120),
+    'avatar.webp': ('image/webp', 30),
+}
+
+ASSETS_HTML = ''.join([
+    f'<link rel="stylesheet" href="{ASSETS_PATH}app.css">',
+    *(f'<img src="{ASSETS_PATH}{name}" alt="">' for name, (content_type, _) in ASSETS.items()
+      if content_type.startswith('image/')),
+])
+
+LOGIN_PAGE = """<!DOCTYPE html><html><head><title>Login - Upwork</title></head><body>
+<form method="post" action="%(action)s">
+<div><input id="login_username" name="username" type="text">
+<button type="button" onclick="document.getElementById('password').style.display = 'block';">Continue with Email</button>
+</div>
+<div id="password" style="display: none"><input name="login[password]" type="password">
+<button type="submit">Log in</button></div>
+</form></body></html>"""
+
+SECRET_ANSWER_PAGE = """<!DOCTYPE html><html><head><title>Device authorization - Upwork</title></head><body>
+<form method="post" action="%(action)s"><input id="login_answer" name="answer" type="password">
+<button type="submit">Continue</button></form></body></html>"""
+
+# Load the next jobs when the page is scrolled to the bottom, like the feed does.
+FEED_SCRIPT = """<script>
+(() => {
+    const list = document.querySelector('div[data-test="job-tile-list"]');
+    let loading = false;
+    window.addEventListener('scroll', () => {
+        const loaded = list.querySelectorAll(':scope > section').length;
+        if (loading || loaded >= %(jobs)d
+                || window.innerHeight + window.scrollY < document.body.scrollHeight - 200) { return; }
+        loading = true;
+        fetch('%(tiles)s?start=' + loaded).then(response => response.text()).then(html => {
+            list.insertAdjacentHTML('beforeend', html);
+            loading = false;
+        });
+    });
+})();
+</script>"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: 'StandInServer'
+
+    def do_GET(self) -> None:
+        self.server.delay()
+        url = urlsplit(self.path)
+        self.server.hits[url.path] += 1
+        if url.path.startswith(ASSETS_PATH):
+            return self.send_asset(url.path[len(ASSETS_PATH):])
+        if url.path == LOGIN_PATH:
+            return self.send_html(LOGIN_PAGE % {'action': LOGIN_PATH})
+        if url.path == SECRET_ANSWER_PATH:
+            return self.send_html(SECRET_ANSWER_PAGE % {'action': SECRET_ANSWER_PATH})
+        if not self.is_logged_in():
+            return self.redirect(LOGIN_PATH)
+        if url.path in ('/', FEED_PATH):
+            return self.send_html(self.server.feed_page())
+        if url.path == TILES_PATH:
+            start = int(parse_qs(url.query).get('start', ['0'])[0])
+            return self.send_html(self.server.tiles(start))
+        if url.path == PROFILE_PATH:
+            return self.send_html(self.server.profile_page())
+        self.send_error(404)
+
+    def do_POST(self) -> None:
+        self.server.delay()
+        path = urlsplit(self.path).path
+        self.server.hits[path] += 1
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if path == LOGIN_PATH and self.server.secret_answer:
+            return self.redirect(SECRET_ANSWER_PATH)
+        if path in (LOGIN_PATH, SECRET_ANSWER_PATH):
+            return self.redirect(FEED_PATH, cookie=self.server.token)
+        self.send_error(404)
+
+    def is_logged_in(self) -> bool:
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        return 'session' in cookie and cookie['session'].value == self.server.token
+
+    def redirect(self, location: str, cookie: Optional[str] = None) -> None:
+        self.send_response(302)
+        self.send_header('Location', location)
+        if cookie:
+            self.send_header('Set-Cookie', f'session={cookie}; Path=/')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def send_html(self, html: str) -> None:
+        self.send_body(html.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def send_asset(self, name: str) -> None:
+        if name not in ASSETS:
+            return self.send_error(404)
+        content_type, kilobytes = ASSETS[name]
+        if content_type == 'text/css':
+            # The font is requested once the stylesheet uses it.
+            css = (f'@font-face {{font-family: Inter; src: url("{ASSETS_PATH}inter.woff2");}}'
+                   f'body {{font-family: Inter;}}')
+            body = css.encode('utf-8').ljust(kilobytes * 1024)
+        else:
+            body = bytes(kilobytes * 1024)
+        self.send_body(body, content_type)
+
+    def send_body(self, body: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        log.debug(f'Stand-in: {format % args}')
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Http server which answers as upwork.com does along the steps of the
+    scanner. Every request waits latency seconds before being answered.
+    Ex.:
+        with StandInServer(jobs=500, latency=0.05) as server:
+            UpWorkScanner(info, url=server.url).run()
+    """
+    daemon_threads = True
+
+    def __init__(self, jobs: int = 100, page_size: int = 10, latency: float = 0.0,
+                 secret_answer: bool = True, seed: Optional[int] = 0,
+                 host: str = '127.0.0.1', port: int = 0) -> None:
+        """
+        :param jobs: Total of jobs in the feed, loaded while it is scrolled.
+        :param page_size: Jobs rendered with the page and loaded on every scroll.
+        :param latency: Seconds added to every request.
+        :param secret_answer: If True, the login asks for the secret answer.
+        :param seed: Seed of the synthetic content.
+        :param port: Port of the server, 0 to take a free one.
+        """
+        super().__init__((host, port), StandInHandler)
+        self.host = host
+        self.jobs = jobs
+        self.page_size = page_size
+        self.latency = latency
+        self.secret_answer = secret_answer
+        self.seed = seed
+        self.token = secrets.token_hex(16)
+        self.hits: Counter = Counter()
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Ex.: 'http://127.0.0.1:8123/'"""
+        return f'http://{self.host}:{self.server_port}/'
+
+    def delay(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def tiles(self, start: int) -> str:
+        """Html of the next page of jobs of the feed, empty at the end of it."""
+        return make_job_tiles(max(0, min(self.page_size, self.jobs - start)), start, self.seed)
+
+    @property
+    def assets_served(self) -> int:
+        """Requests of images, fonts and stylesheets answered."""
+        return sum(count for path, count in self.hits.items() if path.startswith(ASSETS_PATH))
+
+    def feed_page(self) -> str:
+        body = f'<div data-test="job-tile-list">{self.tiles(0)}</div>'
+        script = FEED_SCRIPT % {'jobs': self.jobs, 'tiles': TILES_PATH}
+        return make_page(ASSETS_HTML + body + script, profile_url=f'{self.url}{PROFILE_PATH[1:]}')
+
+    def profile_page(self) -> str:
+        return make_profile_page(seed=self.seed).replace('<body>', f'<body>{ASSETS_HTML}', 1)
+
+    def start(self) -> 'StandInServer':
+        """Serve in a background thread."""
+        self.thread = threading.Thread(target=self.serve_forever, name='stand-in', daemon=True)
+        self.thread.start()
+        log.info(f'Stand-in of upwork serving {self.jobs} jobs at {self.url}')
+        return self
+
+    def stop(self) -> None:
+        if self.thread is not None:
+            self.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.server_close()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
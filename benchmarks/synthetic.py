@@ -0,0 +1,144 @@
+"""
+Generators of synthetic pages shaped as the ones of upwork.com, used to
+benchmark the scanner without reaching the site.
+"""
+import random
+from typing import Optional
+
+TITLES = ('Exe to Python code script', 'Scrape product catalog', 'Fix Django migrations',
+          'Build a REST API with FastAPI', 'Data analysis of sales report',
+          'Automate Excel reports', 'Selenium bot for form filling')
+SKILLS = ('Python', 'Automation', 'Scripting', 'Django', 'Data Analysis',
+          'Web Scraping', 'Selenium', 'FastAPI', 'PostgreSQL', 'Pandas')
+COUNTRIES = ('Sweden', 'Ireland', 'United States', 'India', 'Colombia', 'Germany')
+TIERS = ('Entry level', 'Intermediate', 'Expert')
+POSTED = ('59 minutes ago', '2 hours ago', '23 hours ago', 'yesterday', '3 days ago')
+SPENDINGS = ('$0', '$150', '$4K+', '$7K+', '$100K+')
+
+FEEDBACK_OPTIONS = ''.join(
+    f'<li data-test="select-feedback{option}" tabindex="0" role="option" '
+    f'class="air3-menu-item is-uncheckable">{option.replace("_", " ").capitalize()}</li>'
+    for option in ('not_interested', 'vague_description', 'unrealistic_expectations',
+                   'too_many_applicants', 'too_old', 'poor_client_reviews')
+)
+
+SVG = '<svg aria-hidden="true" viewBox="0 0 24 24"><path d="M5 15h3v2.5l2.9-3.1V4a1 1 0 00-1-1z"></path></svg>'
+
+
+def make_job_tile(index: int, rng: random.Random) -> str:
+    """
+    Create the html of a job tile as it is rendered into the job-tile-list.
+    :param index: Position of the job in the feed, used to make its link unique.
+    :param rng: Random generator, so the content is reproducible.
+    :return: Html of a <section> element.
+    """
+    name = rng.choice(TITLES)
+    title = f'{name} #{index}'
+    job_id = f'01{index:016x}'
+    skills = ''.join(f'<a href="/nx/jobs/search/?skill={skill}" class="air3-token" '
+                     f'data-test="attr-item">{skill}</a>'
+                     for skill in rng.sample(SKILLS, rng.randint(1, 5)))
+    description = ' '.join(rng.choice(SKILLS) for _ in range(rng.randint(20, 120)))
+    return (
+        f'<section class="air3-card-section air3-card-hover" data-ev-position="{index}">'
+        f'<div class="air3-grid-container mb-4x gap-0">'
+        f'<div class="span-12 mb-2x"><div class="job-tile-badges d-flex is-empty"><!----></div></div>'
+        f'<div class="span-1-12 pr-10x"><h3 class="my-0 p-sm-right job-tile-title h5">'
+        f'<a href="/jobs/{name.replace(" ", "-")}_~{job_id}/?referrer_url_path=find_work_home" '
+        f'class="air3-link">{title}</a></h3></div>'
+        f'<div class="justify-self-end"><div class="job-tile-actions">'
+        f'<div data-test="job-feedback"><button type="button" class="air3-btn">'
+        f'<span class="sr-only">Job feedback {title}</span><div class="air3-icon sm">{SVG}</div></button>'
+        f'<ul role="listbox" class="air3-menu-list">{FEEDBACK_OPTIONS}</ul></div>'
+        f'<button type="button" data-test="job-save-button"><span class="sr-only">Save job {title}</span>'
+        f'<div class="air3-icon sm">{SVG}</div></button></div></div></div>'
+        f'<div><div class="air3-grid-container">'
+        f'<small class="span-12"><strong data-test="job-type">{rng.choice(("Fixed-price", "Hourly: $10-$25"))}</strong>'
+        f' <span> - Posted <span data-test="posted-on">\n {rng.choice(POSTED)}\n </span></span></small>'
+        f'<div class="span-6"><strong data-test="budget"><span data-itemprop="baseSalary">\n'
+        f' ${rng.randint(5, 5000)}\n </span></strong><br><small>Budget</small></div>'
+        f'<div class="span-6"><strong data-test="contractor-tier">{rng.choice(TIERS)}</strong><br>'
+        f'<small data-test="contractor-tier-label">Experience Level</small></div></div>'
+        f'<div class="my-4x"><div data-test="job-description-line-clamp"><div class="air3-line-clamp">'
+        f'<span data-test="job-description-text">{description}</span></div>'
+        f'<button type="button" class="air3-btn-link-secondary"><span>more</span></button></div></div>'
+        f'<div class="mt-4x"><div data-test="token-container"><div class="air3-token-wrap">{skills}</div></div></div>'
+        f'<div class="badge-line mt-4x">'
+        f'<small data-test="payment-verification-status"><div class="air3-icon sm">{SVG}</div>'
+        f'<strong class="text-light">Payment verified</strong></small>'
+        f'<span data-test="js-feedback"><div class="air3-rating">{SVG * 5}'
+        f'<span class="sr-only">\n Rating is {rng.randint(0, 5000) / 1000} out of 5.\n </span></div></span>'
+        f'<small data-test="client-spendings"><strong><span data-test="formatted-amount">\n'
+        f'{rng.choice(SPENDINGS)}\n</span></strong> <span class="text-light">spent</span></small>'
+        f'<small data-test="client-country"><div class="air3-icon sm">{SVG}</div>'
+        f'<strong>{rng.choice(COUNTRIES)}</strong></small>'
+        f'</div></div></section>'
+    )
+
+
+def make_job_tiles(quantity: int, start: int = 0, seed: Optional[int] = 0) -> str:
+    """Create the html of quantity job tiles, numbered from start."""
+    rng = random.Random(None if seed is None else seed + start)
+    return ''.join(make_job_tile(index, rng) for index in range(start, start + quantity))
+
+
+PROFILE_URL = 'https://www.upwork.com/freelancers/~011cfba3bd0cf44f8d'
+
+
+def make_page(body: str, title: str = 'Find Work - Upwork', profile_url: str = PROFILE_URL) -> str:
+    """Wrap a body with the head, scripts, nav and footer of the site."""
+    scripts = ''.join(f'<script>window.__state_{i} = {{"items": [{", ".join(map(str, range(200)))}]}};</script>'
+                      for i in range(20))
+    nav = '<nav>' + ''.join(f'<a href="/nav/{i}">Menu {i}</a>' for i in range(100)) + '</nav>'
+    footer = '<footer>' + ''.join(f'<a href="/footer/{i}">Link {i}</a>' for i in range(100)) + '</footer>'
+    escaped = profile_url.replace('/', '\\u002F')
+    return (f'<!DOCTYPE html><html><head><title>{title}</title>{scripts}</head>'
+            f'<body>{nav}<main>{body}</main>{footer}'
+            f'<script>window.__NUXT__={{profileUrl:"{escaped}"}}</script></body></html>')
+
+
+def make_jobs_page(quantity: int, seed: Optional[int] = 0) -> str:
+    """
+    Create a page with the feed of jobs, like the main page of upwork
+    once it is fully scrolled.
+    :param quantity: Number of job tiles into the job-tile-list.
+                     Ex.: 10, 1000 or 10000
+    :param seed: Seed of the random content. None for a different page every time.
+    :return: Html of the whole page.
+    """
+    return make_page(f'<div data-test="job-tile-list">{make_job_tiles(quantity, seed=seed)}</div>')
+
+
+def make_profile_page(employments: int = 2, seed: Optional[int] = 0) -> str:
+    """
+    Create a page with the profile of a freelancer.
+    :param employments: Number of jobs in the employment history. The first
+                        one is the current one.
+    :param seed: Seed of the random content.
+    :return: Html of the whole page.
+    """
+    rng = random.Random(seed)
+    history = ''.join(
+        f'<div class="employment"><div><div><h4>{rng.choice(TITLES)} | Company {i}</h4></div></div>'
+        f'<span class="sr-only">Employment</span>'
+        f'<div>January {2022 - i * 2} - {"Present" if i == 0 else f"March {2023 - i * 2}"}</div></div>'
+        for i in range(employments)
+    )
+    cards = [
+        '<div class="identity-container"><h2 itemprop="name">Rachel W.</h2>'
+        '<span itemprop="locality">Amsterdam</span>, <span itemprop="country-name">Netherlands</span>'
+        '<div class="time"><div class="dash">–</div><span>3:05 am local time</span></div></div>',
+        '<section class="air3-card-section"><h2 class="mb-0 h4">Software Engineer</h2>'
+        '<h3 role="presentation"><strong>$70.00/hr</strong></h3>'
+        f'<span role="text-body">{" ".join(rng.choice(SKILLS) for _ in range(60))}</span></section>'
+        '<section class="work-history-section"><h4 role="presentation">Work history</h4></section>',
+        '<section>Portfolio</section>',
+        '<section>Testimonials</section>',
+        '<section>Certifications</section>',
+        f'<h3>Employment history</h3><section class="air3-card-sections">{history}</section>',
+        '<section>Other experiences</section>',
+    ]
+    cards[0] = f'<img src="https://www.upwork.com/profile-portraits/c1QBT2HQt" alt="Rachel W.">{cards[0]}'
+    outer_cards = ''.join(f'<div class="air3-card profile-outer-card">{card}</div>' for card in cards)
+    return make_page(f'<div data-qa-profile-viewer-uid="1640798106421293056">{outer_cards}</div>',
+                     title='Rachel W. - Upwork')
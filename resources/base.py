@@ -1,4 +1,4 @@
-import random
+import json
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -10,14 +10,33 @@ from selenium import webdriver
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.wait import WebDriverWait
 from urllib3.exceptions import NewConnectionError, MaxRetryError
-from webdriver_manager.chrome import ChromeDriverManager
 
-from settings import logger as log
+from resources.blocking import BlockingPolicy, BlockingStats
+from resources.driver_cache import DriverCache
+from resources.exceptions import RequestFailed
+from resources.retry import RetryPolicy, RetryStats
+from resources.waits import Waiter
+from settings import SCROLL_BUDGET, SCROLL_SETTLE, SCROLL_TARGET, logger as log
 from utils.date_utils import period_to_date, date_to_str
 
 
+# Count the children of a container, keeping the count updated with a MutationObserver.
+COUNTER_SCRIPT = """
+const container = document.querySelector(%s);
+const selector = %s;
+if (!container) { return -1; }
+if (!window.__scanCounter || window.__scanCounter.container !== container) {
+    const counter = {container: container, count: container.querySelectorAll(selector).length};
+    new MutationObserver(() => {
+        counter.count = container.querySelectorAll(selector).length;
+    }).observe(container, {childList: true});
+    window.__scanCounter = counter;
+}
+return window.__scanCounter.count;
+"""
+
+
 class BaseSelenium:
     BY = {"id": By.ID, "xpath": By.XPATH, "link text": By.LINK_TEXT,
           "partial link text": By.PARTIAL_LINK_TEXT,
@@ -42,67 +61,157 @@ class BaseSelenium:
         self.options.add_argument("--headless")
         user_agent = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/60.0.3112.50 Safari/537.36'
         self.options.add_argument(f'user-agent={user_agent}')
+        # Network events, used for the stats of the requests blocked.
+        self.options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        self.blocking = BlockingPolicy.from_settings()
+        self.network_stats = BlockingStats()
+        self.waits = Waiter()
+        self.retry_policy = RetryPolicy()
+        self.retry_stats = RetryStats()
+        # Deadline (time.monotonic) of the request in progress, which bounds the
+        # requests started along it, ex.: the login of a renewed browser.
+        self.request_deadline: Optional[float] = None
 
         if preload_driver:
-            self.driver = webdriver.Chrome(options=self.options,
-                                           service=webdriver.ChromeService(
-                                               ChromeDriverManager().install())
-                                           )
+            self.driver = self.new_driver()
+
+    def new_driver(self):
+        """Start a new Chrome with the options of the instance."""
+        start = time.perf_counter()
+        driver = webdriver.Chrome(options=self.options,
+                                  service=webdriver.ChromeService(
+                                      DriverCache().resolve()
+                                  )
+                                  )
+        log.info(f'Chrome started in {time.perf_counter() - start:.2f}s')
+        try:
+            self.blocking.apply(driver)
+        except Exception as e:
+            log.warning(f'Requests of the browser could not be blocked: {e}')
+        return driver
+
+    def read_performance_log(self) -> List[dict]:
+        """Take the entries of the performance log of the browser, adding
+        them up to the network stats. The log is emptied when it is read."""
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            log.warning(f'Performance log unavailable: {e}')
+            return []
+        self.network_stats.consume(entries)
+        return entries
 
     def load_driver(self):
-        self.driver = webdriver.Chrome(options=self.options,
-                                       service=webdriver.ChromeService(
-                                           ChromeDriverManager().install()
-                                       )
-                                       )
+        self.driver = self.new_driver()
+
+    def is_driver_alive(self) -> bool:
+        """Check the browser still responds."""
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def renew_driver(self) -> None:
+        """Replace a browser which stopped responding by a new one."""
+        log.warning('Browser not responding, starting a new one')
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.load_driver()
 
     def custom_request(self, url, type_element, value) -> None:
         """
-        Try to reach a site by the 3 times. Otherwise, will raise an exception.
+        Try to reach a site within the attempts and the deadline of
+        self.retry_policy, pausing with exponential backoff between attempts
+        and renewing the browser if it stops responding. Every attempt is
+        recorded in self.retry_stats. The page load and the waits are cut at
+        what is left of the deadline, and the requests started along this one
+        (ex.: the login of a renewed browser) don't go over it.
         :param url: Address of the website to be checked/accessed.
         :param type_element: Type of element that will be checked. This parameter
                               will be used in the has_page_loaded function.
         :param value: Value of the type_element that will be checked.
-        :return: If the page does not load, raise an exception.
+        :return: If the page does not load, raise RequestFailed.
         """
-        is_site_loaded = False
+        policy = self.retry_policy
+        outer_deadline = self.request_deadline
+        deadline = time.monotonic() + policy.deadline
+        if outer_deadline is not None:
+            deadline = min(deadline, outer_deadline)
+        self.request_deadline = deadline
+        try:
+            self._request_until(url, type_element, value, deadline)
+        finally:
+            self.request_deadline = outer_deadline
+            if outer_deadline is None:
+                # The next loads of the browser don't inherit what was left of this deadline.
+                try:
+                    self.driver.set_page_load_timeout(policy.page_timeout)
+                except Exception:
+                    pass
+
+    def _request_until(self, url, type_element, value, deadline: float) -> None:
+        """Attempts of custom_request, none of them going over the deadline."""
+        policy = self.retry_policy
         attempts = 0
-        while not is_site_loaded and attempts != 4:
+        while attempts < policy.attempts and (left := deadline - time.monotonic()) > 0:
+            attempts += 1
+            start = time.monotonic()
+            error = None
             try:
-                self.open_url(url)
-                attempts += 1
-                is_site_loaded = self.has_page_loaded(type_element, value)
-            except MaxRetryError as e:
-                log.error(f"Error={e}")
-
-        if is_site_loaded:
-            log.info(f"Site loaded after {attempts} attempts")
-        else:
-            raise Exception(f'In {attempts} attempts the site '
+                # The page load is cut at the time left, not at the 300s of selenium.
+                self.driver.set_page_load_timeout(min(policy.page_timeout, left))
+                self.open_url(url, deadline)
+                left = max(deadline - time.monotonic(), 0)
+                if not self.has_page_loaded(type_element, value, min(policy.page_timeout, left)):
+                    error = 'TimeoutException'
+            except Exception as e:
+                log.error(f'Attempt {attempts} to reach {url=} failed: {e}')
+                error = type(e).__name__
+            self.retry_stats.record(url, time.monotonic() - start, error)
+
+            if error is None:
+                log.info(f"Site loaded after {attempts} attempts")
+                return
+            if not self.is_driver_alive():
+                self.renew_driver()
+            if attempts < policy.attempts:
+                pause = policy.pause(attempts)
+                if pause >= deadline - time.monotonic():
+                    break
+                time.sleep(pause)
+
+        raise RequestFailed(f'In {attempts} attempts and {policy.deadline:g}s the site '
                             f'wasn\'t possible to reach -> {url}')
 
-    def has_page_loaded(self, type_element: str, value: str) -> bool:
+    def has_page_loaded(self, type_element: str, value: str, timeout: float = 60) -> bool:
         """Verify if the site has already loaded through check if an
         element is located.
         :param type_element: Type of element to be located.
         :param value: Value of the element to be located.
+        :param timeout: Maximum seconds waiting for the element.
         :return: True if the site has loaded, otherwise, False.
         """
-        timeout = 60
         try:
             element_present = EC.presence_of_element_located((self.BY[type_element], value))
-            WebDriverWait(self.driver, 60).until(element_present)
+            self.waits.for_element(self.driver, element_present, timeout)
             return True
         except (TimeoutException,):
-            self.driver.save_screenshot(f'site_unreachable_{datetime.now():%D_%T}.png')
+            try:
+                self.driver.save_screenshot(f'site_unreachable_{datetime.now():%D_%T}.png')
+            except Exception as e:
+                log.warning(f'Screenshot of the site unavailable: {e}')
             log.error(f"Timeout Exception: site didn't load in {timeout} seconds")
-            self.driver.quit()
             return False
 
-    def open_url(self, url):
+    def open_url(self, url, deadline: Optional[float] = None):
         """
         Open an url using the web driver. Then, establish a width and height.
         :param url: Url to be reached.
+        :param deadline: time.monotonic() after which the network is not
+                         waited anymore, by default the timeout of the waits.
         """
         try:
             log.info(f'Opening {url=}')
@@ -113,13 +222,16 @@ class BaseSelenium:
             # self.driver.save_screenshot(f'site_didnt_loaded_{datetime.now():%g_%h_%H_%M}.png')
         else:
             self.driver.set_window_size(1920, 1080)
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            self.waits.for_network_idle(self.driver, timeout)
             self.time_wait()
 
-    @staticmethod
-    def time_wait(start=4, end=10):
+    def time_wait(self, start=4, end=10) -> float:
         """Sleep the execution for seconds, between start and end.
-        This function is convenient to demonstrate a non-bot behavior."""
-        time.sleep(random.randint(start, end))
+        This function is convenient to demonstrate a non-bot behavior.
+        The pause is scaled and limited by the wait policy, so with the
+        "fast" profile it doesn't sleep at all."""
+        return self.waits.jitter(start, end)
 
     def exect_js(self, script_content):
         """Execute the script coming in script_content"""
@@ -132,7 +244,7 @@ class BaseSelenium:
         """Obtain an element until it appears, otherwise will raise  TimeoutException."""
         # element_present = EC.presence_of_element_located((self.BY[type_element], value))
         element_present = EC.visibility_of_element_located((self.BY[type_element], value))
-        return WebDriverWait(self.driver, 30).until(element_present)
+        return self.waits.for_element(self.driver, element_present, 30)
 
     def get_elements(self, type_element: str, value: str):
         """Obtain all the elements of type_element with value."""
@@ -143,23 +255,55 @@ class BaseSelenium:
         element = self.get_element(type_element, value)
         element.click()
 
-    def fullscroll_to_bottom(self) -> None:
-        """Make one scroll per time until reach the bottom of the site.
-         This guarantee that the site has loaded completely their elements.
+    def fullscroll_to_bottom(self, container: str = 'body', child: str = '*',
+                             target: int = SCROLL_TARGET, budget: float = SCROLL_BUDGET,
+                             settle: float = SCROLL_SETTLE) -> int:
+        """Scroll to the bottom of the site while new elements keep being loaded.
          This function is convenient for those site which only load their
-         html elements when they are shown."""
+         html elements when they are shown.
+         The children of the container are counted in the browser with a
+         MutationObserver, and the scroll stops as soon as the count doesn't
+         change along settle seconds, it reaches target or the budget is spent.
+        :param container: Css selector of the element where the items are loaded.
+                          Ex.: 'div[data-test="job-tile-list"]'
+        :param child: Css selector of the items, direct children of the container.
+        :param target: Quantity of items after which the scroll stops, 0 for no limit.
+        :param budget: Maximum seconds scrolling.
+        :param settle: Seconds without new items to consider that all were loaded.
+        :return: Quantity of items loaded.
+        """
         log.info('Scrolling down for loading html elements')
         self.driver.set_window_size(1000, 1080)
-        self.time_wait(2, 5)
-        vertical_distance = self.exect_js('return document.body.scrollHeight;')
-        lance = vertical_distance // 10
-        scrolled = 0
-        while scrolled <= vertical_distance // 5:
-            scrolled += lance
-            self.driver.execute_script(f"window.scrollTo(0, {scrolled});")
-            self.time_wait(8, 16)
-
-        log.info('Scrolling has finished')
+        start = time.perf_counter()
+        initial = count = self.exect_js(COUNTER_SCRIPT % (json.dumps(container),
+                                                          json.dumps(f':scope > {child}')))
+        if count < 0:
+            log.warning(f'{container!r} not found, scrolling is not possible')
+            return 0
+
+        while not (target and count >= target) and time.perf_counter() - start < budget:
+            self.exect_js('window.scrollTo(0, document.body.scrollHeight);')
+            previous = count
+
+            def loaded() -> int:
+                current = self.exect_js('return window.__scanCounter.count;')
+                return current if current != previous else 0
+
+            try:
+                count = self.waits.until(
+                    loaded,
+                    timeout=min(settle, max(budget - (time.perf_counter() - start), 0)),
+                    message='New elements'
+                )
+            except TimeoutException:
+                break
+            self.time_wait(1, 3)
+
+        elapsed = time.perf_counter() - start
+        log.info(f'Scrolling has finished with {count} elements, '
+                 f'{(count - initial) / elapsed if elapsed else 0:.2f} loaded per second '
+                 f'in {elapsed:.1f}s')
+        return count
 
     def put_text(self, info, type_element: str, value: str):
         """Type a text into a found element."""
@@ -0,0 +1,116 @@
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from typing import Dict, Iterable, List, Tuple
+
+from settings import ALLOW_URLS, BLOCK_RESOURCES, BLOCK_URLS, logger as log
+
+# Url patterns of every type of resource, as understood by Network.setBlockedURLs.
+RESOURCE_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    'image': ('*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico'),
+    'font': ('*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'),
+    'media': ('*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav'),
+    'stylesheet': ('*.css',),
+}
+
+# Analytics and ads requested by the site which the scanner never uses.
+TRACKER_PATTERNS = ('*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+                    '*connect.facebook.net*', '*hotjar.com*', '*bat.bing.com*',
+                    '*segment.io*', '*cdn.segment.com*', '*px-cloud.net*')
+
+# Types of resources of CDP, to group the requests in the stats.
+CDP_TYPES = {'Image': 'image', 'Font': 'font', 'Media': 'media', 'Stylesheet': 'stylesheet'}
+
+
+@dataclass(frozen=True)
+class BlockingPolicy:
+    # Types of resources blocked, keys of RESOURCE_PATTERNS.
+    resource_types: Tuple[str, ...] = ()
+    # Url patterns blocked. Ex.: '*doubleclick.net*'
+    deny: Tuple[str, ...] = ()
+    # Types of resources, or patterns covering the ones blocked, which are not blocked.
+    # Network.setBlockedURLs has no allow rules, so they are removed from what would be
+    # blocked: a pattern of urls (ex.: '*upwork.com/static/*') can't make an exception
+    # to the ones blocked by type, see ignored_allows.
+    allow: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_settings(cls) -> 'BlockingPolicy':
+        return cls(BLOCK_RESOURCES, TRACKER_PATTERNS + BLOCK_URLS, ALLOW_URLS)
+
+    def blocked(self) -> List[str]:
+        """Url patterns of the types of resources and urls blocked, before the allowed ones."""
+        patterns = [pattern for resource_type in self.resource_types if resource_type not in self.allow
+                    for pattern in RESOURCE_PATTERNS.get(resource_type, ())]
+        return list(dict.fromkeys(patterns + list(self.deny)))
+
+    def patterns(self) -> List[str]:
+        """Url patterns to be blocked in the browser."""
+        return [pattern for pattern in self.blocked()
+                if not any(pattern == allowed or fnmatch(pattern, allowed) for allowed in self.allow)]
+
+    def ignored_allows(self) -> List[str]:
+        """Allowed entries which are neither a type of resource nor cover a pattern blocked,
+        so they don't unblock anything. Ex.: '*upwork.com/static/*' with images blocked."""
+        blocked = self.blocked()
+        covers = [allowed for allowed in self.allow
+                  if any(pattern == allowed or fnmatch(pattern, allowed) for pattern in blocked)]
+        return [allowed for allowed in self.allow if allowed not in RESOURCE_PATTERNS and allowed not in covers]
+
+    def apply(self, driver) -> None:
+        """Block the requests of the browser matching the policy, through DevTools."""
+        if ignored := self.ignored_allows():
+            log.warning(f'Allowed entries ignored, only types of resources and patterns '
+                        f'covering the ones blocked can be allowed: {ignored}')
+        if not (patterns := self.patterns()):
+            return
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        log.info(f'Blocking {len(patterns)} url patterns in the browser')
+
+
+@dataclass
+class BlockingStats:
+    """Requests and bytes loaded and saved, read from the performance log of the browser."""
+    loaded: Counter = field(default_factory=Counter)
+    loaded_bytes: Counter = field(default_factory=Counter)
+    blocked: Counter = field(default_factory=Counter)
+    types: Dict[str, str] = field(default_factory=dict)
+
+    def consume(self, entries: Iterable[dict]) -> None:
+        """
+        Add up the network events of entries of the performance log.
+        :param entries: Entries as returned by driver.get_log('performance').
+        """
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            params = message.get('params', {})
+            request_id = params.get('requestId')
+            match message.get('method'):
+                case 'Network.requestWillBeSent':
+                    self.types[request_id] = CDP_TYPES.get(params.get('type', ''), 'other')
+                case 'Network.loadingFinished':
+                    resource_type = self.types.get(request_id, 'other')
+                    self.loaded[resource_type] += 1
+                    self.loaded_bytes[resource_type] += int(params.get('encodedDataLength', 0))
+                case 'Network.loadingFailed' if params.get('blockedReason'):
+                    self.blocked[self.types.get(request_id, 'other')] += 1
+
+    @property
+    def saved_bytes(self) -> int:
+        """Estimation of the bytes saved: blocked requests by the average size of their type,
+        or of all the requests loaded when none of that type was loaded."""
+        total_loaded = sum(self.loaded.values())
+        average = sum(self.loaded_bytes.values()) / total_loaded if total_loaded else 0
+        return int(sum(count * (self.loaded_bytes[resource_type] / self.loaded[resource_type]
+                                if self.loaded[resource_type] else average)
+                       for resource_type, count in self.blocked.items()))
+
+    def report(self) -> Dict[str, int]:
+        return {
+            'requests_loaded': sum(self.loaded.values()),
+            'bytes_loaded': sum(self.loaded_bytes.values()),
+            'requests_saved': sum(self.blocked.values()),
+            'bytes_saved_estimated': self.saved_bytes,
+        }
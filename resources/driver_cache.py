@@ -0,0 +1,109 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from resources.exceptions import DriverNotFound
+from settings import DATA_DIR, DRIVER_OFFLINE, logger as log
+from utils.file_utils import locked
+
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+                   '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome')
+
+
+def chrome_version() -> str:
+    """
+    Discover the version of the Chrome installed.
+    :return: Version of Chrome, empty if it wasn't found.
+             Ex.: '119.0.6045.159'
+    """
+    for binary in CHROME_BINARIES:
+        if not (path := shutil.which(binary) or (binary if os.path.isfile(binary) else None)):
+            continue
+        try:
+            output = subprocess.run([path, '--version'], capture_output=True,
+                                    text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        if match := re.search(r'\d+(?:\.\d+)+', output):
+            return match.group()
+    return ''
+
+
+def install_driver() -> str:
+    """Download (or find in its own cache) the chromedriver with webdriver-manager."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+class DriverCache:
+    """
+    Keep the path of the chromedriver resolved for every version of Chrome,
+    so the browser starts without asking the network which driver to use.
+    The file is locked while it is used, so it can be shared by several
+    scanners running at the same time.
+    """
+
+    def __init__(self, path: Path = DATA_DIR / 'drivers.json',
+                 offline: bool = DRIVER_OFFLINE,
+                 installer: Callable[[], str] = install_driver,
+                 version: Callable[[], str] = chrome_version) -> None:
+        """
+        :param path: Json file with the cached drivers by version of Chrome.
+        :param offline: If True, the network is never used, so it fails when
+                        there isn't a driver cached for the Chrome installed.
+        :param installer: Function which gets the path of the driver when it isn't cached.
+        :param version: Function which gets the version of Chrome installed.
+        """
+        self.path = path
+        self.offline = offline
+        self.installer = installer
+        self.version = version
+
+    def read(self) -> Dict[str, str]:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def write(self, entries: Dict[str, str]) -> None:
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(entries, indent=2))
+        tmp_path.replace(self.path)
+
+    @staticmethod
+    def find_cached(entries: Dict[str, str], version: str) -> Optional[str]:
+        """Path of the driver of the version, or of the same major version, if it still exists."""
+        major = version.split('.')[0]
+        candidates = [entries.get(version)] + [path for cached, path in entries.items()
+                                               if cached.split('.')[0] == major]
+        return next((path for path in candidates if path and os.path.isfile(path)), None)
+
+    def resolve(self) -> str:
+        """
+        Get the path of the chromedriver for the Chrome installed, installing
+        it only if it isn't in the cache yet.
+        :return: Path of the chromedriver.
+                 Ex.: '/root/.wdm/drivers/chromedriver/linux64/119.0.6045.105/chromedriver'
+        """
+        start = time.perf_counter()
+        version = self.version() or 'unknown'
+        with locked(self.path.with_suffix('.lock')):
+            entries = self.read()
+            if path := self.find_cached(entries, version):
+                source = 'cache'
+            elif self.offline:
+                raise DriverNotFound(f'There is no chromedriver cached for Chrome {version} '
+                                     f'and the offline mode is enabled.')
+            else:
+                path = self.installer()
+                entries[version] = path
+                self.write(entries)
+                source = 'installer'
+        log.info(f'Chromedriver for Chrome {version} resolved from {source} '
+                 f'in {time.perf_counter() - start:.3f}s')
+        return path
@@ -0,0 +1,181 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Optional
+
+from settings import DRIVER_MAX_MEMORY_MB, DRIVER_MAX_USES, DRIVER_POOL_SIZE, logger as log
+
+JS_HEAP_SIZE = 'return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0;'
+
+
+@dataclass
+class PooledDriver:
+    driver: Any
+    uses: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+class DriverPool:
+    """
+    Keep some browsers started, so the scanners lease one and give it
+    back instead of starting a new Chrome on every run.
+    """
+
+    def __init__(self, size: int = DRIVER_POOL_SIZE, max_uses: int = DRIVER_MAX_USES,
+                 max_memory_mb: int = DRIVER_MAX_MEMORY_MB,
+                 factory: Optional[Callable[[], Any]] = None) -> None:
+        """
+        :param size: Maximum of browsers opened at the same time.
+        :param max_uses: Leases after which a browser is replaced by a new one.
+        :param max_memory_mb: Megabytes of javascript heap after which a
+                              browser is replaced by a new one. 0 to disable it.
+        :param factory: Function which starts a new browser, by default a
+                        Chrome with the options of BaseSelenium.
+        """
+        if factory is None:
+            from resources.base import BaseSelenium
+            factory = BaseSelenium().new_driver
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.factory = factory
+        self.idle: queue.LifoQueue = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.created = 0
+        self.closed = False
+
+    def warm(self) -> None:
+        """Start the browsers which are missing to complete the size of the pool."""
+        while True:
+            with self.lock:
+                if self.created >= self.size:
+                    break
+                self.created += 1
+            self.idle.put(self._start_counted())
+        log.info(f'Driver pool warmed with {self.size} browsers')
+
+    def _start(self) -> PooledDriver:
+        start = time.perf_counter()
+        pooled = PooledDriver(self.factory())
+        log.info(f'Browser started in {time.perf_counter() - start:.2f}s')
+        return pooled
+
+    def _start_counted(self) -> PooledDriver:
+        """Start a browser already counted in self.created, discounting it if it fails."""
+        try:
+            return self._start()
+        except Exception:
+            with self.lock:
+                self.created -= 1
+            raise
+
+    def _quit(self, pooled: PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            log.warning(f'Error closing a browser of the pool: {e}')
+
+    def is_healthy(self, pooled: PooledDriver) -> bool:
+        """Check the browser still responds."""
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def is_worn_out(self, pooled: PooledDriver) -> bool:
+        """Check if the browser has to be replaced by its uses or memory."""
+        if pooled.uses >= self.max_uses:
+            log.info(f'Recycling browser after {pooled.uses} uses')
+            return True
+        if self.max_memory_mb:
+            try:
+                heap = pooled.driver.execute_script(JS_HEAP_SIZE) or 0
+            except Exception:
+                return True
+            if heap / 2 ** 20 > self.max_memory_mb:
+                log.info(f'Recycling browser using {heap / 2 ** 20:.0f}MB')
+                return True
+        return False
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """
+        Take a healthy browser of the pool, starting one if there isn't any idle.
+        Blocks while all the browsers are leased.
+        """
+        if self.closed:
+            raise RuntimeError('The driver pool is closed')
+        if not self.slots.acquire(timeout=timeout):
+            raise TimeoutError(f'No browser available in the pool after {timeout}s')
+        try:
+            while True:
+                try:
+                    pooled = self.idle.get_nowait()
+                except queue.Empty:
+                    with self.lock:
+                        can_start = self.created < self.size
+                        self.created += can_start
+                    if can_start:
+                        return self._start_counted()
+                    # The rest of the browsers are being started by warm().
+                    pooled = self.idle.get(timeout=timeout)
+                if self.is_healthy(pooled):
+                    return pooled
+                log.warning('Discarding a browser of the pool which is not responding')
+                self._quit(pooled)
+                with self.lock:
+                    self.created -= 1
+        except Exception:
+            self.slots.release()
+            raise
+
+    def release(self, pooled: PooledDriver) -> None:
+        """Give back a browser to the pool, cleaning its session or replacing it."""
+        pooled.uses += 1
+        try:
+            if self.closed or not self.is_healthy(pooled) or self.is_worn_out(pooled):
+                self._quit(pooled)
+                with self.lock:
+                    self.created -= 1
+                if not self.closed:
+                    self.warm()
+                return
+            try:
+                pooled.driver.delete_all_cookies()
+                pooled.driver.get('about:blank')
+            except Exception as e:
+                log.warning(f'Error cleaning a browser of the pool: {e}')
+            self.idle.put(pooled)
+        finally:
+            self.slots.release()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Lease a browser while the block is executed.
+            with pool.lease() as driver:
+                driver.get(url)
+        """
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled.driver
+        finally:
+            self.release(pooled)
+
+    def close(self) -> None:
+        """Close every idle browser of the pool, the leased ones are closed when released."""
+        self.closed = True
+        drivers: List[PooledDriver] = []
+        while True:
+            try:
+                drivers.append(self.idle.get_nowait())
+            except queue.Empty:
+                break
+        for pooled in drivers:
+            self._quit(pooled)
+        with self.lock:
+            self.created -= len(drivers)
+        log.info(f'Driver pool closed, {len(drivers)} browsers quitted')
@@ -17,3 +17,17 @@ class LoginFailed(Exception):
     def __init__(self, message="The attempt to log in has failed"):
         self.message = message
         super().__init__(self.message)
+
+
+class DriverNotFound(Exception):
+    def __init__(self, message="There is no chromedriver cached for the "
+                               "installed Chrome and the offline mode is enabled."):
+        self.message = message
+        super().__init__(self.message)
+
+
+class RequestFailed(Exception):
+    def __init__(self, message="The site wasn't possible to reach "
+                               "within the attempts or the deadline."):
+        self.message = message
+        super().__init__(self.message)
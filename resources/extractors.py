@@ -0,0 +1,159 @@
+import json
+from typing import Any, Dict, Optional
+
+from bs4 import Tag
+
+
+class JobTileExtractor:
+    """
+    Compiled plan to extract the fields of a job tile walking the
+    element only once, instead of looking up every field with a
+    separated search over the whole subtree.
+    """
+    # data-test value -> key of the job, where only the first match counts.
+    TEXT_FIELDS: Dict[str, str] = {
+        'job-type': 'job_type',
+        'posted-on': 'posted_on',
+        'workload': 'workload',
+        'budget': 'budget',
+        'duration': 'duration',
+        'contractor-tier': 'contractor_tier',
+        'tier-label': 'tier_label',
+        'job-description-text': 'description',
+        'verification-status': 'verification_status',
+        'client-spendings': 'spendings',
+        'client-country': 'country',
+    }
+
+    # data-test value -> key of the job, where all the matches are collected.
+    LIST_FIELDS: Dict[str, str] = {
+        'attr-item': 'skills',
+    }
+
+    RATING = 'js-feedback'
+
+    def extract_header(self, upper_div: Tag) -> dict:
+        """
+        Walk the upper div of the tile once looking for the title and link.
+        :param upper_div: First div of the job tile.
+        :return: Dictionary with the keys 'title' and 'link' when they were found.
+        """
+        result: Dict[str, Any] = {}
+        title: Optional[Tag] = None
+        anchor: Optional[Tag] = None
+        for element in upper_div.descendants:
+            if not isinstance(element, Tag):
+                continue
+            if title is None and 'job-tile-title' in element.get_attribute_list('class'):
+                title = element
+            if anchor is None and element.name == 'a':
+                anchor = element
+            if title is not None and anchor is not None:
+                break
+
+        if title is not None:
+            result['title'] = title.text.strip()
+        if anchor is not None:
+            result['link'] = anchor.get('href')
+        return result
+
+    def extract_body(self, lower_div: Tag) -> dict:
+        """
+        Walk the lower div of the tile once and route every element with
+        a data-test attribute to its field.
+        The fields which were not found are filled in with an empty string,
+        except for 'skills' and 'rating' which are only added when present.
+        :param lower_div: Second div of the job tile.
+        :return: Dictionary with the information of the job.
+        """
+        result: Dict[str, Any] = dict.fromkeys(self.TEXT_FIELDS.values(), '')
+        seen = set()
+        lists: Dict[str, list] = {}
+        rating_checked = False
+
+        for element in lower_div.descendants:
+            if not isinstance(element, Tag):
+                continue
+            value = element.attrs.get('data-test')
+            if not value:
+                continue
+
+            if key := self.TEXT_FIELDS.get(value):
+                if value not in seen:
+                    seen.add(value)
+                    result[key] = element.get_text(strip=True)
+            elif key := self.LIST_FIELDS.get(value):
+                lists.setdefault(key, []).append(element.get_text(strip=True))
+            elif value == self.RATING and not rating_checked:
+                rating_checked = True
+                if rating := element.find('span', class_='sr-only'):
+                    result['rating'] = rating.get_text(strip=True)
+
+        result.update(lists)
+        return result
+
+    def extract(self, job: Tag) -> dict:
+        """
+        Extract all the information possible of a job tile.
+        :param job: Section element which depicts a job.
+        :return: Information of the job, not normalized yet.
+        """
+        upper_div, lower_div = job.find_all('div', recursive=False)
+        return {**self.extract_header(upper_div), **self.extract_body(lower_div)}
+
+    def script(self, container: str = 'div[data-test="job-tile-list"]') -> str:
+        """
+        Javascript which applies the same plan in the browser, so the jobs
+        are extracted without moving the page source over the webdriver.
+        Texts are joined and stripped like get_text(strip=True) does.
+        :param container: Css selector of the element with the jobs.
+        :return: Script which returns a list with the information of every job
+                 (not normalized yet), or null for the tiles without the two divs.
+        """
+        return JOB_TILES_SCRIPT % {
+            'container': json.dumps(container),
+            'text_fields': json.dumps(self.TEXT_FIELDS),
+            'list_fields': json.dumps(self.LIST_FIELDS),
+            'rating': json.dumps(self.RATING),
+        }
+
+
+JOB_TILES_SCRIPT = """
+const stripped = (element) => {
+    const parts = [];
+    const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+    let node;
+    while ((node = walker.nextNode())) {
+        if (node.parentElement.closest('script, style, template')) { continue; }
+        const text = node.nodeValue.trim();
+        if (text) { parts.push(text); }
+    }
+    return parts.join('');
+};
+const list = document.querySelector(%(container)s);
+if (!list) { return []; }
+const textFields = %(text_fields)s;
+const listFields = %(list_fields)s;
+return Array.from(list.children).filter(tile => tile.tagName === 'SECTION').map(tile => {
+    const divs = Array.from(tile.children).filter(element => element.tagName === 'DIV');
+    if (divs.length !== 2) { return null; }
+    const [upper, lower] = divs;
+    const job = {};
+    const title = upper.querySelector('.job-tile-title');
+    if (title) { job.title = title.textContent.trim(); }
+    const anchor = upper.querySelector('a');
+    if (anchor) { job.link = anchor.getAttribute('href'); }
+    for (const [value, key] of Object.entries(textFields)) {
+        const element = lower.querySelector(`[data-test="${value}"]`);
+        job[key] = element ? stripped(element) : '';
+    }
+    for (const [value, key] of Object.entries(listFields)) {
+        const elements = lower.querySelectorAll(`[data-test="${value}"]`);
+        if (elements.length) { job[key] = Array.from(elements).map(stripped); }
+    }
+    const feedback = lower.querySelector(`[data-test=${JSON.stringify(%(rating)s)}]`);
+    const rating = feedback && feedback.querySelector('span.sr-only');
+    if (rating) { job.rating = stripped(rating); }
+    return job;
+});
+"""
@@ -0,0 +1,165 @@
+"""
+Capture of the json responses with which upwork fills the job-tile-list,
+read from the performance log of the browser.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from settings import logger as log
+from utils.date_utils import date_to_relative, datetime_now
+
+# Parts of the urls of the api calls which bring the jobs of the feed.
+FEED_URL_PATTERNS = ('/api/graphql', '/find-work/api/feeds', '/api/feeds/', '/search/jobs')
+
+
+def feed_request_ids(entries: Iterable[dict]) -> List[str]:
+    """
+    Find the requests of the feed in the entries of the performance log.
+    :param entries: Entries as returned by driver.get_log('performance').
+    :return: Ids of the requests, to get their bodies through DevTools.
+    """
+    request_ids = []
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        if message.get('method') != 'Network.responseReceived':
+            continue
+        response = message['params'].get('response', {})
+        if 'json' not in response.get('mimeType', ''):
+            continue
+        if any(pattern in response.get('url', '') for pattern in FEED_URL_PATTERNS):
+            request_ids.append(message['params']['requestId'])
+    return request_ids
+
+
+def response_bodies(driver, request_ids: Iterable[str]) -> Iterator[Any]:
+    """Get the json of every request through DevTools, skipping the ones already discarded."""
+    for request_id in request_ids:
+        try:
+            response = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            body = response['body']
+            if response.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8')
+            yield json.loads(body)
+        except Exception as e:
+            log.warning(f'Body of the request {request_id} unavailable: {e}')
+
+
+def iter_job_nodes(payload: Any) -> Iterator[Dict[str, Any]]:
+    """Walk a json looking for the objects which depict a job."""
+    if isinstance(payload, dict):
+        if payload.get('title') and (payload.get('ciphertext') or payload.get('cipherText')):
+            yield payload
+            return
+        for value in payload.values():
+            yield from iter_job_nodes(value)
+    elif isinstance(payload, list):
+        for value in payload:
+            yield from iter_job_nodes(value)
+
+
+def first(node: Dict[str, Any], *keys: str, default: Any = '') -> Any:
+    """Value of the first key present and not empty in node. Keys can be nested with dots."""
+    for key in keys:
+        value: Any = node
+        for part in key.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        if value not in (None, '', [], {}):
+            return value
+    return default
+
+
+def job_type(node: Dict[str, Any]) -> str:
+    """Ex.: 'Hourly: $10-$25' or 'Fixed-price'"""
+    kind = str(first(node, 'type', 'jobType')).upper()
+    if 'HOURLY' in kind or kind == '2':
+        low = first(node, 'hourlyBudget.min', 'hourlyBudgetMin', default=None)
+        high = first(node, 'hourlyBudget.max', 'hourlyBudgetMax', default=None)
+        if low is not None and high is not None:
+            return f'Hourly: ${low:g}-${high:g}'
+        return 'Hourly'
+    return 'Fixed-price'
+
+
+def posted_on(value: Any, now: datetime) -> str:
+    """
+    Date of publication of the api as the relative date of the job tiles.
+    Ex.: '2023-05-01T10:00:00Z' -> '2 hours ago'
+    """
+    try:
+        return date_to_relative(datetime.fromisoformat(str(value).replace('Z', '+00:00')), now)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def formatted_amount(amount: float) -> str:
+    """
+    Amount of money as the job tiles show it.
+    Ex.: 150 -> '$150', 1500 -> '$1K+', 2500000 -> '$2M+'
+    """
+    if amount >= 1_000_000:
+        return f'${int(amount // 1_000_000)}M+'
+    if amount >= 1_000:
+        return f'${int(amount // 1_000)}K+'
+    return f'${amount:g}'
+
+
+def verification_status(status: Any) -> str:
+    """Ex.: 'VERIFIED' -> 'Payment verified', 'UNVERIFIED' -> 'Payment unverified'"""
+    if not status:
+        return ''
+    return 'Payment verified' if str(status).upper() == 'VERIFIED' else 'Payment unverified'
+
+
+def to_job(node: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Map a job of the api of the feed to the same dictionary built by
+    JobTileExtractor, so it can be normalized with normalize_job.
+    :param node: Job of the api.
+    :param now: Datetime the response was captured, by default now.
+    """
+    # The api gives it with the '~' of the links. Ex.: '~01bb2d063f7fd7f007'
+    ciphertext = str(first(node, 'ciphertext', 'cipherText')).lstrip('~')
+    amount = first(node, 'amount.amount', 'budget.amount', default=None)
+    rating = first(node, 'client.totalFeedback', default=None)
+    spent = first(node, 'client.totalSpent.amount', 'client.totalSpent', default=None)
+    skills = first(node, 'attrs', 'skills', 'ontologySkills', default=[])
+    job: Dict[str, Any] = {
+        'title': str(node['title']).strip(),
+        'link': f'/jobs/~{ciphertext}',
+        'job_type': job_type(node),
+        'posted_on': posted_on(first(node, 'publishedOn', 'createdOn', 'publishTime'), now or datetime_now()),
+        'workload': str(first(node, 'engagement', 'workload')),
+        'budget': f'${amount:g}' if isinstance(amount, (int, float)) and amount else '',
+        'duration': str(first(node, 'durationLabel', 'duration.label', 'duration')),
+        'contractor_tier': str(first(node, 'tierText', 'contractorTier', 'tier')),
+        'description': str(first(node, 'description')).strip(),
+        'verification_status': verification_status(first(node, 'client.paymentVerificationStatus')),
+        'spendings': (f'{formatted_amount(spent)}spent' if isinstance(spent, (int, float))
+                      else str(spent or '')),
+        'country': str(first(node, 'client.location.country', 'client.country')),
+    }
+    if skills:
+        job['skills'] = [str(first(skill, 'prettyName', 'name', 'prefLabel'))
+                         if isinstance(skill, dict) else str(skill) for skill in skills]
+    if rating is not None:
+        job['rating'] = f'Rating is {rating} out of 5.'
+    return job
+
+
+def capture_jobs(driver, entries: Iterable[dict]) -> List[Dict[str, Any]]:
+    """
+    Jobs of the feed captured from the network, in the order they came
+    and without duplicates.
+    :param driver: Instance of the webdriver, with the performance log enabled.
+    :param entries: Entries of the performance log.
+    :return: Jobs as built by JobTileExtractor, not normalized yet.
+    """
+    jobs: Dict[str, Dict[str, Any]] = {}
+    now = datetime_now()
+    for payload in response_bodies(driver, feed_request_ids(entries)):
+        for node in iter_job_nodes(payload):
+            job = to_job(node, now)
+            jobs.setdefault(job['link'], job)
+    return list(jobs.values())
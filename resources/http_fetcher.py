@@ -0,0 +1,59 @@
+from typing import Any, Dict, Optional, Sequence
+
+import httpx
+
+from settings import logger as log
+
+
+class HttpFetcher:
+    """
+    Fetch pages with plain HTTP requests reusing the session of a browser
+    which is already logged in, so the browser is only needed for the steps
+    which require javascript, like the login.
+    """
+
+    def __init__(self, cookies: Sequence[Dict[str, Any]], user_agent: str,
+                 timeout: float = 30, max_connections: int = 10,
+                 transport: Optional[Any] = None) -> None:
+        """
+        :param cookies: Cookies as they are returned by driver.get_cookies().
+        :param user_agent: User agent of the browser, so the requests look alike.
+        :param timeout: Seconds to wait for every request.
+        :param max_connections: Maximum of connections opened at the same time.
+        :param transport: Optional transport of httpx, used for testing.
+        """
+        jar = httpx.Cookies()
+        for cookie in cookies:
+            jar.set(cookie['name'], cookie['value'],
+                    domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+        headers = {'User-Agent': user_agent,
+                   'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8'}
+        self.client = httpx.Client(cookies=jar, headers=headers, timeout=timeout,
+                                   limits=httpx.Limits(max_connections=max_connections),
+                                   follow_redirects=True, transport=transport)
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs) -> 'HttpFetcher':
+        """Create a fetcher with the cookies and user agent of a selenium driver."""
+        user_agent = driver.execute_script('return navigator.userAgent;')
+        return cls(driver.get_cookies(), user_agent, **kwargs)
+
+    def fetch(self, url: str) -> str:
+        """
+        Get the content of an url.
+        :param url: Address of the page. Ex.: 'https://www.upwork.com/freelancers/~011cfba3bd0cf44f8d'
+        :return: Text of the response. Raises httpx.HTTPError if it fails.
+        """
+        log.info(f'Fetching {url=}')
+        response = self.client.get(url)
+        response.raise_for_status()
+        return response.text
+
+    def close(self) -> None:
+        self.client.close()
+
+    def __enter__(self) -> 'HttpFetcher':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
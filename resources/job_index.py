@@ -0,0 +1,139 @@
+import hashlib
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from resources.models import JobSchema
+from settings import DATA_DIR, logger as log
+
+# Stable id of the job into its link. Ex.: '/jobs/Extract-code_~01bb2d063f7fd7f007/?...'
+JOB_ID = re.compile(r'href="[^"]*~(0[0-9a-f]+)')
+# Stable id of the job into an absolute or relative link.
+LINK_ID = re.compile(r'~(0[0-9a-f]+)')
+# Relative date of the job, which changes along the time without the job changing.
+POSTED_ON = re.compile(r'(data-test="posted-on"[^>]*>)([^<]*)')
+# What the extraction reads of a tile: the links and the texts between the tags. The
+# attributes are left out, some of them change with the position of the tile in the feed.
+# Ex.: data-ev-position="3", id="popper_3"
+TILE_CONTENT = re.compile(r'href="([^"]*)"|>([^<]+)<')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    seen_at REAL NOT NULL
+)
+"""
+
+
+def job_id_of(link: str) -> str:
+    """
+    Id of a job into its link, or the link itself if it hasn't got one.
+    Ex.: 'https://www.upwork.com/jobs/Extract-code_~01bb2d063f7fd7f007/' -> '01bb2d063f7fd7f007'
+    """
+    match = LINK_ID.search(link)
+    return match.group(1) if match else link
+
+
+@dataclass
+class IndexEntry:
+    tile: str
+    job_id: str
+    fingerprint: str
+    posted_on: str
+    # 'new', 'changed' or 'skipped'
+    status: str = 'new'
+    job: Optional[JobSchema] = None
+
+
+class JobIndex:
+    """
+    Persistent index of the jobs already seen, by the id of their link, with
+    a fingerprint of their tile, so the tiles which didn't change since the
+    last scan are not parsed again. The connection belongs to the thread
+    which opened it, so it has to be closed by that thread.
+    """
+    # Increase it when the parsing of the tiles changes, so the jobs are parsed again.
+    VERSION = 1
+
+    def __init__(self, path: Path = DATA_DIR / 'jobs_index.sqlite3') -> None:
+        self.path = Path(path)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection opened on first use, creating the database if it doesn't exist."""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute(SCHEMA)
+        return self._connection
+
+    @classmethod
+    def entry(cls, tile: str) -> IndexEntry:
+        """
+        Id and fingerprint of a job tile, without parsing it.
+        :param tile: Html of the <section> of the job, see slice_children.
+        :return: Entry with an empty job_id if the link has no id.
+        """
+        match = JOB_ID.search(tile)
+        posted = POSTED_ON.search(tile)
+        content = '\n'.join(link or text.strip() for link, text in
+                            TILE_CONTENT.findall(POSTED_ON.sub(r'\1', tile)))
+        fingerprint = hashlib.blake2b(f'{cls.VERSION}:{content}'.encode('utf-8'),
+                                      digest_size=16).hexdigest()
+        return IndexEntry(tile, match.group(1) if match else '', fingerprint,
+                          posted.group(2).strip() if posted else '')
+
+    def lookup(self, tiles: Iterable[str]) -> List[IndexEntry]:
+        """
+        Classify the tiles as new, changed or skipped (already seen without
+        changes). The skipped ones bring the job of the index, with the
+        posted_on of the tile.
+        """
+        entries = [self.entry(tile) for tile in tiles]
+        ids = [entry.job_id for entry in entries if entry.job_id]
+        known = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            rows = self.connection.execute(
+                f'SELECT job_id, fingerprint, data FROM jobs '
+                f'WHERE job_id IN ({",".join("?" * len(chunk))})', chunk)
+            known.update({job_id: (fingerprint, data) for job_id, fingerprint, data in rows})
+
+        for entry in entries:
+            if entry.job_id not in known:
+                continue
+            fingerprint, data = known[entry.job_id]
+            if fingerprint != entry.fingerprint:
+                entry.status = 'changed'
+                continue
+            try:
+                job = JobSchema.model_validate_json(data)
+            except ValueError as e:
+                log.warning(f'Job {entry.job_id} of the index is not valid, parsing it again: {e}')
+                entry.status = 'changed'
+                continue
+            entry.status = 'skipped'
+            entry.job = job.model_copy(update={'posted_on': entry.posted_on}) if entry.posted_on else job
+        return entries
+
+    def store(self, entries: Iterable[IndexEntry]) -> None:
+        """Keep the jobs parsed of the entries, with their fingerprint."""
+        now = time.time()
+        rows = [(entry.job_id, entry.fingerprint, entry.job.model_dump_json(), now)
+                for entry in entries if entry.job_id and entry.job is not None]
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO jobs (job_id, fingerprint, data, seen_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(job_id) DO UPDATE SET fingerprint = excluded.fingerprint, '
+                'data = excluded.data, seen_at = excluded.seen_at', rows)
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -61,3 +61,20 @@ class ProfileSchema(BaseModel):
 class JobsAndProfileSchema(BaseModel):
     jobs: List[JobSchema]
     profile: ProfileSchema
+
+
+class AccountScanSchema(BaseModel):
+    username: str
+    succeeded: bool
+    seconds: float
+    error: Optional[str] = None
+    jobs: List[JobSchema] = []
+    profile: Optional[ProfileSchema] = None
+
+
+class BatchScanSchema(BaseModel):
+    accounts: List[AccountScanSchema]
+    succeeded: int
+    failed: int
+    seconds: float
+    accounts_per_minute: float
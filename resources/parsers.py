@@ -0,0 +1,92 @@
+import re
+from typing import IO, List, Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+from settings import HTML_PARSER, logger as log
+
+# Tree builders of BeautifulSoup, from the fastest to the slowest one.
+# 'lxml' and 'html5lib' are optional and need to be installed apart.
+PARSER_BACKENDS = ('lxml', 'html.parser', 'html5lib')
+
+DEFAULT_BACKEND = 'html.parser'
+
+# Any tag, skipping comments and the content of scripts and styles.
+TAG_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style)\b.*?</\1\s*>'
+    r'|<(/?)([a-zA-Z][\w-]*)(?:[^>"\']|"[^"]*"|\'[^\']*\')*>',
+    re.S | re.I
+)
+
+
+def available_backends() -> List[str]:
+    """Names of the parser backends that can be used in the current environment."""
+    backends = []
+    for backend in PARSER_BACKENDS:
+        try:
+            BeautifulSoup('', backend)
+        except FeatureNotFound:
+            continue
+        backends.append(backend)
+    return backends
+
+
+def make_soup(markup: str | bytes | IO, backend: Optional[str] = None,
+              parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Build the tree of a html content with the selected parser backend.
+    Every backend produces a BeautifulSoup instance, so the functions which
+    consume it (catch_jobs, parse_job, parse_profile, etc.) don't change.
+    :param markup: Html content of a site.
+    :param backend: Name of the parser backend, if it is not informed
+                    it will be taken from settings.HTML_PARSER.
+                    Ex.: 'lxml'
+    :param parse_only: Optional strainer to build only some parts of the tree.
+    :return: BeautifulSoup instance with the html data.
+    """
+    backend = backend or HTML_PARSER
+    try:
+        return BeautifulSoup(markup, backend, parse_only=parse_only)
+    except FeatureNotFound:
+        log.warning(f'Parser backend {backend!r} is not installed, '
+                    f'using {DEFAULT_BACKEND!r} instead')
+        return BeautifulSoup(markup, DEFAULT_BACKEND, parse_only=parse_only)
+
+
+def slice_children(html_content: str, container_attr: str, child: str = 'section') -> List[str]:
+    """
+    Cut out of the raw html the direct children of a container without
+    building any tree, so they can be parsed apart (Ex.: in other processes).
+    :param html_content: String which depicts the content of a site.
+    :param container_attr: Attribute, as it is written in the html, which
+                           identifies the opening tag of the container.
+                           Ex.: 'data-test="job-tile-list"'
+    :param child: Name of the tag of the children to be cut out.
+    :return: Html of every child, in the same order as in the page.
+             Ex.: ['<section ...>...</section>', '<section ...>...</section>']
+    """
+    opening = re.search(r'<([a-zA-Z][\w-]*)[^>]*' + re.escape(container_attr), html_content)
+    if not opening:
+        return []
+
+    container = opening.group(1).lower()
+    container_depth, child_depth, start = 1, 0, 0
+    children = []
+    for match in TAG_PATTERN.finditer(html_content, opening.end()):
+        name = (match.group(3) or '').lower()
+        closing = match.group(2) == '/'
+        if name == child and container_depth == 1:
+            if not closing:
+                if child_depth == 0:
+                    start = match.start()
+                child_depth += 1
+            elif child_depth:
+                child_depth -= 1
+                if child_depth == 0:
+                    children.append(html_content[start:match.end()])
+        elif name == container:
+            container_depth += -1 if closing else 1
+            if container_depth == 0:
+                break
+    return children
@@ -0,0 +1,72 @@
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from settings import (
+    REQUEST_ATTEMPTS,
+    REQUEST_BACKOFF,
+    REQUEST_DEADLINE,
+    REQUEST_MAX_BACKOFF,
+    REQUEST_PAGE_TIMEOUT
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    # Maximum attempts to load a page.
+    attempts: int = REQUEST_ATTEMPTS
+    # Maximum seconds along all the attempts, pauses included.
+    deadline: float = REQUEST_DEADLINE
+    # Maximum seconds waiting for the element expected on every attempt.
+    page_timeout: float = REQUEST_PAGE_TIMEOUT
+    # Pause before the second attempt, doubled on every next one up to max_backoff.
+    backoff: float = REQUEST_BACKOFF
+    max_backoff: float = REQUEST_MAX_BACKOFF
+
+    def pause(self, attempt: int, rng: Optional[random.Random] = None) -> float:
+        """
+        Seconds to wait after a failed attempt, exponential with full jitter,
+        so retries of several scanners don't hit the site at the same time.
+        :param attempt: Number of the attempt which failed, starting at 1.
+        """
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return (rng or random).uniform(0, ceiling)
+
+
+@dataclass
+class UrlStats:
+    attempts: int = 0
+    failures: int = 0
+    seconds: float = 0.0
+    errors: Counter = field(default_factory=Counter)
+
+
+class RetryStats:
+    """Attempts, failures and the errors of every url requested along a run."""
+
+    def __init__(self) -> None:
+        self.urls: Dict[str, UrlStats] = {}
+
+    def record(self, url: str, seconds: float, error: Optional[str] = None) -> None:
+        """
+        Add up an attempt to load url.
+        :param seconds: Duration of the attempt.
+        :param error: Name of the error when the attempt failed.
+                      Ex.: 'TimeoutException'
+        """
+        stats = self.urls.setdefault(url, UrlStats())
+        stats.attempts += 1
+        stats.seconds += seconds
+        if error:
+            stats.failures += 1
+            stats.errors[error] += 1
+
+    def report(self) -> Dict[str, dict]:
+        """Stats of the urls which failed at least once."""
+        return {
+            url: {'attempts': stats.attempts, 'failures': stats.failures,
+                  'seconds': round(stats.seconds, 2), 'errors': dict(stats.errors)}
+            for url, stats in self.urls.items() if stats.failures
+        }
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from settings import DATA_DIR, SESSION_MAX_AGE, logger as log
+
+LOCAL_STORAGE_DUMP = 'return Object.assign({}, window.localStorage);'
+
+LOCAL_STORAGE_LOAD = """
+const items = arguments[0];
+for (const key in items) { window.localStorage.setItem(key, items[key]); }
+"""
+
+
+class SessionCache:
+    """
+    Keep the cookies and the local storage of a browser logged in, so
+    next runs can restore them instead of going through the login again.
+    """
+
+    def __init__(self, username: Optional[str], folder: Path = DATA_DIR / 'sessions',
+                 max_age: int = SESSION_MAX_AGE) -> None:
+        """
+        :param username: Account owner of the session, a file is kept per username.
+        :param folder: Folder where the sessions are saved.
+        :param max_age: Seconds after which a saved session is considered expired.
+        """
+        self.folder = folder
+        self.max_age = max_age
+        digest = hashlib.sha1((username or '').encode()).hexdigest()[:16]
+        self.path = folder / f'session_{digest}.json'
+
+    def save(self, driver) -> None:
+        """Dump the cookies and local storage of the current page of the driver."""
+        data = {
+            'saved_at': time.time(),
+            'cookies': driver.get_cookies(),
+            'local_storage': driver.execute_script(LOCAL_STORAGE_DUMP) or {},
+        }
+        self.folder.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.unlink(missing_ok=True)
+        # Created readable only by the owner, the cookies are never written with wider permissions.
+        with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'w') as file:
+            file.write(json.dumps(data))
+        tmp_path.replace(self.path)
+        log.info(f'Session saved with {len(data["cookies"])} cookies')
+
+    def load(self) -> Optional[dict]:
+        """Read the saved session. None when it doesn't exist or it has expired."""
+        if not self.path.exists():
+            return None
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            log.warning(f'Session file unreadable: {e}')
+            return None
+        if time.time() - data.get('saved_at', 0) > self.max_age:
+            log.info('Saved session has expired')
+            return None
+        return data
+
+    def restore(self, driver, url: str) -> bool:
+        """
+        Put the saved cookies and local storage into the driver. The driver
+        is taken to url first, because the cookies can only be added to the
+        domain of the current page.
+        :param driver: Instance of the webdriver.
+        :param url: Url of the site of the session. Ex.: 'https://www.upwork.com/'
+        :return: True if there was a session to restore, otherwise, False.
+        """
+        if not (data := self.load()):
+            return False
+        driver.get(url)
+        for cookie in data['cookies']:
+            if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+                cookie.pop('sameSite', None)
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                log.warning(f'Cookie {cookie.get("name")!r} not restored: {e}')
+        if data['local_storage']:
+            driver.execute_script(LOCAL_STORAGE_LOAD, data['local_storage'])
+        log.info(f'Session restored with {len(data["cookies"])} cookies')
+        return True
+
+    def clear(self) -> None:
+        """Remove the saved session."""
+        self.path.unlink(missing_ok=True)
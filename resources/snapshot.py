@@ -0,0 +1,70 @@
+import re
+from functools import cached_property
+from typing import Dict, Tuple
+
+from resources.error_messages import ERRORS
+
+CLOUDFLARE_TITLE = 'Just a moment...'
+
+# Markers of the interstitial challenge page of Cloudflare, besides its title. Not
+# 'challenge-platform', whose script of bot management is injected into ordinary pages.
+CLOUDFLARE_MARKERS = ('_cf_chl_opt', 'cf-browser-verification')
+
+PAGE_PATTERN = re.compile('|'.join([
+    *(f'(?P<error_{i}>{re.escape(error)})' for i, error in enumerate(ERRORS)),
+    *(f'(?P<cloudflare_{i}>{re.escape(marker)})' for i, marker in enumerate(CLOUDFLARE_MARKERS)),
+    r'profileUrl:"(?P<profile_url>[^"]+)"',
+]))
+
+
+class PageSnapshot:
+    """
+    Copy of the state of the page taken once per navigation, so the
+    page source travels only once over the webdriver. Errors, Cloudflare
+    and the url of the profile are detected in a single scan of it.
+    """
+
+    def __init__(self, source: str, title: str = '', url: str = '') -> None:
+        self.source = source
+        self.title = title
+        self.url = url
+
+    @classmethod
+    def from_driver(cls, driver) -> 'PageSnapshot':
+        return cls(driver.page_source, driver.title, driver.current_url)
+
+    @cached_property
+    def matches(self) -> Dict[str, str]:
+        """First match of every group of PAGE_PATTERN found in the source."""
+        found: Dict[str, str] = {}
+        for match in PAGE_PATTERN.finditer(self.source):
+            name = match.lastgroup
+            if name and name not in found:
+                found[name] = match.group(name)
+        return found
+
+    @property
+    def errors(self) -> Tuple[str, ...]:
+        """Errors of ERRORS in the page, in the same order of ERRORS."""
+        return tuple(error for i, error in enumerate(ERRORS) if f'error_{i}' in self.matches)
+
+    @property
+    def error(self) -> str:
+        """First error of ERRORS in the page, empty if there isn't any."""
+        return next(iter(self.errors), '')
+
+    @property
+    def is_cloudflare(self) -> bool:
+        """True if the page is the validation of Cloudflare."""
+        return self.title == CLOUDFLARE_TITLE or any(name.startswith('cloudflare_')
+                                                     for name in self.matches)
+
+    @property
+    def profile_url(self) -> str:
+        """
+        Url of the profile of the user logged in, empty if it isn't in the page.
+        Ex.: 'https://upwork.com/freelancers/~011cfba3bd0cf44f8d'
+        """
+        if url := self.matches.get('profile_url'):
+            return url.encode('utf-8').decode('unicode-escape')
+        return ''
@@ -0,0 +1,52 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class Timeline:
+    """
+    Start and end of the phases of a run, which can happen at the same time
+    in different threads, to know how much is saved overlapping them.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float, float]] = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Record the block as a phase of the timeline.
+            with timeline.phase('profile'):
+                ...
+        """
+        start = time.perf_counter() - self.started
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases.append((name, start, time.perf_counter() - self.started))
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Seconds since the timeline started at which every phase began and
+        ended, their sum as if they were sequential, the elapsed time from the
+        first to the last one, and the difference saved by the overlap.
+        A phase can happen more than once, ex.: 'jobs' when the extraction
+        from the network falls back to the page, so they are kept in order.
+        Ex.: {'phases': [('login', 0.0, 3.1), ('jobs', 3.1, 3.4), ('jobs', 5.2, 6.0)], ...}
+        """
+        with self.lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1])
+        if not phases:
+            return {'phases': [], 'sequential': 0.0, 'elapsed': 0.0, 'saved': 0.0}
+        sequential = sum(end - start for _, start, end in phases)
+        elapsed = max(end for *_, end in phases) - phases[0][1]
+        return {
+            'phases': [(name, round(start, 2), round(end, 2)) for name, start, end in phases],
+            'sequential': round(sequential, 2),
+            'elapsed': round(elapsed, 2),
+            'saved': round(sequential - elapsed, 2),
+        }
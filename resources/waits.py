@@ -0,0 +1,136 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from selenium.common import TimeoutException, WebDriverException
+
+from settings import JITTER_BUDGET, WAIT_PROFILE, logger as log
+
+NETWORK_STATE = ("return [document.readyState, "
+                 "performance.getEntriesByType('resource').length];")
+
+
+@dataclass(frozen=True)
+class WaitPolicy:
+    name: str
+    # Multiplier of the human-like pauses requested by the scanner, 0 disables them.
+    jitter_scale: float
+    # Maximum seconds of human-like pauses along the whole run.
+    jitter_budget: float
+    # Maximum seconds waiting for a readiness signal.
+    timeout: float
+    # Seconds without new resources loaded to consider the network idle.
+    network_idle: float
+    poll: float = 0.25
+
+
+PROFILES: Dict[str, WaitPolicy] = {
+    'human': WaitPolicy('human', jitter_scale=0.5, jitter_budget=45, timeout=30, network_idle=1.0),
+    'fast': WaitPolicy('fast', jitter_scale=0, jitter_budget=0, timeout=20, network_idle=0.5),
+}
+
+
+class Waiter:
+    """
+    Wait on the readiness signals of the browser (elements, network idle or
+    url change) instead of fixed sleeps, adding optional human-like pauses
+    limited by a budget. It keeps how much time is spent waiting.
+    """
+
+    def __init__(self, policy: Optional[WaitPolicy] = None) -> None:
+        self.policy = policy or get_policy()
+        self.started = time.perf_counter()
+        self.waited = 0.0
+        self.jittered = 0.0
+
+    def until(self, condition: Callable[[], Any], timeout: Optional[float] = None,
+              message: str = '') -> Any:
+        """
+        Poll a condition until it returns something truthy.
+        :param condition: Function without arguments, the exceptions of the
+                          webdriver it raises are considered as not ready.
+        :param timeout: Maximum seconds, by default the one of the policy.
+        :param message: Description of the condition for the exception.
+        :return: Value returned by the condition.
+        """
+        timeout = self.policy.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    if value := condition():
+                        return value
+                except WebDriverException:
+                    pass
+                if time.perf_counter() - start >= timeout:
+                    raise TimeoutException(f'{message or "Condition"} not met in {timeout}s')
+                time.sleep(self.policy.poll)
+        finally:
+            self.waited += time.perf_counter() - start
+
+    def for_element(self, driver, condition: Callable, timeout: Optional[float] = None) -> Any:
+        """Wait for an expected condition of selenium. Ex.: EC.visibility_of_element_located(...)"""
+        return self.until(lambda: condition(driver), timeout, message=f'Element of {condition}')
+
+    def for_url_change(self, driver, previous_url: str, timeout: Optional[float] = None) -> str:
+        """Wait until the browser leaves previous_url, returns the new url."""
+        return self.until(lambda: driver.current_url != previous_url and driver.current_url,
+                          timeout, message=f'Leaving {previous_url}')
+
+    def for_network_idle(self, driver, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the document has loaded and no new resources were
+        requested along policy.network_idle seconds.
+        """
+        state = {'count': -1, 'since': time.perf_counter()}
+
+        def is_idle():
+            ready, count = driver.execute_script(NETWORK_STATE)
+            now = time.perf_counter()
+            if ready != 'complete' or count != state['count']:
+                state['count'], state['since'] = count, now
+                return False
+            return now - state['since'] >= self.policy.network_idle
+
+        try:
+            return self.until(is_idle, timeout, message='Network idle')
+        except TimeoutException:
+            log.warning('Network did not become idle, continuing')
+            return False
+
+    def jitter(self, start: float = 4, end: float = 10) -> float:
+        """
+        Human-like pause between start and end seconds, scaled by the policy
+        and limited by what is left of its budget.
+        :return: Seconds slept.
+        """
+        left = self.policy.jitter_budget - self.jittered
+        seconds = min(random.uniform(start, end) * self.policy.jitter_scale, max(left, 0))
+        if seconds > 0:
+            time.sleep(seconds)
+            self.jittered += seconds
+            self.waited += seconds
+        return seconds
+
+    def report(self) -> Dict[str, float]:
+        """Seconds of the run spent waiting, in human-like pauses, and working."""
+        total = time.perf_counter() - self.started
+        return {
+            'total': round(total, 2),
+            'waiting': round(self.waited, 2),
+            'jitter': round(self.jittered, 2),
+            'working': round(total - self.waited, 2),
+        }
+
+
+def get_policy(name: str = WAIT_PROFILE) -> WaitPolicy:
+    """Policy by its name, applying the jitter budget of the settings if it is defined."""
+    if name not in PROFILES:
+        log.warning(f'Wait profile {name!r} unknown, using "human"')
+        name = 'human'
+    policy = PROFILES[name]
+    if JITTER_BUDGET is not None:
+        policy = WaitPolicy(policy.name, policy.jitter_scale, JITTER_BUDGET,
+                            policy.timeout, policy.network_idle, policy.poll)
+    return policy
@@ -1,27 +1,47 @@
+import signal
+import sys
+import time
+from pathlib import Path
+
 import typer
 
+from benchmarks.runner import (
+    BASELINE_PATH,
+    DEFAULT_SIZES,
+    END_TO_END_SIZES,
+    compare_blocking,
+    compare_exports,
+    load_baseline,
+    report,
+    run_benchmarks,
+    run_end_to_end,
+    save_baseline
+)
 from resources.decorators import logtime
+from resources.driver_pool import DriverPool
 from resources.models import JobsAndProfileSchema
+from scanners.batch import load_accounts, run_batch
 from scanners.upwork import UpWorkScanner
-from settings import logger as log
-from utils.file_utils import export_json
+from settings import BASE_DIR, BATCH_BROWSERS, BATCH_WORKERS, DRIVER_POOL_SIZE, logger as log
+from utils.changefeed import Changefeed
+from utils.columnar import columnar_format, export_columnar
+from utils.file_utils import export_json, export_ndjson, write_atomic
+from utils.sqlite_sink import SqliteSink
 
 app = typer.Typer(help="CLI to execute scanners.")
 
 
-@logtime('SCANNER')
-@app.command()
-def upwork(export: str = 'json'):
-    """Execute the scanner of upwork.com"""
-    info = {
-        'username': 'recruitment+scanners+task@argyle.com',
-        'username_backup_one': 'recruitment+scanners+data@argyle.com',
-        'username_backup_two': 'recruitment+tasks@argyle.com',
-        'password': 'ArgyleAwesome!@',
-        'secret_answer': 'Jimmy'
-    }
-    scanner = UpWorkScanner(info)
-    scanner.run()
+UPWORK_INFO = {
+    'username': 'recruitment+scanners+task@argyle.com',
+    'username_backup_one': 'recruitment+scanners+data@argyle.com',
+    'username_backup_two': 'recruitment+tasks@argyle.com',
+    'password': 'ArgyleAwesome!@',
+    'secret_answer': 'Jimmy'
+}
+
+
+def export_scanned_data(scanner: UpWorkScanner, export: str) -> None:
+    """Export the information scanned by the scanner in the format informed."""
     if scanner.scanned_data:
         match export:
             case 'json':
@@ -29,6 +49,18 @@ def upwork(export: str = 'json'):
                 profile = scanner.scanned_data['profile']
                 jobs_and_profile = JobsAndProfileSchema(jobs=jobs, profile=profile)
                 export_json(jobs_and_profile.model_dump_json(indent=2), filename='upwork')
+            case 'ndjson' | 'ndjson.gz' | 'ndjson.zst':
+                compression = {'ndjson': '', 'ndjson.gz': 'gzip', 'ndjson.zst': 'zstd'}[export]
+                export_ndjson(scanner.scanned_data['jobs'], 'upwork_jobs', compression)
+                if profile := scanner.scanned_data.get('profile'):
+                    write_atomic(BASE_DIR / 'upwork_profile.json', profile.model_dump_json(indent=2))
+            case 'parquet' | 'csv':
+                export_columnar(scanner.scanned_data['jobs'], 'upwork_jobs', export)
+            case 'sqlite':
+                with SqliteSink() as sink:
+                    sink.write(scanner.scanned_data['jobs'], scanner.scanned_data.get('profile'))
+            case 'changefeed':
+                Changefeed().emit(scanner.scanned_data['jobs'], scanner.scanned_data.get('profile'))
             case _:
                 log.warning('Type of format to export not accepted.')
     else:
@@ -36,6 +68,92 @@ def upwork(export: str = 'json'):
                     f'in a {export} file')
 
 
+@logtime('SCANNER')
+@app.command()
+def upwork(export: str = 'json'):
+    """Execute the scanner of upwork.com"""
+    if export == 'parquet':
+        # Checked before scanning, so a missing pyarrow isn't found out after the scan.
+        export = columnar_format(export)
+    scanner = UpWorkScanner(UPWORK_INFO)
+    scanner.run()
+    export_scanned_data(scanner, export)
+
+
+@app.command()
+def batch(accounts: Path, workers: int = BATCH_WORKERS, browsers: int = BATCH_BROWSERS,
+          export: str = 'json'):
+    """Execute the scanner of upwork.com for every account of a json file."""
+    result = run_batch(load_accounts(accounts), workers, browsers)
+    match export:
+        case 'json':
+            export_json(result.model_dump_json(indent=2), filename='upwork_batch')
+        case _:
+            log.warning('Type of format to export not accepted.')
+    typer.echo(f'{len(result.accounts)} accounts in {result.seconds:.1f}s: '
+               f'{result.succeeded} succeeded, {result.failed} failed, '
+               f'{result.accounts_per_minute:.2f} accounts per minute')
+
+
+@app.command()
+def serve(interval: int = 30 * 60, pool_size: int = DRIVER_POOL_SIZE, export: str = 'json'):
+    """Keep a pool of browsers started and execute the scanner of upwork.com every interval seconds."""
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    pool = DriverPool(pool_size)
+    try:
+        pool.warm()
+        while True:
+            started = time.monotonic()
+            scanner = UpWorkScanner(UPWORK_INFO, pool=pool)
+            try:
+                scanner.run()
+            except Exception as e:
+                log.error(f'Scanner failed: {e}')
+            else:
+                export_scanned_data(scanner, export)
+            log.info(f'Scanner took {time.monotonic() - started:.1f}s, next one in {interval}s')
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        log.info('Stopping the daemon')
+    finally:
+        pool.close()
+
+
+@app.command()
+def bench(sizes: str = ','.join(map(str, DEFAULT_SIZES)), repeat: int = 3,
+          parser: str = '', baseline: bool = True, save: bool = False):
+    """Benchmark the parsing and validation pipeline with synthetic pages."""
+    measures = run_benchmarks([int(size) for size in sizes.split(',')], repeat, parser or None)
+    typer.echo(report(measures, load_baseline() if baseline else None))
+    if save:
+        save_baseline(measures)
+        log.info(f'Baseline saved in {BASELINE_PATH}')
+
+
+@app.command()
+def bench_e2e(sizes: str = ','.join(map(str, END_TO_END_SIZES)), page_size: int = 10,
+              latency: float = 0.0, parser: str = '', baseline: bool = True, save: bool = False):
+    """Benchmark the whole scanner against a local stand-in of upwork.com."""
+    measures = run_end_to_end([int(size) for size in sizes.split(',')], page_size,
+                              latency, parser or None)
+    typer.echo(report(measures, load_baseline() if baseline else None))
+    if save:
+        save_baseline(measures)
+        log.info(f'Baseline saved in {BASELINE_PATH}')
+
+
+@app.command()
+def bench_export(size: int = 10000, repeat: int = 3):
+    """Compare the formats of export by the time to write and read the jobs and the size of the file."""
+    typer.echo(compare_exports(size, repeat))
+
+
+@app.command()
+def bench_blocking(jobs: int = 30, page_size: int = 10, latency: float = 0.0, parser: str = ''):
+    """Compare the requests and bytes loaded by the scanner with and without blocking resources."""
+    typer.echo(compare_blocking(jobs, page_size, latency, parser or None))
+
+
 @app.command()
 def another_scanner(export: str = 'json'):
     ...
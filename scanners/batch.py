@@ -0,0 +1,116 @@
+"""
+Batch mode: the scanner of upwork executed for many accounts at the same
+time across worker processes, with a limit of browsers running at once.
+"""
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from resources.models import AccountScanSchema, BatchScanSchema
+from scanners.upwork import UpWorkScanner
+from settings import BATCH_BROWSERS, BATCH_WORKERS, logger as log
+
+# Semaphore shared by the workers, acquired while a browser is running.
+_browsers: Any = None
+
+
+def _init_worker(browsers) -> None:
+    global _browsers
+    _browsers = browsers
+
+
+def load_accounts(path: Path) -> List[Dict[str, str]]:
+    """
+    Read the accounts of a json file with a list of them.
+    :param path: Path of the file. Ex.:
+                [{"username": "...", "password": "...", "secret_answer": "..."}]
+    :return: Accounts with at least username and password.
+    """
+    accounts = json.loads(Path(path).read_text())
+    if not isinstance(accounts, list):
+        raise ValueError(f'{path} must contain a list of accounts')
+    for number, account in enumerate(accounts, 1):
+        if not account.get('username') or not account.get('password'):
+            raise ValueError(f'Account {number} of {path} needs username and password')
+    return accounts
+
+
+def scan_account(account: Dict[str, str], url: Optional[str] = None) -> AccountScanSchema:
+    """
+    Execute the scanner for an account. Executed in the worker processes of
+    run_batch, so the failures are returned instead of raised.
+    :param account: Credentials of the account, see UPWORK_INFO in scan.py.
+    :param url: Base url of the site, by default the one of the settings.
+    :return: Result of the account with the jobs and the profile scanned,
+             also the ones scanned when it failed.
+    """
+    start = time.perf_counter()
+    scanner = UpWorkScanner(account, url=url)
+    # The workers of the batch already use all the cpus.
+    scanner.parse_workers = 1
+    error = None
+    try:
+        if _browsers is not None:
+            with _browsers:
+                scanner.run()
+        else:
+            scanner.run()
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+    else:
+        if not scanner.logged_in:
+            error = 'LoginFailed: the account could not log in'
+        elif 'jobs' not in scanner.scanned_data:
+            error = 'The jobs were not scanned'
+        elif 'profile' not in scanner.scanned_data:
+            error = 'The profile was not scanned'
+    if error:
+        log.error(f'Scanner of {account["username"]} failed: {error}')
+    # The jobs and profile scanned before a failure are kept.
+    return AccountScanSchema(username=account['username'], succeeded=error is None,
+                             seconds=time.perf_counter() - start, error=error,
+                             jobs=scanner.scanned_data.get('jobs', []),
+                             profile=scanner.scanned_data.get('profile'))
+
+
+def run_batch(accounts: List[Dict[str, str]], workers: int = BATCH_WORKERS,
+              browsers: int = BATCH_BROWSERS, url: Optional[str] = None,
+              scan: Callable[..., AccountScanSchema] = scan_account) -> BatchScanSchema:
+    """
+    Scan the accounts concurrently across worker processes.
+    :param accounts: Credentials of every account, see load_accounts.
+    :param workers: Maximum of processes.
+    :param browsers: Maximum of browsers running at the same time.
+    :param url: Base url of the site, by default the one of the settings.
+    :param scan: Function executed for every account in the workers.
+    :return: Results of every account, in the same order of accounts, and
+             the throughput of the batch.
+    """
+    start = time.perf_counter()
+    results: List[Optional[AccountScanSchema]] = [None] * len(accounts)
+    if accounts:
+        browsers_semaphore = multiprocessing.BoundedSemaphore(max(1, browsers))
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(accounts))),
+                                 initializer=_init_worker,
+                                 initargs=(browsers_semaphore,)) as executor:
+            futures = {executor.submit(scan, account, url): number
+                       for number, account in enumerate(accounts)}
+            for future in as_completed(futures):
+                number = futures[future]
+                try:
+                    results[number] = future.result()
+                except Exception as e:
+                    results[number] = AccountScanSchema(username=accounts[number]['username'],
+                                                        succeeded=False, seconds=0.0,
+                                                        error=f'{type(e).__name__}: {e}')
+                log.info(f'Account {number + 1}/{len(accounts)} finished')
+
+    seconds = time.perf_counter() - start
+    done = [result for result in results if result is not None]
+    succeeded = sum(result.succeeded for result in done)
+    return BatchScanSchema(accounts=done, succeeded=succeeded, failed=len(done) - succeeded,
+                           seconds=seconds,
+                           accounts_per_minute=len(done) / seconds * 60 if seconds else 0.0)
@@ -1,25 +1,61 @@
-import re
-from typing import Tuple, List, Dict, Any
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from typing import Tuple, List, Dict, Any, Optional
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from selenium.common import TimeoutException
 
 from resources.base import BaseSelenium, UpWorkProfile, Scanner
+from resources.driver_pool import DriverPool
 from resources.error_messages import (
-    ERRORS,
     RESET_SECURITY_QUESTION,
     TECHNICAL_DIFFICULTIES,
     USERNAME_INCORRECT
 )
 from resources.exceptions import CloudFareException, LoginFailed
+from resources.extractors import JobTileExtractor
+from resources.feed_capture import capture_jobs
+from resources.http_fetcher import HttpFetcher
+from resources.job_index import JobIndex
 from resources.models import ProfileSchema, JobSchema
-from settings import BASE_DIR, logger as log
+from resources.parsers import make_soup, slice_children
+from resources.session import SessionCache
+from resources.snapshot import PageSnapshot
+from resources.timeline import Timeline
+from settings import (
+    ARCHIVE_PAGES,
+    EXTRACTION_MODE,
+    HTTP_FETCH,
+    JOB_INDEX,
+    OVERLAP_PROFILE,
+    PARALLEL_THRESHOLD,
+    PARSE_CHUNK_SIZE,
+    PARSE_WORKERS,
+    SCOPED_PARSING,
+    SESSION_CACHE,
+    UPWORK_URL,
+    logger as log
+)
+from utils.file_utils import archive_page
+
+
+PROFILE_URL_SCRIPT = r"""
+const match = document.documentElement.innerHTML.match(/profileUrl:"([^"]+)"/);
+return match ? match[1] : '';
+"""
 
 
 class UpWorkScanner(BaseSelenium, Scanner):
-    URL = 'https://www.upwork.com/'
+    URL = UPWORK_URL
+    job_extractor = JobTileExtractor()
 
-    def __init__(self, info: dict | UpWorkProfile) -> None:
+    # Parts of the pages which are built into the tree when SCOPED_PARSING is enabled.
+    JOBS_REGION = SoupStrainer('div', attrs={'data-test': 'job-tile-list'})
+    PROFILE_REGION = SoupStrainer('div', attrs={'data-qa-profile-viewer-uid': True})
+
+    def __init__(self, info: dict | UpWorkProfile, parser: Optional[str] = None,
+                 pool: Optional[DriverPool] = None, url: Optional[str] = None) -> None:
         BaseSelenium.__init__(self, preload_driver=False)
         Scanner.__init__(self)
 
@@ -31,9 +67,24 @@ class UpWorkScanner(BaseSelenium, Scanner):
             elif isinstance(info, UpWorkProfile):
                 self.profile = info
 
+        if url:
+            self.URL = url if url.endswith('/') else f'{url}/'
         self.login_url = f'{self.URL}ab/account-security/login'
+        self.home_url = f'{self.URL}nx/find-work/'
+        self.session = SessionCache(self.profile.username)
+        self.http: Optional[HttpFetcher] = None
+        self.snapshot: Optional[PageSnapshot] = None
         self.login_attempts = 0
+        self.logged_in = False
+        self.parser = parser
+        self.pool = pool
+        self.parse_workers = PARSE_WORKERS
+        self.parse_chunk_size = PARSE_CHUNK_SIZE
+        self.parallel_threshold = PARALLEL_THRESHOLD
         self.scanned_data: Dict[str, Any] = {}
+        self.job_index: Optional[JobIndex] = JobIndex() if JOB_INDEX else None
+        self.index_report: Dict[str, int] = {}
+        self.timeline = Timeline()
 
     def login(self) -> bool:
         """
@@ -43,7 +94,7 @@ class UpWorkScanner(BaseSelenium, Scanner):
         log.info('Starting login process')
         self.custom_request(self.login_url, 'id', 'login_username')
 
-        if self.driver.title == 'Just a moment...':
+        if self.take_snapshot().is_cloudflare:
             raise CloudFareException
 
         try:
@@ -61,10 +112,63 @@ class UpWorkScanner(BaseSelenium, Scanner):
             else:
                 if 'Login' not in self.driver.title:
                     log.info('Logged in successfully')
+                    if SESSION_CACHE:
+                        self.session.save(self.driver)
                     return True
                 else:
                     return False
 
+    def restore_session(self) -> bool:
+        """
+        Try to skip the login process restoring the session saved
+        after the last successful login.
+        :return: True if the restored session is still logged in, otherwise, False.
+        """
+        if not SESSION_CACHE or not self.session.restore(self.driver, self.URL):
+            return False
+
+        self.open_url(self.home_url, self.request_deadline)
+        if self.is_logged_in():
+            log.info('Logged in with the saved session')
+            return True
+
+        log.info('Saved session is no longer valid, removing it')
+        self.session.clear()
+        self.driver.delete_all_cookies()
+        return False
+
+    def renew_driver(self) -> None:
+        """
+        Replace a browser which stopped responding, see BaseSelenium.renew_driver.
+        Once the scanner is logged in, the new browser is logged in again,
+        restoring the saved session or going through the login, so the next
+        attempts don't land on the login page. The login doesn't go over the
+        deadline of the request which renewed the browser.
+        """
+        super().renew_driver()
+        if not self.logged_in:
+            return
+        # A browser renewed along this login is not logged in again.
+        self.logged_in = False
+        if self.request_deadline is not None:
+            if (left := self.request_deadline - time.monotonic()) <= 0:
+                log.error('The deadline of the request is spent, the new browser is not logged in')
+                return
+            self.driver.set_page_load_timeout(min(self.retry_policy.page_timeout, left))
+        try:
+            self.logged_in = self.restore_session() or self.login()
+        except Exception as e:
+            log.error(f'Error attempting to log in the new browser: {e}')
+        if not self.logged_in:
+            log.error('The new browser is not logged in')
+
+    def is_logged_in(self) -> bool:
+        """Cheap check of the current page to know if the browser is logged in."""
+        if 'account-security/login' in self.driver.current_url:
+            return False
+        title = self.driver.title
+        return 'Login' not in title and title != 'Just a moment...'
+
     # @logtime('')
     def step_username(self) -> None:
         """Put the name of the user into the respective field
@@ -81,8 +185,10 @@ class UpWorkScanner(BaseSelenium, Scanner):
         and click in a button for confirmation."""
         log.info('Typing password...')
         self.put_text(self.profile.password, 'xpath', '//input[@name="login[password]"]')
+        previous_url = self.driver.current_url
         self.click_on('xpath', '//button[text()="Log in"]')
         log.info('Password typed')
+        self.wait_for_navigation(previous_url)
         self.time_wait(6, 10)
 
     # @logtime('')
@@ -98,20 +204,35 @@ class UpWorkScanner(BaseSelenium, Scanner):
         else:
             log.info('Typing secret-answer...')
             self.put_text(self.profile.secret_answer, 'id', 'login_answer')
+            previous_url = self.driver.current_url
             self.click_on('xpath', '//button[text()="Continue"]')
+            self.wait_for_navigation(previous_url)
             self.time_wait(7, 10)
             log.info('Secret-answer typed...')
 
+    def wait_for_navigation(self, previous_url: str) -> None:
+        """Wait until the browser leaves previous_url and the new page is loaded.
+        If it doesn't leave it, probably there is an error message in the page."""
+        try:
+            self.waits.for_url_change(self.driver, previous_url)
+        except TimeoutException:
+            log.info(f'Browser still in {previous_url}')
+        else:
+            self.waits.for_network_idle(self.driver)
+
     def detect_html_message_errors(self) -> str:
         """
         Detect if in the current state of the site, there is at least one
         of the errors in the constant ERRORS.
         :return: Text of the error.
         """
-        result = list(filter(lambda txt: txt in self.driver.page_source, ERRORS))
-        if result:
-            return result[0]
-        return ''
+        return self.take_snapshot().error
+
+    def take_snapshot(self) -> PageSnapshot:
+        """Copy the current state of the page, to be analyzed without
+        asking the browser again until the next navigation."""
+        self.snapshot = PageSnapshot.from_driver(self.driver)
+        return self.snapshot
 
     def strategy(self, strategy_name) -> None:
         """
@@ -151,110 +272,29 @@ class UpWorkScanner(BaseSelenium, Scanner):
         """
         Scrap the job element in order to get all the information possible.
         Then it is normalized and return it as a dict.
+        The fields are extracted walking the tile only once, see JobTileExtractor:
+            title        -> 'Python explanation with exercises how to work it out'
+            link         -> '/jobs/Extract-existing-code_~01bb2d063f7fd7f007/?referrer_url_path=find_work_home'
+            job_type     -> 'Hourly: $10-$25'
+            posted_on    -> '23 hours ago'
+            budget       -> '$ 150 '
+            skills       -> ['Data Interpretation', 'Python', 'Data Analysis']
+            rating       -> 'Rating is 0 out of 5.'
+            spendings    -> '$4K+'
+            country      -> 'Ireland'
         :param job: Object with information of a job.
         :return: Information of the job in a dictionary.
         """
-        job_as_dct = {}
-        upper_div, lower_div = job.find_all('div', recursive=False)
-
-        # if element_h2 := upper_div.find('h2'):
-        if element_h2 := upper_div.find(class_='job-tile-title'):
-            job_as_dct['title'] = element_h2.text.strip()
-
-        # '/jobs/Extract-existing-code-analyse-backgammon-position_~01bb2d063f7fd7f007/?referrer_url_path=find_work_home'
-        if element_a := upper_div.find('a'):
-            job_as_dct['link'] = element_a.get('href')
-
-        # 'Hourly: $10-$25'
-        job_as_dct['job_type'] = self.get_text_element_by_attr(lower_div,
-                                                               'data-test',
-                                                               'job-type')
-
-        # '23 hours ago'
-        job_as_dct['posted_on'] = self.get_text_element_by_attr(lower_div,
-                                                                'data-test',
-                                                                'posted-on')
-
-        # Less than 30 hrs/week
-        job_as_dct['workload'] = self.get_text_element_by_attr(lower_div,
-                                                               'data-test',
-                                                               'workload')
-
-        # '$ 150 '
-        job_as_dct['budget'] = self.get_text_element_by_attr(lower_div,
-                                                             'data-test',
-                                                             'budget')
-
-        # 'Less than 1 month'
-        job_as_dct['duration'] = self.get_text_element_by_attr(lower_div,
-                                                               'data-test',
-                                                               'duration')
-
-        # 'Intermediate'
-        job_as_dct['contractor_tier'] = self.get_text_element_by_attr(lower_div,
-                                                                      'data-test',
-                                                                      'contractor-tier')
-
-        # 'Experience Level'
-        job_as_dct['tier_label'] = self.get_text_element_by_attr(lower_div,
-                                                                 'data-test',
-                                                                 'tier-label')
-
-        # 'Python explanation with exercises how to work it out'
-        job_as_dct['description'] = self.get_text_element_by_attr(lower_div,
-                                                                  'data-test',
-                                                                  'job-description-text')
-
-        # {'Data Interpretation', 'Python', 'Data Analysis'}
-        if matches := lower_div.find_all(attrs={"data-test": "attr-item"}):
-            job_as_dct['skills'] = [match.get_text(strip=True) for match in matches]
-
-        # 'Payment unverified'
-        job_as_dct['verification_status'] = self.get_text_element_by_attr(lower_div,
-                                                                          'data-test',
-                                                                          'verification-status')
-
-        # 'Rating is 0 out of 5.'
-        if match := lower_div.find(attrs={'data-test': 'js-feedback'}):
-            if rating := match.find('span', class_='sr-only'):
-                job_as_dct['rating'] = rating.get_text(strip=True)
-
-        # '$4K+'
-        job_as_dct['spendings'] = self.get_text_element_by_attr(lower_div, 'data-test',
-                                                                'client-spendings')
-
-        # 'Ireland'
-        job_as_dct['country'] = self.get_text_element_by_attr(lower_div, 'data-test',
-                                                              'client-country')
-
-        return self.normalize_job(job_as_dct)
+        return self.normalize_job(self.job_extractor.extract(job))
 
     def normalize_job(self, job: dict) -> dict:
         """
         Create dictionary in order to present the final normalized job
-        to the rest of the project.
-        Here, is possible to cast some data, clean it, validate it, or prepare it
-        to send it to the db and/or be exported.
+        to the rest of the project, see normalize_job.
         :param job: Dictionary with the information recenlty captured.
         :return: Dictionary with all the captured information of the job.
         """
-        return {
-            'title': job.get('title', ''),
-            'link': self.get_absolute_url(job.get('link', '')),
-            'job_type': job.get('job_type', ''),
-            'posted_on': job.get('posted_on', ''),
-            'workload': job.get('workload', ''),
-            'budget': job.get('budget', ''),
-            'duration': job.get('duration', ''),
-            'contractor_tier': job.get('contractor_tier', ''),
-            'tier_label': job.get('tier_label', ''),
-            'description': job.get('description', ''),
-            'verification_status': job.get('verification_status', ''),
-            'skills': job.get('skills', {}),
-            'rating': job.get('rating', ''),
-            'spendings': job.get('spendings', ''),
-            'country': job.get('country', ''),
-        }
+        return normalize_job(job, self.URL)
 
     def get_absolute_url(self, link: str) -> str:
         """
@@ -264,10 +304,7 @@ class UpWorkScanner(BaseSelenium, Scanner):
         :return: Absolute form of URL
         Ex.: 'https://www.upwork.com/jobs/.../?referrer_url_path=find_work_home'
         """
-        if link:
-            if link.startswith('/'):
-                link = self.URL + link[1:]
-        return link
+        return absolute_url(link, self.URL)
 
     @staticmethod
     def catch_jobs(content: BeautifulSoup) -> List[Tag]:
@@ -284,29 +321,27 @@ class UpWorkScanner(BaseSelenium, Scanner):
         return jobs
 
     @staticmethod
-    def prepare_data(html_content: str, name_page: str) -> BeautifulSoup:
+    def prepare_data(html_content: str, name_page: str,
+                     parser: Optional[str] = None,
+                     archive: bool = ARCHIVE_PAGES,
+                     region: Optional[SoupStrainer] = None) -> BeautifulSoup:
         """
-        Given a html content of a page, a file is created with that information
-        :param name_page:
+        Given a html content of a page, parse it straight from memory.
+        Optionally, a copy of the page is written in background into
+        files/upwork_<name_page>.html.
+        :param name_page: Name of the page, used in the name of the archived file.
+                          Ex.: 'jobs_page'
         :param html_content: String which depicts the content of a site.
+        :param parser: Name of the parser backend, see resources.parsers.
+        :param archive: If True, the raw page is archived in a file.
+        :param region: Strainer which restricts the tree to the elements it
+                       matches (and their descendants). The rest of the page,
+                       like scripts, nav or footer, is skipped.
         :return: BeautifulSoup instance with the html data.
         """
-        folder = BASE_DIR / 'files'
-        folder.mkdir(exist_ok=True)
-        filepath = folder / f'upwork_{name_page}.html'
-        log.info(f'Creating file {filepath.name}')
-        filepath.touch()
-        filepath.write_text(html_content)
-
-        with open(filepath) as file:
-            soup = BeautifulSoup(file, 'html.parser')
-        return soup
-
-        # with TemporaryFile() as fp:
-        #     fp.write(html_content.encode())
-        #     fp.seek(0)
-        #     soup = BeautifulSoup(fp.read(), 'html.parser')
-        # return soup
+        if archive:
+            archive_page(html_content, f'upwork_{name_page}')
+        return make_soup(html_content, parser, parse_only=region)
 
     @staticmethod
     def find_profile_url(html_content: str) -> str:
@@ -317,10 +352,9 @@ class UpWorkScanner(BaseSelenium, Scanner):
                 Ex.: 'https://upwork.com/freelancers/~011cfba3bd0cf44f8d'
         """
         log.info('Discovering profile url in current state of site')
-        match = re.search(r'profileUrl:"([^"]+)"', html_content)
-        if match:
+        if url := PageSnapshot(html_content).profile_url:
             log.info('Profile URL found successfully')
-            return match.group(1).encode('utf-8').decode('unicode-escape')
+            return url
         log.info('Profile URL wasn\'t found')
         return ''
 
@@ -520,41 +554,321 @@ class UpWorkScanner(BaseSelenium, Scanner):
         }
 
     def scan_jobs(self, html_content):
-        """Scann all the jobs in the main page."""
+        """Scann all the jobs in the main page.
+        With the index of jobs, only the new or changed tiles are parsed.
+        When there are at least self.parallel_threshold jobs, they are parsed
+        in parallel, otherwise one by one."""
         log.info('Starting to scan the jobs')
-        soup = self.prepare_data(html_content, 'jobs_page')
-        jobs = self.catch_jobs(soup)
+        tiles = slice_children(html_content, 'data-test="job-tile-list"')
+        if self.job_index is not None:
+            if ARCHIVE_PAGES:
+                archive_page(html_content, 'upwork_jobs_page')
+            self.scanned_data['jobs'] = self.scan_jobs_incremental(tiles, self.job_index)
+        elif self.parse_workers > 1 and len(tiles) >= self.parallel_threshold:
+            log.info(f"Captched {len(tiles)} jobs, parsing them in parallel")
+            if ARCHIVE_PAGES:
+                archive_page(html_content, 'upwork_jobs_page')
+            self.scanned_data['jobs'] = self.parse_jobs_parallel(tiles)
+        else:
+            region = self.JOBS_REGION if SCOPED_PARSING else None
+            soup = self.prepare_data(html_content, 'jobs_page', self.parser, region=region)
+            jobs = self.catch_jobs(soup)
+
+            log.info(f"Captched {len(jobs)} jobs")
 
+            self.scanned_data['jobs'] = [JobSchema(**self.parse_job(job)) for job in jobs]
+        log.info('Scanned of jobs finished')
+
+    def scan_jobs_incremental(self, tiles: List[str], index: JobIndex) -> List[JobSchema]:
+        """
+        Parse only the tiles which are new or changed since they were seen
+        in the index, taking the rest from it. The quantity of every kind is
+        kept in self.index_report. The index is closed at the end, so its
+        connection is closed by the thread which opened it, see
+        scan_jobs_and_profile.
+        :param tiles: Html of every job, see slice_children.
+        :param index: Index of the jobs already seen.
+        :return: Jobs validated, in the same order of tiles.
+        """
+        try:
+            entries = index.lookup(tiles)
+            pending = [entry for entry in entries if entry.job is None]
+            # strict, so a tile which isn't parsed into a job never shifts the rest.
+            for entry, job in zip(pending, self.parse_tiles([entry.tile for entry in pending]), strict=True):
+                entry.job = job
+            index.store(pending)
+        finally:
+            index.close()
+
+        self.index_report = {status: sum(entry.status == status for entry in entries)
+                             for status in ('new', 'changed', 'skipped')}
+        log.info(f"Captched {len(entries)} jobs: {self.index_report['new']} new, "
+                 f"{self.index_report['changed']} changed, {self.index_report['skipped']} skipped")
+        return [entry.job for entry in entries if entry.job is not None]
+
+    def parse_tiles(self, tiles: List[str]) -> List[JobSchema]:
+        """Parse and validate the html of some jobs, in parallel when
+        there are at least self.parallel_threshold of them."""
+        if not tiles:
+            return []
+        if self.parse_workers > 1 and len(tiles) >= self.parallel_threshold:
+            return self.parse_jobs_parallel(tiles)
+        return parse_jobs_chunk(tiles, self.parser, self.URL)
+
+    def scan_jobs_in_browser(self) -> bool:
+        """
+        Scan all the jobs of the current page extracting them in the browser
+        with the script of JobTileExtractor, so neither the page source is
+        transferred nor parsed with BeautifulSoup.
+        :return: True if jobs were found, otherwise, False.
+        """
+        log.info('Starting to scan the jobs in the browser')
+        jobs = self.exect_js(self.job_extractor.script()) or []
         log.info(f"Captched {len(jobs)} jobs")
+        if not jobs or None in jobs:
+            return False
+
+        self.scanned_data['jobs'] = [JobSchema(**self.normalize_job(job)) for job in jobs]
+        log.info('Scanned of jobs finished')
+        return True
+
+    def scan_jobs_from_network(self) -> bool:
+        """
+        Scan the jobs from the json responses of the api of the feed, captured
+        in the performance log of the browser, without scrolling nor parsing html.
+        :return: True if jobs were captured, otherwise, False.
+        """
+        log.info('Starting to scan the jobs from the network')
+        try:
+            jobs = capture_jobs(self.driver, self.read_performance_log())
+            schemas = [JobSchema(**self.normalize_job(job)) for job in jobs]
+        except Exception as e:
+            log.warning(f'Jobs could not be captured from the network: {e}')
+            return False
+        log.info(f"Captured {len(schemas)} jobs")
+        if not schemas:
+            return False
 
-        self.scanned_data['jobs'] = [JobSchema(**self.parse_job(job)) for job in jobs]
+        self.scanned_data['jobs'] = schemas
         log.info('Scanned of jobs finished')
+        return True
+
+    def find_profile_url_in_browser(self) -> str:
+        """Look up the url of the profile in the current page of the browser,
+        see find_profile_url."""
+        log.info('Discovering profile url in current state of site')
+        if url := self.exect_js(PROFILE_URL_SCRIPT):
+            log.info('Profile URL found successfully')
+            return url.encode('utf-8').decode('unicode-escape')
+        log.info('Profile URL wasn\'t found')
+        return ''
+
+    def scan_profile_in_browser(self) -> None:
+        """Scan the profile whose url is in the current page of the browser,
+        used when the jobs were not taken from the page source."""
+        if profile_url := self.find_profile_url_in_browser():
+            with self.timeline.phase('profile'):
+                self.scan_profile(profile_url)
+
+    def parse_jobs_parallel(self, tiles: List[str]) -> List[JobSchema]:
+        """
+        Split the jobs in chunks of self.parse_chunk_size and parse and
+        validate them across self.parse_workers processes.
+        :param tiles: Html of every job, see slice_children.
+        :return: Jobs validated, in the same order of tiles.
+        """
+        size = self.parse_chunk_size
+        chunks = [tiles[i:i + size] for i in range(0, len(tiles), size)]
+        with ProcessPoolExecutor(max_workers=min(self.parse_workers, len(chunks))) as executor:
+            results = executor.map(parse_jobs_chunk, chunks,
+                                   repeat(self.parser), repeat(self.URL))
+            return [job for chunk in results for job in chunk]
+
+    def get_page(self, url: str, class_name: str) -> str:
+        """
+        Get the html content of a page. When HTTP_FETCH is enabled, it is
+        requested with plain HTTP reusing the session of the browser, and the
+        browser is only used if that fails or the page comes without the
+        element expected.
+        :param url: Address of the page.
+        :param class_name: Class of an element that the page must contain.
+                           Ex.: 'profile-outer-card'
+        :return: Html content of the page.
+        """
+        if HTTP_FETCH:
+            try:
+                if self.http is None:
+                    self.http = HttpFetcher.from_driver(self.driver)
+                html_content = self.http.fetch(url)
+            except Exception as e:
+                log.warning(f'Fetching {url=} without the browser failed: {e}')
+            else:
+                if class_name in html_content:
+                    return html_content
+                log.warning(f'{class_name!r} not found fetching {url=} without the browser')
+
+        self.custom_request(url, 'class name', class_name)
+        self.driver.set_window_size(1000, 1080)
+        return self.driver.page_source
 
     def scan_profile(self, profile_url):
         """Scan the profile of the user logged in the upwork account."""
         log.info('Starting to scan the profile')
-        self.custom_request(profile_url, 'class name', 'profile-outer-card')
-        self.driver.set_window_size(1000, 1080)
-        profile_soup = self.prepare_data(self.driver.page_source, 'profile_page')
+        html_content = self.get_page(profile_url, 'profile-outer-card')
+        region = self.PROFILE_REGION if SCOPED_PARSING else None
+        profile_soup = self.prepare_data(html_content, 'profile_page',
+                                         self.parser, region=region)
 
         self.scanned_data['profile'] = ProfileSchema(**self.parse_profile(profile_soup))
         log.info('Scanned of profile finished')
 
+    def scan_jobs_and_profile(self, html_content: str, profile_url: str) -> None:
+        """
+        Scan the jobs of the page and the profile. When OVERLAP_PROFILE is
+        enabled, the jobs are parsed in a background thread while the profile
+        is fetched, otherwise one after the other.
+        :param html_content: Html of the main page, already scrolled.
+        :param profile_url: Url of the profile, empty if it wasn't found.
+        """
+        def scan_jobs():
+            with self.timeline.phase('jobs'):
+                self.scan_jobs(html_content)
+
+        if not (OVERLAP_PROFILE and profile_url):
+            scan_jobs()
+            if profile_url:
+                with self.timeline.phase('profile'):
+                    self.scan_profile(profile_url)
+            return
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='jobs') as executor:
+            jobs = executor.submit(scan_jobs)
+            with self.timeline.phase('profile'):
+                self.scan_profile(profile_url)
+            jobs.result()
+
     def run(self):
         """
         Main function of the class.
-            1. Login into the account.
+            1. Login into the account, unless the saved session is still valid.
             2. Scan the jobs.
             3. Access into the profile page.
             4. Scan the profile information.
+        When the scanner has a pool, the browser is leased from it and given
+        back at the end, otherwise a new one is started and closed.
         """
-        self.load_driver()
-        if self.login():
-            self.fullscroll_to_bottom()
-
-            html_content = self.driver.page_source
-            self.scan_jobs(html_content)
-
-            if profile_url := self.find_profile_url(html_content):
-                self.scan_profile(profile_url)
-        self.driver.quit()
+        if self.pool is not None:
+            with self.pool.lease() as driver:
+                self.driver = driver
+                try:
+                    self.scan()
+                finally:
+                    # The leased browser was renewed along the run, see custom_request.
+                    if self.driver is not driver:
+                        self.driver.quit()
+        else:
+            self.load_driver()
+            try:
+                self.scan()
+            finally:
+                self.driver.quit()
+
+    def scan(self):
+        """Steps of the scanner once the browser is ready, see run."""
+        try:
+            with self.timeline.phase('login'):
+                self.logged_in = self.restore_session() or self.login()
+            if not self.logged_in:
+                return
+
+            if EXTRACTION_MODE == 'network':
+                with self.timeline.phase('jobs'):
+                    captured = self.scan_jobs_from_network()
+                if captured:
+                    self.scan_profile_in_browser()
+                    return
+
+            with self.timeline.phase('scroll'):
+                self.fullscroll_to_bottom('div[data-test="job-tile-list"]', 'section')
+
+            if EXTRACTION_MODE == 'browser':
+                with self.timeline.phase('jobs'):
+                    extracted = self.scan_jobs_in_browser()
+                if extracted:
+                    self.scan_profile_in_browser()
+                    return
+
+            snapshot = self.take_snapshot()
+            profile_url = snapshot.profile_url
+            log.info('Profile URL found successfully' if profile_url
+                     else 'Profile URL wasn\'t found')
+            self.scan_jobs_and_profile(snapshot.source, profile_url)
+        finally:
+            if self.http is not None:
+                self.http.close()
+                self.http = None
+            log.info(f'Seconds of the run: {self.waits.report()}')
+            self.read_performance_log()
+            log.info(f'Requests of the run: {self.network_stats.report()}')
+            if failed := self.retry_stats.report():
+                log.warning(f'Urls which failed along the run: {failed}')
+            log.info(f'Timeline of the run: {self.timeline.report()}')
+
+
+def absolute_url(link: str, url: str) -> str:
+    """
+    Compute the absolute url of a link.
+    :param link: Representation of an url
+            Ex.: '/jobs/.../?referrer_url_path=find_work_home'
+    :param url: Base url of the scanner. Ex.: 'https://www.upwork.com/'
+    :return: Absolute form of URL
+    Ex.: 'https://www.upwork.com/jobs/.../?referrer_url_path=find_work_home'
+    """
+    if link:
+        if link.startswith('/'):
+            link = url + link[1:]
+    return link
+
+
+def normalize_job(job: dict, url: str) -> dict:
+    """
+    Create dictionary in order to present the final normalized job
+    to the rest of the project.
+    Here, is possible to cast some data, clean it, validate it, or prepare it
+    to send it to the db and/or be exported.
+    :param job: Dictionary with the information recenlty captured.
+    :param url: Base url of the scanner, used to compute the absolute links.
+    :return: Dictionary with all the captured information of the job.
+    """
+    return {
+        'title': job.get('title', ''),
+        'link': absolute_url(job.get('link', ''), url),
+        'job_type': job.get('job_type', ''),
+        'posted_on': job.get('posted_on', ''),
+        'workload': job.get('workload', ''),
+        'budget': job.get('budget', ''),
+        'duration': job.get('duration', ''),
+        'contractor_tier': job.get('contractor_tier', ''),
+        'tier_label': job.get('tier_label', ''),
+        'description': job.get('description', ''),
+        'verification_status': job.get('verification_status', ''),
+        'skills': job.get('skills', []),
+        'rating': job.get('rating', ''),
+        'spendings': job.get('spendings', ''),
+        'country': job.get('country', ''),
+    }
+
+
+def parse_jobs_chunk(tiles: List[str], parser: Optional[str], url: str) -> List[JobSchema]:
+    """
+    Parse and validate a chunk of jobs, without a scanner, so it is cheap
+    to execute in the worker processes of UpWorkScanner.parse_jobs_parallel.
+    :param tiles: Html of the jobs of the chunk.
+    :param parser: Name of the parser backend, see resources.parsers.
+    :param url: Base url of the scanner, used to compute the absolute links.
+    :return: Jobs validated, in the same order of tiles.
+    """
+    soup = make_soup(f'<div data-test="job-tile-list">{"".join(tiles)}</div>', parser)
+    extractor = UpWorkScanner.job_extractor
+    return [JobSchema(**normalize_job(extractor.extract(job), url))
+            for job in UpWorkScanner.catch_jobs(soup)]
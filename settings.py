@@ -5,6 +5,88 @@ from loguru import logger
 
 BASE_DIR = Path(__file__).resolve().parent
 
+# Base url of the site scanned, ex.: the one of benchmarks.stand_in to scan offline.
+UPWORK_URL = os.getenv('UPWORK_URL', 'https://www.upwork.com/')
+
+# Backend used to parse the html pages: 'html.parser', 'lxml' or 'html5lib'.
+HTML_PARSER = os.getenv('UPWORK_HTML_PARSER', 'html.parser')
+
+# If '1', the raw html of the scanned pages is kept into the folder ARCHIVE_DIR.
+ARCHIVE_PAGES = os.getenv('UPWORK_ARCHIVE_PAGES', '0') == '1'
+ARCHIVE_DIR = Path(os.getenv('UPWORK_ARCHIVE_DIR', BASE_DIR / 'files'))
+
+# Folder of the state kept between runs, like the saved sessions, apart from the archived pages.
+DATA_DIR = Path(os.getenv('UPWORK_DATA_DIR', BASE_DIR / 'data'))
+
+# If '1', only the job-tile-list and the profile box are built into the tree.
+SCOPED_PARSING = os.getenv('UPWORK_SCOPED_PARSING', '1') == '1'
+
+# Parallel parsing of the jobs: processes, jobs per chunk and the minimum
+# quantity of jobs to use it. Below PARALLEL_THRESHOLD jobs are parsed serially.
+PARSE_WORKERS = int(os.getenv('UPWORK_PARSE_WORKERS', os.cpu_count() or 1))
+PARSE_CHUNK_SIZE = int(os.getenv('UPWORK_PARSE_CHUNK_SIZE', 50))
+PARALLEL_THRESHOLD = int(os.getenv('UPWORK_PARALLEL_THRESHOLD', 200))
+
+# If '1', the jobs seen are kept into DATA_DIR/jobs_index.sqlite3 and the tiles
+# which didn't change since the last scan are not parsed again.
+JOB_INDEX = os.getenv('UPWORK_JOB_INDEX', '1') == '1'
+
+# Where the jobs are extracted: 'dom' (page source parsed with BeautifulSoup),
+# 'browser' (script executed in the page) or 'network' (json responses of the
+# api of the feed). The last two fall back to 'dom'.
+EXTRACTION_MODE = os.getenv('UPWORK_EXTRACTION_MODE', 'dom')
+
+# If '1', the session of the browser is saved after the login and restored
+# on next runs while it is younger than SESSION_MAX_AGE seconds.
+SESSION_CACHE = os.getenv('UPWORK_SESSION_CACHE', '1') == '1'
+SESSION_MAX_AGE = int(os.getenv('UPWORK_SESSION_MAX_AGE', 12 * 60 * 60))
+
+# If '1', the pages after the login are requested with httpx reusing the
+# cookies of the browser, which is only used as fallback.
+HTTP_FETCH = os.getenv('UPWORK_HTTP_FETCH', '1') == '1'
+
+# If '1', the profile is scanned while the jobs are parsed in a background thread.
+OVERLAP_PROFILE = os.getenv('UPWORK_OVERLAP_PROFILE', '1') == '1'
+
+# Pool of browsers kept started by "scan.py serve": size, and uses or
+# megabytes of javascript heap after which a browser is replaced.
+DRIVER_POOL_SIZE = int(os.getenv('UPWORK_DRIVER_POOL_SIZE', 2))
+DRIVER_MAX_USES = int(os.getenv('UPWORK_DRIVER_MAX_USES', 20))
+DRIVER_MAX_MEMORY_MB = int(os.getenv('UPWORK_DRIVER_MAX_MEMORY_MB', 512))
+
+# If '1', the chromedriver is only taken from the local cache, never from the network.
+DRIVER_OFFLINE = os.getenv('UPWORK_DRIVER_OFFLINE', '0') == '1'
+
+# Policy of waits of the browser: 'human' (readiness signals plus human-like
+# pauses) or 'fast' (only readiness signals), see resources.waits.
+WAIT_PROFILE = os.getenv('UPWORK_WAIT_PROFILE', 'human')
+# Maximum seconds of human-like pauses per run, by default the one of the profile.
+JITTER_BUDGET = float(os.environ['UPWORK_JITTER_BUDGET']) if 'UPWORK_JITTER_BUDGET' in os.environ else None
+
+# Requests blocked in the browser, see resources.blocking: types of resources
+# (image, font, media, stylesheet), extra url patterns and exceptions, separated by comma.
+BLOCK_RESOURCES = tuple(filter(None, os.getenv('UPWORK_BLOCK_RESOURCES', 'image,font,media').split(',')))
+BLOCK_URLS = tuple(filter(None, os.getenv('UPWORK_BLOCK_URLS', '').split(',')))
+ALLOW_URLS = tuple(filter(None, os.getenv('UPWORK_ALLOW_URLS', '').split(',')))
+
+# Scroll of the feed: it stops when no new jobs are loaded along SCROLL_SETTLE
+# seconds, SCROLL_TARGET jobs were loaded (0 for no limit) or after SCROLL_BUDGET seconds.
+SCROLL_TARGET = int(os.getenv('UPWORK_SCROLL_TARGET', 0))
+SCROLL_BUDGET = float(os.getenv('UPWORK_SCROLL_BUDGET', 90))
+SCROLL_SETTLE = float(os.getenv('UPWORK_SCROLL_SETTLE', 5))
+
+# Retries loading a page: attempts, total seconds along all of them, seconds
+# waiting for the page on every attempt and the exponential pause between them.
+REQUEST_ATTEMPTS = int(os.getenv('UPWORK_REQUEST_ATTEMPTS', 4))
+REQUEST_DEADLINE = float(os.getenv('UPWORK_REQUEST_DEADLINE', 90))
+REQUEST_PAGE_TIMEOUT = float(os.getenv('UPWORK_REQUEST_PAGE_TIMEOUT', 30))
+REQUEST_BACKOFF = float(os.getenv('UPWORK_REQUEST_BACKOFF', 1))
+REQUEST_MAX_BACKOFF = float(os.getenv('UPWORK_REQUEST_MAX_BACKOFF', 15))
+
+# Batch mode: processes scanning accounts and browsers running at the same time.
+BATCH_WORKERS = int(os.getenv('UPWORK_BATCH_WORKERS', os.cpu_count() or 1))
+BATCH_BROWSERS = int(os.getenv('UPWORK_BATCH_BROWSERS', 2))
+
 
 def get_logger():
     log_dir = BASE_DIR / "logs" / "upwork.log"
@@ -1,7 +1,8 @@
 import pytest
-from bs4 import BeautifulSoup
-
 from resources.base import UpWorkProfile
+from resources.job_index import JobIndex
+from resources.models import JobSchema, ProfileSchema
+from resources.parsers import make_soup
 from scanners.upwork import UpWorkScanner
 from settings import BASE_DIR
 
@@ -18,8 +19,18 @@ def fake_profile():
 
 
 @pytest.fixture()
-def upwork_scanner(fake_profile):
-    return UpWorkScanner(fake_profile)
+def upwork_scanner(fake_profile, tmp_path):
+    scanner = UpWorkScanner(fake_profile)
+    scanner.job_index = JobIndex(tmp_path / 'jobs_index.sqlite3')
+    return scanner
+
+
+@pytest.fixture()
+def archive_dir(tmp_path, monkeypatch):
+    """Folder of the archived pages, which doesn't exist until a page is archived."""
+    folder = tmp_path / 'files'
+    monkeypatch.setattr('utils.file_utils.ARCHIVE_DIR', folder)
+    return folder
 
 
 @pytest.fixture()
@@ -52,7 +63,7 @@ def job_history_inactive_profile():
 def jobs_page():
     filepath = BASE_DIR / 'tests' / 'files' / 'upwork_jobs_page_for_testing.html'
     with open(filepath) as file:
-        soup = BeautifulSoup(file, 'html.parser')
+        soup = make_soup(file)
     return soup
 
 
@@ -65,10 +76,20 @@ def jobs(upwork_scanner, jobs_page):
 def profile_page():
     filepath = BASE_DIR / 'tests' / 'files' / 'upwork_profile_page_for_testing.html'
     with open(filepath) as file:
-        soup = BeautifulSoup(file, 'html.parser')
+        soup = make_soup(file)
     return soup
 
 
 @pytest.fixture()
 def profile_content(upwork_scanner, profile_page):
     return upwork_scanner.parse_profile(profile_page)
+
+
+@pytest.fixture()
+def jobs_schema(upwork_scanner, jobs):
+    return [JobSchema(**upwork_scanner.parse_job(job)) for job in jobs]
+
+
+@pytest.fixture()
+def profile_schema(profile_content):
+    return ProfileSchema(**profile_content)
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from resources.models import AccountScanSchema
+from scanners.batch import load_accounts, run_batch, scan_account
+
+ACCOUNTS = [{'username': f'user{i}@example.com', 'password': 'secret'} for i in range(4)]
+
+
+def fake_scan(account, url=None):
+    """Scanner which fails for the second account, executed in the workers."""
+    if account['username'] == 'user1@example.com':
+        raise RuntimeError('Login failed')
+    return AccountScanSchema(username=account['username'], succeeded=True, seconds=0.01,
+                             error=str(os.getpid()))
+
+
+class FakeScanner:
+    """Scanner which logs in and scans the jobs of the feed, but not the profile."""
+
+    def __init__(self, account, url=None):
+        self.logged_in = account['password'] == 'secret'
+        self.scanned_data = {}
+
+    def run(self):
+        if self.logged_in:
+            self.scanned_data['jobs'] = []
+
+
+class TestBatch:
+    def test_load_accounts(self, tmp_path):
+        """Test the accounts are read from a json file and validated"""
+        path = tmp_path / 'accounts.json'
+        path.write_text(json.dumps(ACCOUNTS))
+        assert load_accounts(path) == ACCOUNTS
+
+        path.write_text(json.dumps([{'username': 'user'}]))
+        with pytest.raises(ValueError):
+            load_accounts(path)
+
+    def test_results_are_aggregated_in_order(self):
+        """Test every account has its result, the failures included, scanned in other processes"""
+        result = run_batch(ACCOUNTS, workers=2, browsers=1, scan=fake_scan)
+        assert [account.username for account in result.accounts] == [a['username'] for a in ACCOUNTS]
+        assert (result.succeeded, result.failed) == (3, 1)
+        assert result.accounts[1].error == 'RuntimeError: Login failed'
+        assert str(os.getpid()) not in {account.error for account in result.accounts}
+        assert result.accounts_per_minute > 0
+
+    def test_failures_of_an_account_are_explicit(self, monkeypatch, jobs_schema):
+        """Test a failed login or a missing profile are reported, keeping the jobs scanned"""
+        monkeypatch.setattr('scanners.batch.UpWorkScanner', FakeScanner)
+        result = scan_account({'username': 'user@example.com', 'password': 'wrong'})
+        assert not result.succeeded and result.error.startswith('LoginFailed')
+
+        monkeypatch.setattr(FakeScanner, 'run', lambda scanner: scanner.scanned_data.update(jobs=jobs_schema))
+        result = scan_account({'username': 'user@example.com', 'password': 'secret'})
+        assert not result.succeeded and result.error == 'The profile was not scanned'
+        assert result.jobs == jobs_schema
+
+    def test_without_accounts(self):
+        result = run_batch([], scan=fake_scan)
+        assert result.accounts == [] and result.accounts_per_minute == 0
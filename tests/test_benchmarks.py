@@ -0,0 +1,34 @@
+from benchmarks.runner import report, run_benchmarks, stand_in_scanner
+from benchmarks.synthetic import make_jobs_page, make_profile_page
+from resources.models import JobSchema, ProfileSchema
+from resources.parsers import make_soup
+
+
+class TestSyntheticPages:
+    def test_jobs_page_has_the_quantity_of_jobs(self, upwork_scanner):
+        """Test the synthetic feed is parsed into valid jobs"""
+        jobs = upwork_scanner.catch_jobs(make_soup(make_jobs_page(25)))
+        schemas = [JobSchema(**upwork_scanner.parse_job(job)) for job in jobs]
+        assert len(schemas) == 25
+        assert all(schema.skills and schema.country for schema in schemas)
+
+    def test_profile_page_is_parsed(self, upwork_scanner):
+        """Test the synthetic profile is parsed into a valid profile"""
+        profile = ProfileSchema(**upwork_scanner.parse_profile(make_soup(make_profile_page())))
+        assert profile.full_name == 'Rachel W.'
+        assert profile.employment_status == 'active'
+
+    def test_benchmark_measures_every_stage(self):
+        """Test the benchmark gets a measure of every stage of the pipeline"""
+        measures = run_benchmarks(sizes=[5], repeat=1)
+        stages = {m.stage for m in measures}
+        assert stages == {'parse_profile', 'prepare_data', 'catch_jobs', 'parse_job',
+                          'normalize_job', 'job_schema', 'export_json', 'export_ndjson'}
+        assert 'vs baseline' in report(measures)
+
+
+def test_stand_in_scanner_keeps_nothing_out_of_its_folder(tmp_path):
+    """Test the runs against the stand-in don't use the index nor the sessions of the real site"""
+    scanner = stand_in_scanner('http://127.0.0.1:8000', None, tmp_path)
+    assert scanner.job_index is None
+    assert scanner.session.path.parent == tmp_path / 'sessions'
@@ -0,0 +1,65 @@
+import json
+
+from resources.blocking import RESOURCE_PATTERNS, BlockingPolicy, BlockingStats
+
+
+def event(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+
+class TestBlockingPolicy:
+    def test_patterns_by_type_and_url(self):
+        """Test the types of resources and urls are turned into patterns"""
+        policy = BlockingPolicy(('font',), ('*doubleclick.net*',))
+        assert policy.patterns() == ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*doubleclick.net*']
+
+    def test_allow_removes_types_and_patterns(self):
+        """Test the types and the patterns allowed are not blocked"""
+        policy = BlockingPolicy(('image', 'font'), ('*hotjar.com*',), allow=('image', '*.woff*', '*hotjar*'))
+        assert policy.patterns() == ['*.ttf', '*.otf', '*.eot']
+        assert policy.ignored_allows() == []
+
+    def test_url_patterns_cant_be_allowed(self):
+        """Test an allowed pattern of urls, which can't unblock the types blocked, is warned about"""
+        policy = BlockingPolicy(('image',), allow=('*upwork.com/static/*',))
+        assert policy.patterns() == list(RESOURCE_PATTERNS['image'])
+        assert policy.ignored_allows() == ['*upwork.com/static/*']
+
+    def test_apply_through_devtools(self):
+        """Test the patterns are sent to the browser"""
+        driver = FakeDriver()
+        BlockingPolicy(('media',)).apply(driver)
+        assert driver.commands[0] == ('Network.enable', {})
+        assert driver.commands[1][0] == 'Network.setBlockedURLs'
+
+    def test_nothing_to_block(self):
+        """Test DevTools is not used without patterns"""
+        driver = FakeDriver()
+        BlockingPolicy().apply(driver)
+        assert driver.commands == []
+
+
+class TestBlockingStats:
+    def test_requests_and_bytes_saved(self):
+        """Test blocked requests are estimated with the average size of their type"""
+        stats = BlockingStats()
+        stats.consume([
+            event('Network.requestWillBeSent', requestId='1', type='Image'),
+            event('Network.loadingFinished', requestId='1', encodedDataLength=3000),
+            event('Network.requestWillBeSent', requestId='2', type='Image'),
+            event('Network.loadingFailed', requestId='2', blockedReason='inspector'),
+            event('Network.requestWillBeSent', requestId='3', type='Document'),
+            event('Network.loadingFinished', requestId='3', encodedDataLength=1000),
+            event('Network.requestWillBeSent', requestId='4', type='Font'),
+            event('Network.loadingFailed', requestId='4', blockedReason='inspector'),
+        ])
+        assert stats.report() == {'requests_loaded': 2, 'bytes_loaded': 4000,
+                                  'requests_saved': 2, 'bytes_saved_estimated': 5000}
@@ -0,0 +1,50 @@
+import pytest
+
+from resources.driver_cache import chrome_version
+from resources.models import JobSchema
+from settings import BASE_DIR
+
+JOBS_PAGE = BASE_DIR / 'tests' / 'files' / 'upwork_jobs_page_for_testing.html'
+
+
+class ScriptDriver:
+    """Driver which answers the extraction script with what the browser would return."""
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.scripts = []
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        return self.jobs
+
+
+class TestBrowserExtraction:
+    def test_jobs_from_script_are_validated_like_dom(self, upwork_scanner, jobs):
+        """Test the jobs returned by the script end in the same schemas as the dom parser"""
+        upwork_scanner.driver = ScriptDriver([upwork_scanner.job_extractor.extract(job) for job in jobs])
+        assert upwork_scanner.scan_jobs_in_browser()
+        assert upwork_scanner.scanned_data['jobs'] == [JobSchema(**upwork_scanner.parse_job(job))
+                                                       for job in jobs]
+        assert 'job-tile-list' in upwork_scanner.driver.scripts[0]
+
+    def test_without_jobs_falls_back(self, upwork_scanner):
+        """Test an empty or unexpected result lets the dom parser do the work"""
+        upwork_scanner.driver = ScriptDriver([])
+        assert not upwork_scanner.scan_jobs_in_browser()
+        upwork_scanner.driver = ScriptDriver([None])
+        assert not upwork_scanner.scan_jobs_in_browser()
+        assert 'jobs' not in upwork_scanner.scanned_data
+
+
+@pytest.mark.skipif(not chrome_version(), reason='Chrome is not installed')
+def test_script_matches_dom_parser_in_chrome(upwork_scanner, jobs):
+    """Test the script executed in Chrome gets the same jobs as the dom parser"""
+    upwork_scanner.load_driver()
+    try:
+        upwork_scanner.driver.get(JOBS_PAGE.as_uri())
+        extracted = upwork_scanner.exect_js(upwork_scanner.job_extractor.script())
+    finally:
+        upwork_scanner.driver.quit()
+    assert [upwork_scanner.normalize_job(job) for job in extracted] == \
+           [upwork_scanner.parse_job(job) for job in jobs]
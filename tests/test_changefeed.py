@@ -0,0 +1,45 @@
+import json
+
+from resources.models import JobSchema
+from utils.changefeed import Changefeed
+
+
+class TestChangefeed:
+    def test_first_scan_adds_everything(self, tmp_path, jobs_schema, profile_schema):
+        """Test the first delta has every job and field of the profile"""
+        path = Changefeed(tmp_path).emit(jobs_schema, profile_schema)
+        delta = json.loads(path.read_text())
+        assert delta['sequence'] == 1 and delta['previous_sequence'] == 0
+        assert len(delta['added']) == len(jobs_schema)
+        assert delta['profile']['full_name'] == {'old': None, 'new': profile_schema.full_name}
+        assert 'id' not in delta['profile']
+
+    def test_only_changes_are_emitted(self, tmp_path, jobs_schema, profile_schema):
+        """Test the next deltas carry the added, changed and removed jobs and the profile changes"""
+        changefeed = Changefeed(tmp_path)
+        changefeed.emit(jobs_schema, profile_schema)
+
+        # The relative date and the new id of the profile don't count as changes.
+        same = [job.model_copy(update={'posted_on': 'a week ago'}) for job in jobs_schema]
+        assert changefeed.emit(same, profile_schema.model_copy(update={'id': None})) is None
+
+        first, second = jobs_schema[:2]
+        changed = first.model_copy(update={'budget': '$999'})
+        added = JobSchema(**{**second.model_dump(), 'link': 'https://www.upwork.com/jobs/New_~01ffffffffffffffff/'})
+        path = changefeed.emit([changed, added], profile_schema.model_copy(update={'job_title': 'CTO'}))
+
+        delta = json.loads(path.read_text())
+        assert delta['sequence'] == 2
+        assert [job['budget'] for job in delta['changed']] == ['$999']
+        assert [job['link'] for job in delta['added']] == [str(added.link)]
+        assert [job['link'] for job in delta['removed']] == [str(second.link)]
+        assert delta['profile'] == {'job_title': {'old': profile_schema.job_title, 'new': 'CTO'}}
+        assert [d['sequence'] for d in changefeed.deltas(after=1)] == [2]
+
+    def test_empty_scan_is_skipped(self, tmp_path, jobs_schema):
+        """Test a scan without jobs doesn't mark the jobs seen before as removed"""
+        changefeed = Changefeed(tmp_path)
+        changefeed.emit(jobs_schema)
+        assert changefeed.emit([]) is None
+        assert changefeed.read_state()['sequence'] == 1
+        assert len(changefeed.read_state()['jobs']) == len(jobs_schema)
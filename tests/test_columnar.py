@@ -0,0 +1,55 @@
+import pytest
+
+from benchmarks.runner import compare_exports
+from utils import columnar
+from utils.columnar import columnar_format, export_columnar, parse_amount, parse_rating, read_columnar
+
+
+@pytest.mark.parametrize('text, amount', [('$ 150 ', 150.0), ('$4K+', 4000.0), ('$1.5M', 1_500_000.0),
+                                          ('$1,250.50', 1250.5), ('', None), ('Budget', None)])
+def test_parse_amount(text, amount):
+    assert parse_amount(text) == amount
+
+
+def test_parse_rating():
+    assert parse_rating('Rating is 4.9 out of 5.') == 4.9
+    assert parse_rating('') is None
+
+
+class TestExportColumnar:
+    def test_csv_is_typed_and_appended(self, tmp_path, jobs_schema):
+        """Test the runs are appended to the csv and read back with their types"""
+        filename = str(tmp_path / 'jobs')
+        export_columnar(jobs_schema, filename, 'csv')
+        path = export_columnar(jobs_schema, filename, 'csv')
+
+        rows = read_columnar(path)
+        assert len(rows) == 2 * len(jobs_schema)
+        first, job = rows[0], jobs_schema[0]
+        assert first['title'] == job.title and first['skills'] == job.skills
+        assert first['budget'] == parse_amount(job.budget)
+        assert isinstance(first['rating'], float) and first['scanned_at'].tzinfo is not None
+
+    def test_parquet(self, tmp_path, jobs_schema):
+        pytest.importorskip('pyarrow')
+        filename = str(tmp_path / 'jobs')
+        export_columnar(jobs_schema, filename, 'parquet')
+        export_columnar(jobs_schema, filename, 'parquet')
+        rows = read_columnar(tmp_path / 'jobs.parquet')
+        assert len(rows) == 2 * len(jobs_schema)
+        assert rows[0]['skills'] == jobs_schema[0].skills
+
+    def test_parquet_without_pyarrow(self, tmp_path, jobs_schema, monkeypatch):
+        """Test the csv is written instead of losing the scan"""
+        monkeypatch.setattr(columnar, 'pyarrow', None)
+        assert columnar_format('parquet') == 'csv' and columnar_format('csv') == 'csv'
+        assert export_columnar(jobs_schema, str(tmp_path / 'jobs'), 'parquet').suffix == '.csv'
+        assert export_columnar(jobs_schema, str(tmp_path / 'jobs')).suffix == '.csv'
+        assert len(read_columnar(tmp_path / 'jobs.csv')) == 2 * len(jobs_schema)
+
+
+def test_compare_exports():
+    """Test the formats are compared by write time, size and read time"""
+    table = compare_exports(size=5, repeat=1)
+    assert table.splitlines()[0].split() == ['format', 'write', 's', 'size', 'KiB', 'read', 's']
+    assert {line.split()[0] for line in table.splitlines()[1:]} >= {'json', 'ndjson', 'csv'}
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from resources.driver_cache import DriverCache
+from resources.exceptions import DriverNotFound
+
+
+@pytest.fixture()
+def driver_file(tmp_path):
+    path = tmp_path / 'chromedriver'
+    path.write_text('')
+    return str(path)
+
+
+def make_cache(tmp_path, installer, version='119.0.6045.159', offline=False):
+    return DriverCache(tmp_path / 'drivers.json', offline=offline,
+                       installer=installer, version=lambda: version)
+
+
+class TestDriverCache:
+    def test_installer_only_used_once(self, tmp_path, driver_file):
+        """Test the driver is taken from the cache after the first time"""
+        calls = []
+        cache = make_cache(tmp_path, lambda: calls.append(1) or driver_file)
+        assert cache.resolve() == driver_file
+        assert cache.resolve() == driver_file
+        assert len(calls) == 1
+
+    def test_offline_without_cache(self, tmp_path):
+        """Test the offline mode fails instead of using the network"""
+        cache = make_cache(tmp_path, lambda: pytest.fail('installer used offline'), offline=True)
+        with pytest.raises(DriverNotFound):
+            cache.resolve()
+
+    def test_offline_uses_driver_of_same_major_version(self, tmp_path, driver_file):
+        """Test a patch update of Chrome doesn't require the network in offline mode"""
+        make_cache(tmp_path, lambda: driver_file).resolve()
+        cache = make_cache(tmp_path, lambda: pytest.fail('installer used offline'),
+                           version='119.0.6045.200', offline=True)
+        assert cache.resolve() == driver_file
+
+    def test_concurrent_resolution_installs_once(self, tmp_path, driver_file):
+        """Test several scanners resolving at the same time share the installation"""
+        calls = []
+        results = []
+
+        def installer():
+            calls.append(1)
+            return driver_file
+
+        def resolve():
+            results.append(make_cache(tmp_path, installer).resolve())
+
+        threads = [threading.Thread(target=resolve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [driver_file] * 8
+        assert len(calls) == 1
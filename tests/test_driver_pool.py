@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from resources.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.heap = 0
+        self.cookies_deleted = 0
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise ConnectionError('browser closed')
+        return 'about:blank'
+
+    def execute_script(self, script):
+        return self.heap
+
+    def delete_all_cookies(self):
+        self.cookies_deleted += 1
+
+    def get(self, url):
+        ...
+
+    def quit(self):
+        self.alive = False
+
+
+@pytest.fixture()
+def pool():
+    pool = DriverPool(size=2, max_uses=3, max_memory_mb=100, factory=FakeDriver)
+    yield pool
+    pool.close()
+
+
+class TestDriverPool:
+    def test_browser_is_reused_and_cleaned(self, pool):
+        """Test the same browser is leased again after being given back clean"""
+        with pool.lease() as first:
+            ...
+        with pool.lease() as second:
+            ...
+        assert first is second
+        assert second.cookies_deleted == 2
+
+    def test_browser_recycled_after_max_uses(self, pool):
+        """Test a browser is replaced once it reaches the maximum of uses"""
+        leased = []
+        for _ in range(4):
+            with pool.lease() as driver:
+                leased.append(driver)
+        assert leased[0] is leased[2]
+        assert not leased[0].alive
+        assert leased[3] is not leased[0]
+
+    def test_browser_recycled_by_memory(self, pool):
+        """Test a browser using too much memory is replaced"""
+        with pool.lease() as driver:
+            driver.heap = 200 * 2 ** 20
+        assert not driver.alive
+        with pool.lease() as new_driver:
+            assert new_driver.alive
+
+    def test_dead_browser_is_discarded(self, pool):
+        """Test a browser which stopped responding isn't leased"""
+        pool.warm()
+        with pool.lease() as driver:
+            ...
+        driver.alive = False
+        with pool.lease() as new_driver:
+            assert new_driver is not driver and new_driver.alive
+
+    def test_lease_blocks_when_all_browsers_are_leased(self, pool):
+        """Test there are never more browsers leased than the size of the pool"""
+        with pool.lease(), pool.lease():
+            with pytest.raises(TimeoutError):
+                pool.acquire(timeout=0.05)
+
+        barrier = threading.Barrier(2)
+        results = []
+
+        def scan():
+            with pool.lease() as driver:
+                barrier.wait()
+                results.append(driver)
+
+        threads = [threading.Thread(target=scan) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(driver) for driver in results}) == 2
+        assert pool.created == 2
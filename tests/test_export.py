@@ -0,0 +1,49 @@
+import gzip
+import json
+
+import pytest
+
+from resources.models import JobSchema
+from utils.file_utils import export_ndjson
+
+
+def repeated(jobs, times):
+    for _ in range(times):
+        yield from jobs
+
+
+class TestExportNdjson:
+    @pytest.mark.parametrize('compression, opener', [('', open), ('gzip', gzip.open)])
+    def test_round_trip(self, tmp_path, jobs_schema, compression, opener):
+        """Test every job of a generator is written in its own line"""
+        path = export_ndjson(repeated(jobs_schema, 50), str(tmp_path / 'jobs'), compression)
+        with opener(path, 'rt', encoding='utf-8') as file:
+            lines = file.read().splitlines()
+        assert len(lines) == 50 * len(jobs_schema)
+        assert JobSchema(**json.loads(lines[-1])) == jobs_schema[-1]
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_zstd(self, tmp_path, jobs_schema):
+        zstandard = pytest.importorskip('zstandard')
+        path = export_ndjson(jobs_schema, str(tmp_path / 'jobs'), 'zstd')
+        assert path.name == 'jobs.ndjson.zst'
+        with zstandard.open(path, 'rt', encoding='utf-8') as file:
+            assert len(file.read().splitlines()) == len(jobs_schema)
+
+    def test_failure_keeps_previous_file(self, tmp_path, jobs_schema):
+        """Test a failure in the middle doesn't leave a partial file"""
+        path = export_ndjson(jobs_schema, str(tmp_path / 'jobs'))
+        previous = path.read_text()
+
+        def failing():
+            yield jobs_schema[0]
+            raise RuntimeError('Scanner failed')
+
+        with pytest.raises(RuntimeError):
+            export_ndjson(failing(), str(tmp_path / 'jobs'))
+        assert path.read_text() == previous
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_unknown_compression(self, tmp_path, jobs_schema):
+        with pytest.raises(ValueError):
+            export_ndjson(jobs_schema, str(tmp_path / 'jobs'), 'bz2')
@@ -0,0 +1,133 @@
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+
+from resources.feed_capture import capture_jobs, feed_request_ids
+from resources.job_index import job_id_of
+from resources.models import JobSchema
+from resources.snapshot import PageSnapshot
+from utils.date_utils import datetime_now
+
+
+def event(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+FEED = {'data': {'feed': {'results': [
+    {
+        'title': ' Scraper in Python ', 'ciphertext': '~01bb2d063f7fd7f007', 'type': 'HOURLY',
+        'hourlyBudget': {'min': 10, 'max': 25},
+        'publishedOn': (datetime_now() - timedelta(hours=2, minutes=5)).isoformat().replace('+00:00', 'Z'),
+        'engagement': 'Less than 30 hrs/week', 'durationLabel': '1 to 3 months',
+        'tierText': 'Intermediate', 'description': 'Scrape a site',
+        'attrs': [{'prettyName': 'Python'}, {'prettyName': 'Selenium'}],
+        'client': {'paymentVerificationStatus': 'VERIFIED', 'totalFeedback': 4.9,
+                   'totalSpent': {'amount': 1500}, 'location': {'country': 'Spain'}},
+    },
+    {'title': 'Logo', 'ciphertext': '~02def0123456789abc', 'type': 'FIXED', 'amount': {'amount': 50}},
+]}}}
+
+# The first job tile of tests/files/upwork_jobs_page_for_testing.html, as the api gives it.
+TILE_JOB = {
+    'title': 'Exe to Python code script', 'ciphertext': '~010cdfc064d575643d', 'type': 'FIXED',
+    'amount': {'amount': 20}, 'publishedOn': (datetime_now() - timedelta(minutes=59, seconds=30)).isoformat(),
+    'tierText': 'Intermediate', 'attrs': [{'prettyName': 'Python'}, {'prettyName': 'Automation'},
+                                          {'prettyName': 'Scripting'}],
+    'client': {'totalFeedback': 4.983, 'totalSpent': {'amount': 7340}, 'location': {'country': 'Sweden'}},
+}
+
+
+class FakeDriver:
+    def __init__(self, bodies):
+        self.bodies = bodies
+
+    def execute_cdp_cmd(self, command, params):
+        return self.bodies[params['requestId']]
+
+
+def entries():
+    return [
+        event('Network.responseReceived', requestId='1',
+              response={'url': 'https://www.upwork.com/api/graphql/v1', 'mimeType': 'application/json'}),
+        event('Network.responseReceived', requestId='2',
+              response={'url': 'https://www.upwork.com/static/app.js', 'mimeType': 'text/javascript'}),
+        event('Network.responseReceived', requestId='3',
+              response={'url': 'https://www.upwork.com/api/graphql/v1', 'mimeType': 'application/json'}),
+        event('Network.loadingFinished', requestId='1'),
+    ]
+
+
+class TestFeedCapture:
+    def test_feed_requests(self):
+        """Test only the json responses of the api of the feed are picked"""
+        assert feed_request_ids(entries()) == ['1', '3']
+
+    def test_capture_jobs(self, upwork_scanner):
+        """Test the jobs of the api are mapped like the ones of the job tiles"""
+        encoded = base64.b64encode(json.dumps(FEED).encode()).decode()
+        driver = FakeDriver({'1': {'body': json.dumps(FEED)}, '3': {'body': encoded, 'base64Encoded': True}})
+        jobs = capture_jobs(driver, entries())
+        assert len(jobs) == 2
+
+        job = JobSchema(**upwork_scanner.normalize_job(jobs[0]))
+        assert job.title == 'Scraper in Python'
+        assert str(job.link) == 'https://www.upwork.com/jobs/~01bb2d063f7fd7f007'
+        assert job.job_type == 'Hourly: $10-$25'
+        assert job.posted_on == '2 hours ago'
+        assert job.verification_status == 'Payment verified'
+        assert job.skills == ['Python', 'Selenium']
+        assert job.rating == 'Rating is 4.9 out of 5.'
+        assert job.spendings == '$1K+spent'
+        assert job.country == 'Spain'
+        assert jobs[1]['job_type'] == 'Fixed-price' and jobs[1]['budget'] == '$50'
+
+    def test_unavailable_body(self):
+        """Test a body already discarded by the browser is skipped"""
+        assert capture_jobs(FakeDriver({}), entries()) == []
+
+    def test_same_values_as_the_job_tiles(self, upwork_scanner, jobs):
+        """Test a job of the api gives the same values as its job tile"""
+        driver = FakeDriver({'1': {'body': json.dumps({'results': [TILE_JOB]})}})
+        captured = JobSchema(**upwork_scanner.normalize_job(capture_jobs(driver, entries())[0]))
+        parsed = JobSchema(**upwork_scanner.parse_job(jobs[0]))
+        fields = {'title', 'job_type', 'posted_on', 'budget', 'contractor_tier', 'skills', 'rating',
+                  'spendings', 'country'}
+        assert captured.model_dump(include=fields) == parsed.model_dump(include=fields)
+        assert job_id_of(str(captured.link)) == job_id_of(str(parsed.link))
+
+
+class NetworkDriver(FakeDriver):
+    """Browser whose performance log has the responses of the feed."""
+
+    def get_log(self, kind):
+        return entries()
+
+
+class TestScanFromNetwork:
+    @pytest.fixture()
+    def scanner(self, upwork_scanner, monkeypatch):
+        monkeypatch.setattr('scanners.upwork.EXTRACTION_MODE', 'network')
+        upwork_scanner.restore_session = lambda: True
+        upwork_scanner.scanned = []
+        upwork_scanner.scan_profile_in_browser = lambda: upwork_scanner.scanned.append('browser')
+        upwork_scanner.scan_jobs_and_profile = lambda source, url: upwork_scanner.scanned.append('source')
+        upwork_scanner.fullscroll_to_bottom = lambda *args, **kwargs: 0
+        return upwork_scanner
+
+    def test_jobs_from_the_network(self, scanner):
+        """Test the jobs are taken from the api without scrolling nor parsing the page"""
+        scanner.fullscroll_to_bottom = lambda *args, **kwargs: pytest.fail('The feed was scrolled')
+        scanner.driver = NetworkDriver({'1': {'body': json.dumps(FEED)}})
+        scanner.scan()
+        assert [job.title for job in scanner.scanned_data['jobs']] == ['Scraper in Python', 'Logo']
+        assert scanner.scanned == ['browser']
+
+    def test_falls_back_to_the_page(self, scanner, jobs_page):
+        """Test the page source is parsed when the api brought no jobs"""
+        scanner.driver = NetworkDriver({})
+        scanner.take_snapshot = lambda: PageSnapshot(str(jobs_page))
+        scanner.scan()
+        assert 'jobs' not in scanner.scanned_data
+        assert scanner.scanned == ['source']
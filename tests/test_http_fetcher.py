@@ -0,0 +1,55 @@
+import httpx
+import pytest
+
+from resources.http_fetcher import HttpFetcher
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == '/broken':
+        return httpx.Response(500)
+    if request.url.path == '/login':
+        return httpx.Response(200, text='<form id="login_username"></form>')
+    if request.url.path == '/freelancers/~02':
+        return httpx.Response(200, text='<div class="profile-outer-card">Http</div>')
+    token = request.headers.get('cookie', '')
+    return httpx.Response(200, text=f'{request.url.path}|{token}|{request.headers["user-agent"]}')
+
+
+class TestHttpFetcher:
+    def test_fetch_reuses_browser_cookies(self):
+        """Test the cookies of the browser are sent in the requests"""
+        cookies = [{'name': 'master_access_token', 'value': 'abc', 'domain': '.upwork.com', 'path': '/'}]
+        with HttpFetcher(cookies, 'Mozilla/5.0', transport=httpx.MockTransport(handler)) as fetcher:
+            content = fetcher.fetch('https://www.upwork.com/freelancers/~01')
+        assert content == '/freelancers/~01|master_access_token=abc|Mozilla/5.0'
+
+
+class FakeDriver:
+    """Browser which has always the profile loaded."""
+    page_source = '<div class="profile-outer-card">Browser</div>'
+
+    def set_window_size(self, width, height):
+        ...
+
+
+class TestGetPage:
+    @pytest.fixture()
+    def scanner(self, upwork_scanner, monkeypatch):
+        monkeypatch.setattr('scanners.upwork.HTTP_FETCH', True)
+        upwork_scanner.driver = FakeDriver()
+        upwork_scanner.http = HttpFetcher([], 'Mozilla/5.0', transport=httpx.MockTransport(handler))
+        upwork_scanner.requested = []
+        upwork_scanner.custom_request = lambda url, type_element, value: upwork_scanner.requested.append(url)
+        return upwork_scanner
+
+    def test_page_without_the_browser(self, scanner):
+        """Test the page with the element expected is not requested to the browser"""
+        assert 'Http' in scanner.get_page('https://www.upwork.com/freelancers/~02', 'profile-outer-card')
+        assert scanner.requested == []
+
+    @pytest.mark.parametrize('path', ['/broken', '/login'])
+    def test_falls_back_to_the_browser(self, scanner, path):
+        """Test the browser gets the page when the request fails or misses the element expected"""
+        url = f'https://www.upwork.com{path}'
+        assert 'Browser' in scanner.get_page(url, 'profile-outer-card')
+        assert scanner.requested == [url]
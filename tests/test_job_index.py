@@ -0,0 +1,95 @@
+import re
+
+import pytest
+
+from benchmarks.synthetic import make_job_tiles, make_jobs_page
+from resources.job_index import JobIndex
+from resources.parsers import slice_children
+from resources.snapshot import PageSnapshot
+from settings import BASE_DIR
+
+JOBS_PAGE = BASE_DIR / 'tests' / 'files' / 'upwork_jobs_page_for_testing.html'
+
+
+def feed(tiles):
+    return f'<div data-test="job-tile-list">{"".join(tiles)}</div>'
+
+
+class TestJobIndex:
+    def test_entry_without_parsing(self):
+        """Test the id comes from the link and the fingerprint ignores the relative date"""
+        tile = make_job_tiles(1)
+        entry = JobIndex.entry(tile)
+        assert entry.job_id == f'01{0:016x}'
+        assert entry.posted_on
+        assert JobIndex.entry(tile.replace(entry.posted_on, '5 days ago')).fingerprint == entry.fingerprint
+        assert JobIndex.entry(tile.replace('Budget', 'Price')).fingerprint != entry.fingerprint
+
+    def test_second_scan_skips_unchanged_tiles(self, upwork_scanner):
+        """Test only the new and changed tiles are parsed"""
+        tiles = slice_children(make_jobs_page(20), 'data-test="job-tile-list"')
+        upwork_scanner.scan_jobs(feed(tiles[:15]))
+        assert upwork_scanner.index_report == {'new': 15, 'changed': 0, 'skipped': 0}
+
+        tiles[3] = tiles[3].replace('Budget', 'Price')
+        upwork_scanner.scan_jobs(feed(tiles))
+        assert upwork_scanner.index_report == {'new': 5, 'changed': 1, 'skipped': 14}
+        assert len(upwork_scanner.scanned_data['jobs']) == 20
+
+    def test_skipped_jobs_match_a_full_parse(self, upwork_scanner):
+        """Test the jobs taken from the index are the same as parsing them, with the new posted_on"""
+        tiles = slice_children(make_jobs_page(10), 'data-test="job-tile-list"')
+        upwork_scanner.scan_jobs(feed(tiles))
+        tiles[0] = tiles[0].replace(JobIndex.entry(tiles[0]).posted_on, '1 minute ago')
+        upwork_scanner.scan_jobs(feed(tiles))
+        indexed = upwork_scanner.scanned_data['jobs']
+        assert upwork_scanner.index_report['skipped'] == 10
+
+        upwork_scanner.job_index = None
+        upwork_scanner.scan_jobs(feed(tiles))
+        assert indexed == upwork_scanner.scanned_data['jobs']
+        assert indexed[0].posted_on == '1 minute ago'
+
+    def test_real_page(self, upwork_scanner):
+        """Test the tiles of the real page are indexed by the id of their link"""
+        html_content = JOBS_PAGE.read_text()
+        upwork_scanner.scan_jobs(html_content)
+        upwork_scanner.scan_jobs(html_content)
+        assert upwork_scanner.index_report['skipped'] == len(upwork_scanner.scanned_data['jobs']) == 2
+
+    def test_new_job_prepended_to_the_feed(self, upwork_scanner):
+        """Test the tiles shifted by a new job on top of the feed are skipped"""
+        tiles = slice_children(JOBS_PAGE.read_text(), 'data-test="job-tile-list"')
+        upwork_scanner.scan_jobs(feed(tiles))
+
+        # The attributes which count the position of the tiles are increased.
+        shifted = [re.sub(r'(data-ev-position="|popper_)(\d+)', lambda m: f'{m.group(1)}{int(m.group(2)) + 1}', tile)
+                   for tile in tiles]
+        assert shifted != tiles
+        upwork_scanner.scan_jobs(feed([make_job_tiles(1, start=99)] + shifted))
+        assert upwork_scanner.index_report == {'new': 1, 'changed': 0, 'skipped': 2}
+
+    def test_malformed_tile_doesnt_shift_the_jobs(self, upwork_scanner):
+        """Test a tile which isn't parsed into a job fails instead of storing the jobs under other ids"""
+        tiles = slice_children(make_jobs_page(3), 'data-test="job-tile-list"')
+        with pytest.raises(ValueError):
+            upwork_scanner.scan_jobs_incremental([tiles[0].removesuffix('</section>'), tiles[1], tiles[2]],
+                                                 upwork_scanner.job_index)
+        assert not upwork_scanner.job_index.lookup(tiles)[1].job
+
+
+def test_index_with_the_profile_overlapped(upwork_scanner, monkeypatch):
+    """Test the index used by the thread of the jobs doesn't break the end of the run"""
+    monkeypatch.setattr('scanners.upwork.OVERLAP_PROFILE', True)
+    snapshot = PageSnapshot(make_jobs_page(5, seed=3))
+    upwork_scanner.restore_session = lambda: True
+    upwork_scanner.fullscroll_to_bottom = lambda *args: 5
+    upwork_scanner.take_snapshot = lambda: snapshot
+    upwork_scanner.scan_profile = lambda url: upwork_scanner.scanned_data.update(profile=url)
+    upwork_scanner.read_performance_log = lambda: []
+
+    for _ in range(2):
+        upwork_scanner.scan()
+    assert len(upwork_scanner.scanned_data['jobs']) == 5
+    assert upwork_scanner.scanned_data['profile'] == snapshot.profile_url
+    assert upwork_scanner.index_report['skipped'] == 5
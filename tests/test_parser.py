@@ -6,22 +6,25 @@ from resources.models import (
     JobsSchemaList,
     ProfileSchema,
 )
+from resources.parsers import slice_children
 from settings import BASE_DIR
-from utils.file_utils import remove_folder
+from utils.file_utils import wait_archives
 
 
 class TestParserHtml:
-    def test_prepare_data_files_folder_when_doesnt_exists(self, upwork_scanner):
+    def test_prepare_data_files_folder_when_doesnt_exists(self, upwork_scanner, archive_dir):
         """Test the pre"""
-        folder_files = BASE_DIR / 'files'
-        if folder_files.exists():
-            remove_folder(folder_files)
+        soup = upwork_scanner.prepare_data('this is the html content', 'foo_page', archive=True)
+        wait_archives()
+        assert soup
+        assert (archive_dir / 'upwork_foo_page.html').read_text() == 'this is the html content'
 
-        soup = upwork_scanner.prepare_data('this is the html content', 'foo_page')
-        try:
-            assert soup
-        finally:
-            remove_folder(folder_files)
+    def test_prepare_data_without_archive_doesnt_touch_disk(self, upwork_scanner, archive_dir):
+        """Test the page is parsed from memory when archiving is disabled"""
+        soup = upwork_scanner.prepare_data('<p>html content</p>', 'foo_page', archive=False)
+        wait_archives()
+        assert soup.get_text() == 'html content'
+        assert not archive_dir.exists()
 
     def test_type_return_prepare_data(self, jobs_page):
         """Test instance of prepare data is a BeautifulSoup instance"""
@@ -47,3 +50,64 @@ class TestParserHtml:
     def test_exporting_jobs_and_profile_information(self, upwork_scanner, jobs, profile_content):
         jobs = [upwork_scanner.parse_job(job) for job in jobs]
         JobsAndProfileSchema(jobs=jobs, profile=profile_content)
+
+
+class TestJobTileExtractor:
+    def test_single_pass_matches_field_by_field_search(self, upwork_scanner, jobs):
+        """Test the compiled extraction gets the same as searching every field"""
+        for job in jobs:
+            upper_div, lower_div = job.find_all('div', recursive=False)
+            expected = {
+                'title': upper_div.find(class_='job-tile-title').text.strip(),
+                'link': upper_div.find('a').get('href'),
+                'skills': [match.get_text(strip=True) for match in
+                           lower_div.find_all(attrs={"data-test": "attr-item"})],
+            }
+            for value, key in upwork_scanner.job_extractor.TEXT_FIELDS.items():
+                expected[key] = upwork_scanner.get_text_element_by_attr(lower_div, 'data-test', value)
+            if match := lower_div.find(attrs={'data-test': 'js-feedback'}):
+                if rating := match.find('span', class_='sr-only'):
+                    expected['rating'] = rating.get_text(strip=True)
+
+            assert upwork_scanner.parse_job(job) == upwork_scanner.normalize_job(expected)
+
+
+class TestScopedParsing:
+    def test_jobs_region_gets_the_same_jobs(self, upwork_scanner, jobs):
+        """Test parsing only the job-tile-list gets the same jobs than the whole page"""
+        filepath = BASE_DIR / 'tests' / 'files' / 'upwork_jobs_page_for_testing.html'
+        soup = upwork_scanner.prepare_data(filepath.read_text(), 'jobs_page',
+                                           archive=False, region=upwork_scanner.JOBS_REGION)
+        scoped_jobs = upwork_scanner.catch_jobs(soup)
+        assert not soup.find('script')
+        assert [upwork_scanner.parse_job(job) for job in scoped_jobs] == \
+               [upwork_scanner.parse_job(job) for job in jobs]
+
+    def test_profile_region_gets_the_same_profile(self, upwork_scanner, profile_content):
+        """Test parsing only the profile box gets the same profile than the whole page"""
+        filepath = BASE_DIR / 'tests' / 'files' / 'upwork_profile_page_for_testing.html'
+        soup = upwork_scanner.prepare_data(filepath.read_text(), 'profile_page',
+                                           archive=False, region=upwork_scanner.PROFILE_REGION)
+        assert upwork_scanner.parse_profile(soup) == profile_content
+
+
+class TestParallelParsing:
+    def test_parallel_scan_keeps_order_and_content(self, upwork_scanner):
+        """Test parsing the jobs across processes gets the same as serially"""
+        filepath = BASE_DIR / 'tests' / 'files' / 'upwork_jobs_page_for_testing.html'
+        html_content = filepath.read_text()
+        tiles = slice_children(html_content, 'data-test="job-tile-list"')
+        feed = f'<div data-test="job-tile-list">{"".join(tiles * 15)}</div>'
+
+        # Without the index, otherwise the second scan takes every job from it.
+        upwork_scanner.job_index = None
+        upwork_scanner.parse_workers = 1
+        upwork_scanner.scan_jobs(feed)
+        serial = upwork_scanner.scanned_data['jobs']
+
+        upwork_scanner.parse_workers, upwork_scanner.parse_chunk_size = 2, 4
+        upwork_scanner.parallel_threshold = 0
+        upwork_scanner.scan_jobs(feed)
+
+        assert len(serial) == 30
+        assert upwork_scanner.scanned_data['jobs'] == serial
@@ -0,0 +1,43 @@
+import pytest
+
+from resources.models import JobSchema, ProfileSchema
+from resources.parsers import DEFAULT_BACKEND, available_backends, make_soup
+from settings import BASE_DIR
+
+FILES = BASE_DIR / 'tests' / 'files'
+
+# Fields generated on every instance of ProfileSchema.
+VOLATILE_PROFILE_FIELDS = {'id', 'created_at'}
+
+
+def scan_jobs_with(scanner, backend):
+    with open(FILES / 'upwork_jobs_page_for_testing.html') as file:
+        soup = make_soup(file, backend)
+    return [JobSchema(**scanner.parse_job(job)) for job in scanner.catch_jobs(soup)]
+
+
+def scan_profile_with(scanner, backend):
+    with open(FILES / 'upwork_profile_page_for_testing.html') as file:
+        soup = make_soup(file, backend)
+    profile = ProfileSchema(**scanner.parse_profile(soup))
+    return profile.model_dump(exclude=VOLATILE_PROFILE_FIELDS)
+
+
+@pytest.mark.parametrize('backend', available_backends())
+class TestParserBackendsParity:
+    def test_jobs_are_identical_to_default_backend(self, upwork_scanner, backend):
+        """Test every backend produces the same jobs than html.parser"""
+        expected = scan_jobs_with(upwork_scanner, DEFAULT_BACKEND)
+        assert expected
+        assert scan_jobs_with(upwork_scanner, backend) == expected
+
+    def test_profile_is_identical_to_default_backend(self, upwork_scanner, backend):
+        """Test every backend produces the same profile than html.parser"""
+        expected = scan_profile_with(upwork_scanner, DEFAULT_BACKEND)
+        assert scan_profile_with(upwork_scanner, backend) == expected
+
+
+def test_unknown_backend_falls_back_to_default():
+    """Test a backend not installed doesn't break the parsing"""
+    soup = make_soup('<div data-test="job-tile-list"></div>', 'not-a-parser')
+    assert soup.find('div', {'data-test': 'job-tile-list'})
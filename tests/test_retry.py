@@ -0,0 +1,172 @@
+import random
+import time
+
+import pytest
+from selenium.common import NoSuchElementException, TimeoutException
+
+from resources.base import BaseSelenium
+from resources.exceptions import RequestFailed
+from resources.retry import RetryPolicy, RetryStats
+from resources.waits import WaitPolicy, Waiter
+
+
+class FakeDriver:
+    """Browser where the element expected appears after some loads, and can stop responding."""
+
+    def __init__(self, fails=0, alive=True):
+        self.fails = fails
+        self.alive = alive
+        self.loads = 0
+        self.quitted = False
+        self.page_load_timeout = 300.0
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise ConnectionRefusedError('Browser is gone')
+        return 'https://www.upwork.com/'
+
+    def get(self, url):
+        self.current_url
+        self.loads += 1
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+
+    def set_window_size(self, width, height):
+        ...
+
+    def execute_script(self, script):
+        return ['complete', 0]
+
+    def find_element(self, by, value):
+        if self.loads <= self.fails:
+            raise NoSuchElementException(value)
+        return object()
+
+    def save_screenshot(self, filename):
+        ...
+
+    def quit(self):
+        self.quitted = True
+
+
+class SlowDriver(FakeDriver):
+    """Browser where every load takes seconds, cut by the page load timeout as selenium does."""
+
+    def __init__(self, seconds, **kwargs):
+        super().__init__(**kwargs)
+        self.seconds = seconds
+
+    def get(self, url):
+        super().get(url)
+        time.sleep(min(self.seconds, self.page_load_timeout))
+        if self.seconds > self.page_load_timeout:
+            raise TimeoutException(f'Page load over {self.page_load_timeout}s')
+
+
+def make_selenium(driver, selenium=None, **policy):
+    selenium = selenium or BaseSelenium()
+    selenium.waits = Waiter(WaitPolicy('test', jitter_scale=0, jitter_budget=0,
+                                       timeout=1, network_idle=0, poll=0.001))
+    selenium.retry_policy = RetryPolicy(**{'attempts': 4, 'deadline': 5, 'page_timeout': 0.02,
+                                           'backoff': 0.001, 'max_backoff': 0.01, **policy})
+    selenium.driver = driver
+    return selenium
+
+
+class TestCustomRequest:
+    def test_loads_after_failures(self):
+        """Test the page is retried without quitting the browser, and the failures are recorded"""
+        driver = FakeDriver(fails=2)
+        selenium = make_selenium(driver)
+        selenium.custom_request('https://www.upwork.com/', 'id', 'login_username')
+        assert driver.loads == 3 and not driver.quitted
+        assert selenium.retry_stats.report()['https://www.upwork.com/']['errors'] == {'TimeoutException': 2}
+
+    def test_fails_fast_on_deadline(self):
+        """Test the attempts stop once the deadline is spent"""
+        selenium = make_selenium(FakeDriver(fails=1000), attempts=1000, deadline=0.2)
+        start = time.monotonic()
+        with pytest.raises(RequestFailed):
+            selenium.custom_request('https://www.upwork.com/', 'id', 'login_username')
+        assert time.monotonic() - start < 1
+
+    def test_slow_page_is_cut_at_the_deadline(self):
+        """Test an attempt doesn't go over the deadline waiting for the page to load"""
+        driver = SlowDriver(0.5)
+        selenium = make_selenium(driver, deadline=0.3, page_timeout=0.5)
+        start = time.monotonic()
+        with pytest.raises(RequestFailed):
+            selenium.custom_request('https://www.upwork.com/', 'id', 'login_username')
+        assert time.monotonic() - start < 0.45
+        # What was left of the deadline is not kept for the next loads.
+        assert driver.page_load_timeout == 0.5
+
+    def test_dead_browser_is_renewed(self):
+        """Test a browser which stopped responding is replaced by a new one"""
+        dead, fresh = FakeDriver(alive=False), FakeDriver()
+        selenium = make_selenium(dead)
+        selenium.new_driver = lambda: fresh
+        selenium.custom_request('https://www.upwork.com/', 'id', 'login_username')
+        assert dead.quitted and selenium.driver is fresh
+        assert selenium.retry_stats.urls['https://www.upwork.com/'].failures == 1
+
+
+class TestRenewLoggedIn:
+    def test_renewed_browser_restores_the_session(self, upwork_scanner):
+        """Test the new browser is logged in again before the page is retried"""
+        dead, fresh = FakeDriver(alive=False), FakeDriver()
+        scanner = make_selenium(dead, upwork_scanner)
+        scanner.new_driver = lambda: fresh
+        scanner.logged_in = True
+        restored = []
+        scanner.restore_session = lambda: restored.append(scanner.driver) or True
+        scanner.custom_request('https://www.upwork.com/freelancers/~01', 'class name', 'profile-outer-card')
+        assert restored == [fresh] and scanner.logged_in
+        assert fresh.loads == 1
+
+    def test_renewed_browser_logs_in_without_session(self, upwork_scanner):
+        """Test the new browser goes through the login when the session can't be restored"""
+        scanner = make_selenium(FakeDriver(alive=False), upwork_scanner)
+        scanner.new_driver = FakeDriver
+        scanner.logged_in = True
+        scanner.restore_session = lambda: False
+        scanner.login = lambda: True
+        scanner.custom_request('https://www.upwork.com/freelancers/~01', 'class name', 'profile-outer-card')
+        assert scanner.logged_in
+
+    def test_login_of_renewed_browser_keeps_the_deadline(self, upwork_scanner):
+        """Test the login of the new browser doesn't start a deadline of its own"""
+        scanner = make_selenium(FakeDriver(alive=False), upwork_scanner, attempts=1000, deadline=0.3, page_timeout=1)
+        scanner.new_driver = lambda: SlowDriver(0.05, fails=1000)
+        scanner.logged_in = True
+        scanner.restore_session = lambda: False
+        start = time.monotonic()
+        with pytest.raises(RequestFailed):
+            scanner.custom_request('https://www.upwork.com/freelancers/~01', 'class name', 'profile-outer-card')
+        assert time.monotonic() - start < 0.5
+        assert not scanner.logged_in and scanner.request_deadline is None
+
+    def test_browser_renewed_along_the_login_is_not_logged_in(self, upwork_scanner):
+        """Test the renewal doesn't log in while the scanner is still logging in"""
+        scanner = make_selenium(FakeDriver(alive=False), upwork_scanner)
+        scanner.new_driver = FakeDriver
+        scanner.restore_session = lambda: pytest.fail('The session was restored along the login')
+        scanner.custom_request('https://www.upwork.com/ab/account-security/login', 'id', 'login_username')
+        assert not scanner.logged_in
+
+
+def test_backoff_is_exponential_with_jitter():
+    """Test the pauses never go over the doubled backoff nor its maximum"""
+    policy = RetryPolicy(backoff=1, max_backoff=4)
+    rng = random.Random(1)
+    for attempt, ceiling in [(1, 1), (2, 2), (3, 4), (6, 4)]:
+        assert all(0 <= policy.pause(attempt, rng) <= ceiling for _ in range(50))
+
+
+def test_stats_report_only_failed_urls():
+    stats = RetryStats()
+    stats.record('a', 0.5)
+    stats.record('b', 1.0, 'TimeoutException')
+    assert list(stats.report()) == ['b']
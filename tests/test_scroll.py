@@ -0,0 +1,50 @@
+from resources.base import BaseSelenium
+from resources.waits import WaitPolicy, Waiter
+
+
+class FakeFeedDriver:
+    """Browser whose feed loads a new page of jobs on every scroll, until there are no more."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.count = self.pages.pop(0)
+        self.scrolls = 0
+
+    def set_window_size(self, width, height):
+        ...
+
+    def execute_script(self, script):
+        if 'scrollTo' in script:
+            self.scrolls += 1
+            if self.pages:
+                self.count = self.pages.pop(0)
+            return None
+        return self.count
+
+
+def make_selenium(driver):
+    selenium = BaseSelenium()
+    selenium.waits = Waiter(WaitPolicy('test', jitter_scale=0, jitter_budget=0,
+                                       timeout=1, network_idle=0, poll=0.001))
+    selenium.driver = driver
+    return selenium
+
+
+class TestFullScroll:
+    def test_scroll_stops_when_no_new_jobs(self):
+        """Test the scroll stops once the count of jobs converges"""
+        driver = FakeFeedDriver([10, 20, 30, 30])
+        assert make_selenium(driver).fullscroll_to_bottom('div', 'section', settle=0.05) == 30
+        assert driver.scrolls == 3
+
+    def test_scroll_stops_at_target(self):
+        """Test the scroll stops once the target of jobs is reached"""
+        driver = FakeFeedDriver([10, 20, 30, 40, 50])
+        assert make_selenium(driver).fullscroll_to_bottom('div', 'section', target=25, settle=0.05) == 30
+        assert driver.scrolls == 2
+
+    def test_scroll_without_container(self):
+        """Test there is no scroll when the container isn't in the page"""
+        driver = FakeFeedDriver([-1])
+        assert make_selenium(driver).fullscroll_to_bottom('div', 'section') == 0
+        assert driver.scrolls == 0
@@ -0,0 +1,123 @@
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from resources.session import SessionCache
+
+
+class FakeDriver:
+    def __init__(self, cookies=None, local_storage=None):
+        self.cookies = list(cookies or [])
+        self.local_storage = dict(local_storage or {})
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def get_cookies(self):
+        return [dict(cookie) for cookie in self.cookies]
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        if args:
+            self.local_storage.update(args[0])
+        return dict(self.local_storage)
+
+
+@pytest.fixture()
+def session_cache(tmp_path):
+    return SessionCache('someone@upwork.com', folder=tmp_path)
+
+
+class TestSessionCache:
+    def test_restore_saved_session(self, session_cache):
+        """Test the cookies and local storage are restored in a new browser"""
+        cookie = {'name': 'master_access_token', 'value': 'abc', 'domain': '.upwork.com'}
+        session_cache.save(FakeDriver([cookie], {'visitor_id': '1'}))
+
+        new_driver = FakeDriver()
+        assert session_cache.restore(new_driver, 'https://www.upwork.com/')
+        assert new_driver.visited == ['https://www.upwork.com/']
+        assert new_driver.cookies == [cookie]
+        assert new_driver.local_storage == {'visitor_id': '1'}
+
+    def test_expired_session_is_not_restored(self, session_cache):
+        """Test a session older than max_age is ignored"""
+        session_cache.save(FakeDriver([{'name': 'token', 'value': 'abc'}]))
+        session_cache.max_age = 60
+        data = session_cache.load()
+        data['saved_at'] = time.time() - 120
+        session_cache.path.write_text(json.dumps(data))
+
+        assert not session_cache.restore(FakeDriver(), 'https://www.upwork.com/')
+
+    def test_without_saved_session(self, session_cache):
+        """Test there is nothing to restore before the first login"""
+        assert session_cache.load() is None
+        assert not session_cache.restore(FakeDriver(), 'https://www.upwork.com/')
+
+    @pytest.mark.skipif(os.name != 'posix', reason='Permissions of posix')
+    def test_only_the_owner_reads_the_session(self, session_cache, monkeypatch):
+        """Test the cookies are written into a file created only readable by its owner, whatever
+        the umask, instead of being restricted once written"""
+        monkeypatch.setattr(os, 'chmod', lambda *args, **kwargs: None)
+        previous = os.umask(0)
+        try:
+            session_cache.save(FakeDriver([{'name': 'token', 'value': 'abc'}]))
+        finally:
+            os.umask(previous)
+        assert stat.S_IMODE(session_cache.path.stat().st_mode) == 0o600
+
+
+class ScannerDriver(FakeDriver):
+    """Browser which lands on the page of url with the title given."""
+
+    def __init__(self, url='https://www.upwork.com/nx/find-work/', title='Find Work'):
+        super().__init__()
+        self.current_url = url
+        self.title = title
+        self.cookies_deleted = False
+
+    def delete_all_cookies(self):
+        self.cookies_deleted = True
+
+
+class TestRestoreSession:
+    @pytest.fixture()
+    def scanner(self, upwork_scanner, session_cache, monkeypatch):
+        monkeypatch.setattr('scanners.upwork.SESSION_CACHE', True)
+        session_cache.save(FakeDriver([{'name': 'master_access_token', 'value': 'abc'}]))
+        upwork_scanner.session = session_cache
+        upwork_scanner.open_url = lambda url, deadline=None: None
+        return upwork_scanner
+
+    def test_valid_session_skips_the_login(self, scanner):
+        """Test the restored session which is still logged in is used"""
+        scanner.driver = ScannerDriver()
+        assert scanner.restore_session()
+        assert scanner.driver.cookies == [{'name': 'master_access_token', 'value': 'abc'}]
+
+    def test_stale_session_is_cleared_before_the_login(self, scanner):
+        """Test a session which lands on the login is removed, and the login is done"""
+        scanner.driver = ScannerDriver('https://www.upwork.com/ab/account-security/login', 'Log in - Upwork')
+        logins = []
+
+        def login():
+            logins.append(scanner.session.path.exists())
+            return False
+
+        scanner.login = login
+        scanner.scan()
+        assert logins == [False]
+        assert scanner.driver.cookies_deleted and not scanner.logged_in
+
+    def test_cloudflare_is_not_logged_in(self, scanner):
+        """Test the validation of Cloudflare is not taken as the session logged in"""
+        scanner.driver = ScannerDriver(title='Just a moment...')
+        assert not scanner.is_logged_in()
+        assert not scanner.restore_session()
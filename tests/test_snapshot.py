@@ -0,0 +1,35 @@
+from resources.error_messages import ANSWER_INCORRECT, USERNAME_INCORRECT
+from resources.snapshot import PageSnapshot
+
+
+class TestPageSnapshot:
+    def test_errors_detected_in_order_of_priority(self):
+        """Test the first error is the one first in ERRORS, whatever its position in the page"""
+        snapshot = PageSnapshot(f'<p>{ANSWER_INCORRECT}</p><div>{USERNAME_INCORRECT}</div>')
+        assert snapshot.errors == (USERNAME_INCORRECT, ANSWER_INCORRECT)
+        assert snapshot.error == USERNAME_INCORRECT
+
+    def test_page_without_errors(self):
+        """Test a normal page has no error, Cloudflare nor profile url"""
+        snapshot = PageSnapshot('<html><title>Find Work</title></html>', title='Find Work')
+        assert snapshot.error == ''
+        assert not snapshot.is_cloudflare
+        assert snapshot.profile_url == ''
+
+    def test_cloudflare_detected(self):
+        """Test the challenge of Cloudflare is detected by title or markers"""
+        assert PageSnapshot('', title='Just a moment...').is_cloudflare
+        assert PageSnapshot('<script>window._cf_chl_opt={cvId: "3"};</script>').is_cloudflare
+
+    def test_bot_management_script_is_not_cloudflare(self):
+        """Test a normal page with the script of bot management of Cloudflare is not its challenge"""
+        source = '<html><head><title>Log in - Upwork</title></head><body><form id="login"></form>' \
+                 '<script src="/cdn-cgi/challenge-platform/scripts/jsd/main.js"></script></body></html>'
+        assert not PageSnapshot(source, title='Log in - Upwork').is_cloudflare
+
+    def test_profile_url_from_jobs_page(self, upwork_scanner):
+        """Test the profile url is the same found by find_profile_url in the jobs page"""
+        source = '<script>window.__NUXT__={profileUrl:"https:\\u002F\\u002Fwww.upwork.com' \
+                 '\\u002Ffreelancers\\u002F~011cfba3bd0cf44f8d"}</script>'
+        assert PageSnapshot(source).profile_url == 'https://www.upwork.com/freelancers/~011cfba3bd0cf44f8d'
+        assert upwork_scanner.find_profile_url(source) == PageSnapshot(source).profile_url
@@ -0,0 +1,91 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.synthetic import make_jobs_page
+from resources.models import JobSchema
+from scanners.upwork import UpWorkScanner
+from utils.date_utils import date_to_relative, relative_to_date
+from utils.sqlite_sink import SqliteSink
+
+NOW = datetime(2023, 12, 1, 10, 15, tzinfo=timezone.utc)
+
+
+def synthetic_jobs(quantity):
+    scanner = UpWorkScanner({})
+    tiles = scanner.catch_jobs(scanner.prepare_data(make_jobs_page(quantity), 'jobs_page', archive=False))
+    return [JobSchema(**scanner.parse_job(tile)) for tile in tiles]
+
+
+def write_in_process(path, jobs):
+    with SqliteSink(path, batch_size=7) as sink:
+        return sink.write_jobs(jobs)
+
+
+@pytest.mark.parametrize('text, delta', [('59 minutes ago', timedelta(minutes=59)), ('an hour ago', timedelta(hours=1)),
+                                         ('yesterday', timedelta(days=1)), ('last week', timedelta(weeks=1)),
+                                         ('\n 3 days ago\n ', timedelta(days=3)), ('just now', timedelta())])
+def test_relative_to_date(text, delta):
+    assert relative_to_date(text, NOW) == NOW - delta
+
+
+@pytest.mark.parametrize('delta, text', [(timedelta(seconds=20), 'just now'), (timedelta(minutes=1), '1 minute ago'),
+                                         (timedelta(hours=23, minutes=59), '23 hours ago'),
+                                         (timedelta(days=1, hours=5), 'yesterday'), (timedelta(days=9), 'last week'),
+                                         (timedelta(days=75), '2 months ago')])
+def test_date_to_relative(delta, text):
+    assert date_to_relative(NOW - delta, NOW) == text
+    assert NOW - delta <= relative_to_date(text, NOW) <= NOW
+
+
+def test_relative_to_date_unknown():
+    assert relative_to_date('posted too long ago', NOW) is None
+
+
+class TestSqliteSink:
+    def test_upsert_by_job_id(self, tmp_path, jobs_schema, profile_schema):
+        """Test writing the same scan twice updates the jobs instead of duplicating them"""
+        with SqliteSink(tmp_path / 'upwork.sqlite3', batch_size=1) as sink:
+            report = sink.write(jobs_schema, profile_schema)
+            changed = [jobs_schema[0].model_copy(update={'skills': ['Rust'], 'country': 'Chile'})]
+            sink.write(changed, profile_schema)
+
+            db = sink.connection
+            assert report['jobs'] == len(jobs_schema) and report['jobs_per_second'] > 0
+            assert db.execute('SELECT count(*) FROM jobs').fetchone()[0] == len(jobs_schema)
+            assert db.execute('SELECT count(*) FROM profiles').fetchone()[0] == 1
+            assert db.execute('SELECT j.country FROM jobs j JOIN job_skills s USING (job_id) '
+                              'WHERE s.skill = ?', ('Rust',)).fetchall() == [('Chile',)]
+            assert db.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    def test_indexes(self, tmp_path):
+        with SqliteSink(tmp_path / 'upwork.sqlite3') as sink:
+            plan = ' '.join(str(row) for row in sink.connection.execute(
+                'EXPLAIN QUERY PLAN SELECT * FROM job_skills WHERE skill = ?', ('Python',)))
+            indexes = {name for name, in sink.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert 'idx_job_skills_skill' in plan
+        assert {'idx_jobs_posted_at', 'idx_jobs_country', 'idx_job_skills_skill'} <= indexes
+
+    def test_posted_at_is_absolute(self, tmp_path, jobs_schema):
+        """Test the relative posted_on is kept as the date it refers to, which later scans don't move"""
+        job = jobs_schema[0].model_copy(update={'posted_on': '2 hours ago'})
+        with SqliteSink(tmp_path / 'upwork.sqlite3') as sink:
+            sink.write_jobs([job])
+            sink.write_jobs([job.model_copy(update={'posted_on': 'yesterday'})])
+            posted_on, posted_at, first_seen_at = sink.connection.execute(
+                'SELECT posted_on, posted_at, first_seen_at FROM jobs').fetchone()
+        assert posted_on == 'yesterday'
+        assert datetime.fromisoformat(first_seen_at) - datetime.fromisoformat(posted_at) == timedelta(hours=2)
+
+    def test_concurrent_processes(self, tmp_path):
+        """Test several processes write into the same database at the same time"""
+        path = tmp_path / 'upwork.sqlite3'
+        jobs = synthetic_jobs(60)
+        chunks = [jobs[i::4] for i in range(4)]
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            written = list(executor.map(write_in_process, [path] * 4, chunks))
+        with SqliteSink(path) as sink:
+            assert sink.connection.execute('SELECT count(*) FROM jobs').fetchone()[0] == 60
+        assert sum(written) == 60
@@ -0,0 +1,78 @@
+import httpx
+import pytest
+
+from benchmarks.runner import compare_blocking, run_end_to_end
+from benchmarks.stand_in import ASSETS, ASSETS_PATH, FEED_PATH, LOGIN_PATH, TILES_PATH, StandInServer
+from resources.driver_cache import chrome_version
+from resources.parsers import slice_children
+from resources.snapshot import PageSnapshot
+
+
+@pytest.fixture
+def server():
+    with StandInServer(jobs=25, page_size=10) as server:
+        yield server
+
+
+def login(client):
+    response = client.post(LOGIN_PATH, data={'username': 'user'})
+    assert response.url.path == '/ab/account-security/device-authorization'
+    return client.post(response.url.path, data={'answer': 'secret'})
+
+
+class TestStandIn:
+    def test_feed_requires_login(self, server):
+        """Test the feed redirects to the login page without the session"""
+        with httpx.Client(base_url=server.url, follow_redirects=True) as client:
+            response = client.get(FEED_PATH)
+        assert response.url.path == LOGIN_PATH
+        assert 'login_username' in response.text
+
+    def test_login_and_feed(self, server, upwork_scanner):
+        """Test the login steps end in the feed, with its first page of jobs and the profile url"""
+        with httpx.Client(base_url=server.url, follow_redirects=True) as client:
+            feed = login(client)
+            assert feed.url.path == FEED_PATH
+            assert len(slice_children(feed.text, 'data-test="job-tile-list"')) == 10
+            profile_url = PageSnapshot(feed.text).profile_url
+            assert profile_url.startswith(server.url)
+
+            profile = client.get(profile_url)
+            soup = upwork_scanner.prepare_data(profile.text, 'profile_page', archive=False)
+            assert upwork_scanner.parse_profile(soup)['full_name'] == 'Rachel W.'
+
+    def test_tiles_until_the_end_of_the_feed(self, server):
+        """Test the feed is served by pages until the total of jobs"""
+        with httpx.Client(base_url=server.url, follow_redirects=True) as client:
+            login(client)
+            sizes = [client.get(TILES_PATH, params={'start': start}).text.count('<section')
+                     for start in (10, 20, 30)]
+        assert sizes == [10, 5, 0]
+        assert server.hits[TILES_PATH] == 3
+
+    def test_pages_load_blockable_assets(self, server):
+        """Test the feed references images and a stylesheet which are served with their types"""
+        with httpx.Client(base_url=server.url, follow_redirects=True) as client:
+            feed = login(client)
+            assert f'<img src="{ASSETS_PATH}logo.png"' in feed.text
+            assert f'href="{ASSETS_PATH}app.css"' in feed.text
+            css = client.get(f'{ASSETS_PATH}app.css')
+            font = client.get(f'{ASSETS_PATH}inter.woff2')
+        assert 'inter.woff2' in css.text
+        assert font.headers['content-type'] == 'font/woff2'
+        assert len(font.content) == ASSETS['inter.woff2'][1] * 1024
+        assert server.assets_served == 2
+
+
+@pytest.mark.skipif(not chrome_version(), reason='Chrome is not installed')
+def test_blocking_saves_requests_in_chrome():
+    """Test the policy of the settings loads fewer requests than no policy"""
+    header, none, settings = compare_blocking(jobs=10).splitlines()
+    assert int(settings.split()[2]) < int(none.split()[2])
+
+
+@pytest.mark.skipif(not chrome_version(), reason='Chrome is not installed')
+def test_end_to_end_in_chrome():
+    """Test the whole scanner gets every job of the stand-in"""
+    [result] = run_end_to_end([30])
+    assert result.size == 30 and result.seconds > 0
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from resources.timeline import Timeline
+
+
+def test_overlapped_phases_report_saving():
+    """Test the phases in different threads count as saved time"""
+    timeline = Timeline()
+
+    def phase(name):
+        with timeline.phase(name):
+            time.sleep(0.1)
+
+    thread = threading.Thread(target=phase, args=('jobs',))
+    thread.start()
+    phase('profile')
+    thread.join()
+
+    report = timeline.report()
+    assert {name for name, *_ in report['phases']} == {'jobs', 'profile'}
+    assert report['sequential'] >= 0.2
+    assert report['saved'] >= 0.05
+
+
+def test_repeated_phase_is_kept():
+    """Test a phase which happens twice is reported twice, as it is counted"""
+    timeline = Timeline()
+    for name in ('jobs', 'scroll', 'jobs'):
+        with timeline.phase(name):
+            time.sleep(0.02)
+
+    report = timeline.report()
+    assert [name for name, *_ in report['phases']] == ['jobs', 'scroll', 'jobs']
+    assert report['sequential'] == round(sum(end - start for _, start, end in timeline.phases), 2)
+
+
+class TestScanJobsAndProfile:
+    def test_jobs_are_parsed_while_the_profile_is_fetched(self, upwork_scanner, monkeypatch):
+        """Test the jobs and the profile are scanned at the same time"""
+        threads = {}
+
+        def scan_jobs(html_content):
+            threads['jobs'] = threading.current_thread()
+            time.sleep(0.1)
+
+        def scan_profile(profile_url):
+            threads['profile'] = threading.current_thread()
+            time.sleep(0.1)
+
+        monkeypatch.setattr(upwork_scanner, 'scan_jobs', scan_jobs)
+        monkeypatch.setattr(upwork_scanner, 'scan_profile', scan_profile)
+        upwork_scanner.scan_jobs_and_profile('<html></html>', 'https://www.upwork.com/freelancers/~01')
+
+        assert threads['jobs'] is not threads['profile']
+        assert upwork_scanner.timeline.report()['elapsed'] < 0.19
+
+    def test_without_profile_url(self, upwork_scanner, monkeypatch):
+        """Test only the jobs are scanned when the profile wasn't found"""
+        calls = []
+        monkeypatch.setattr(upwork_scanner, 'scan_jobs', calls.append)
+        monkeypatch.setattr(upwork_scanner, 'scan_profile', lambda url: calls.append(url))
+        upwork_scanner.scan_jobs_and_profile('<html></html>', '')
+        assert calls == ['<html></html>']
+        assert [name for name, *_ in upwork_scanner.timeline.report()['phases']] == ['jobs']
@@ -0,0 +1,54 @@
+import pytest
+from selenium.common import NoSuchElementException, TimeoutException
+
+from resources.waits import PROFILES, WaitPolicy, Waiter
+
+
+@pytest.fixture()
+def waiter():
+    return Waiter(WaitPolicy('test', jitter_scale=1, jitter_budget=0.05,
+                             timeout=0.2, network_idle=0.02, poll=0.01))
+
+
+class FakeDriver:
+    def __init__(self, states):
+        self.states = iter(states)
+
+    def execute_script(self, script):
+        return next(self.states)
+
+
+class TestWaiter:
+    def test_until_returns_when_condition_is_ready(self, waiter):
+        """Test the wait finishes as soon as the condition is met"""
+        attempts = iter([NoSuchElementException(), None, 'element'])
+
+        def condition():
+            value = next(attempts)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        assert waiter.until(condition) == 'element'
+        assert waiter.waited < 0.2
+
+    def test_until_times_out(self, waiter):
+        """Test the wait fails when the condition is never met"""
+        with pytest.raises(TimeoutException):
+            waiter.until(lambda: False)
+        assert waiter.waited >= 0.2
+
+    def test_network_idle(self, waiter):
+        """Test the network is idle once no new resources are loaded"""
+        driver = FakeDriver([('loading', 1), ('complete', 5), ('complete', 9)] + [('complete', 9)] * 100)
+        assert waiter.for_network_idle(driver)
+
+    def test_jitter_limited_by_budget(self, waiter):
+        """Test the human-like pauses never exceed the budget"""
+        total = sum(waiter.jitter(0.02, 0.03) for _ in range(5))
+        assert total == pytest.approx(0.05)
+        assert waiter.report()['jitter'] == pytest.approx(0.05, abs=0.01)
+
+    def test_fast_profile_doesnt_pause(self):
+        """Test the fast profile skips the human-like pauses"""
+        assert Waiter(PROFILES['fast']).jitter(4, 10) == 0
@@ -0,0 +1,116 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from resources.job_index import job_id_of
+from resources.models import JobSchema, ProfileSchema
+from settings import DATA_DIR, log
+from utils.date_utils import datetime_now
+from utils.file_utils import locked, write_atomic
+
+# Fields which change on every scan without the job or the profile changing.
+JOB_VOLATILE_FIELDS = {'posted_on'}
+PROFILE_VOLATILE_FIELDS = {'id', 'created_at', 'updated_at'}
+
+
+def job_fingerprint(job: JobSchema) -> str:
+    data = job.model_dump_json(exclude=JOB_VOLATILE_FIELDS)
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class Changefeed:
+    """
+    Deltas between consecutive scans: the jobs added, changed and removed,
+    and the fields of the profile which changed. Every delta is written
+    into its own file with a sequence number which only increases, so the
+    consumers process them in order without reloading every job.
+    Ex.: data/changefeed/upwork_delta_00000007.json
+    """
+
+    def __init__(self, folder: Path = DATA_DIR / 'changefeed') -> None:
+        self.folder = Path(folder)
+        self.state_path = self.folder / 'state.json'
+
+    def read_state(self) -> Dict[str, Any]:
+        """Sequence of the last delta and what was scanned then."""
+        try:
+            return json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return {'sequence': 0, 'jobs': {}, 'profile': {}}
+
+    @staticmethod
+    def diff(state: Dict[str, Any], jobs: List[JobSchema],
+             profile: Optional[ProfileSchema]) -> Dict[str, Any]:
+        """
+        Compare the scan with the state of the last delta.
+        :return: Dictionary with the keys 'added' and 'changed' (jobs),
+                 'removed' (job_id and link of the jobs) and 'profile'
+                 (field -> {'old': ..., 'new': ...}), and the new 'state'.
+        """
+        previous_jobs: Dict[str, Dict[str, str]] = state.get('jobs', {})
+        current_jobs: Dict[str, Dict[str, str]] = {}
+        added, changed = [], []
+        for job in jobs:
+            job_id = job_id_of(str(job.link))
+            fingerprint = job_fingerprint(job)
+            current_jobs[job_id] = {'link': str(job.link), 'fingerprint': fingerprint}
+            if job_id not in previous_jobs:
+                added.append(job)
+            elif previous_jobs[job_id]['fingerprint'] != fingerprint:
+                changed.append(job)
+        removed = [{'job_id': job_id, 'link': job['link']}
+                   for job_id, job in previous_jobs.items() if job_id not in current_jobs]
+
+        previous_profile: Dict[str, Any] = state.get('profile', {})
+        current_profile = (profile.model_dump(mode='json', exclude=PROFILE_VOLATILE_FIELDS)
+                           if profile is not None else previous_profile)
+        profile_changes = {
+            field: {'old': previous_profile.get(field), 'new': value}
+            for field, value in current_profile.items() if previous_profile.get(field) != value
+        }
+        return {
+            'added': added, 'changed': changed, 'removed': removed, 'profile': profile_changes,
+            'state': {'jobs': current_jobs, 'profile': current_profile},
+        }
+
+    def emit(self, jobs: List[JobSchema], profile: Optional[ProfileSchema] = None) -> Optional[Path]:
+        """
+        Write the delta of the scan since the last one, if something changed.
+        :param jobs: Jobs scanned. A scan without jobs is skipped, it would
+                     mark every job seen before as removed.
+        :param profile: Profile scanned, None to not compare it.
+        :return: Path of the delta written, None if nothing changed.
+        """
+        if not jobs:
+            log.warning('The scan has no jobs, no delta written')
+            return None
+        with locked(self.folder / 'state.lock'):
+            state = self.read_state()
+            delta = self.diff(state, jobs, profile)
+            counts = {key: len(delta[key]) for key in ('added', 'changed', 'removed', 'profile')}
+            if not any(counts.values()):
+                log.info('Nothing changed since the last scan, no delta written')
+                return None
+
+            sequence = state.get('sequence', 0) + 1
+            document = {
+                'sequence': sequence,
+                'previous_sequence': state.get('sequence', 0),
+                'created_at': datetime_now().isoformat(),
+                'added': [job.model_dump(mode='json') for job in delta['added']],
+                'changed': [job.model_dump(mode='json') for job in delta['changed']],
+                'removed': delta['removed'],
+                'profile': delta['profile'],
+            }
+            path = self.folder / f'upwork_delta_{sequence:08d}.json'
+            write_atomic(path, json.dumps(document, indent=2, ensure_ascii=False))
+            write_atomic(self.state_path, json.dumps({'sequence': sequence, **delta['state']}))
+        log.info(f'Delta {sequence} written into {path}: {counts}')
+        return path
+
+    def deltas(self, after: int = 0) -> Iterator[Dict[str, Any]]:
+        """Read the deltas with a sequence greater than after, in order."""
+        for path in sorted(self.folder.glob('upwork_delta_*.json')):
+            if int(path.stem.rsplit('_', 1)[1]) > after:
+                yield json.loads(path.read_text(encoding='utf-8'))
@@ -0,0 +1,167 @@
+"""
+Columnar export of the jobs with typed columns, as a Parquet dataset when
+pyarrow is installed, otherwise as a typed csv. Every run is appended.
+"""
+import csv
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from resources.models import JobSchema
+from settings import BASE_DIR, log
+from utils.date_utils import datetime_now
+
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.parquet  # type: ignore
+except ImportError:
+    pyarrow = None  # type: ignore
+
+# Name of the column -> type.
+COLUMNS: Dict[str, str] = {
+    'scanned_at': 'timestamp',
+    'title': 'string',
+    'link': 'string',
+    'job_type': 'string',
+    'posted_on': 'string',
+    'workload': 'string',
+    'budget': 'float',
+    'duration': 'string',
+    'contractor_tier': 'string',
+    'tier_label': 'string',
+    'description': 'string',
+    'verification_status': 'string',
+    'skills': 'list',
+    'rating': 'float',
+    'spendings': 'float',
+    'country': 'string',
+}
+
+AMOUNT = re.compile(r'\$\s*([\d,]+(?:\.\d+)?)\s*([KkMm]?)')
+RATING = re.compile(r'(\d+(?:\.\d+)?)')
+MULTIPLIERS = {'': 1, 'k': 1_000, 'm': 1_000_000}
+
+
+def parse_amount(text: Optional[str]) -> Optional[float]:
+    """
+    Amount of money of a text.
+    Ex.: '$ 150 ' -> 150.0, '$4K+' -> 4000.0, '$1.5M' -> 1500000.0, '' -> None
+    """
+    if not text or not (match := AMOUNT.search(text)):
+        return None
+    return float(match.group(1).replace(',', '')) * MULTIPLIERS[match.group(2).lower()]
+
+
+def parse_rating(text: Optional[str]) -> Optional[float]:
+    """Ex.: 'Rating is 4.9 out of 5.' -> 4.9"""
+    if not text or not (match := RATING.search(text)):
+        return None
+    return float(match.group(1))
+
+
+def job_row(job: JobSchema, scanned_at: datetime) -> Dict[str, Any]:
+    """Values of the job with the types of COLUMNS."""
+    data = job.model_dump(mode='json')
+    return {
+        **{column: data.get(column) for column in COLUMNS},
+        'scanned_at': scanned_at,
+        'budget': parse_amount(job.budget),
+        'rating': parse_rating(job.rating),
+        'spendings': parse_amount(job.spendings),
+        'skills': list(job.skills),
+    }
+
+
+def arrow_schema():
+    types = {'timestamp': pyarrow.timestamp('us', tz='UTC'), 'string': pyarrow.string(),
+             'float': pyarrow.float64(), 'list': pyarrow.list_(pyarrow.string())}
+    return pyarrow.schema([(column, types[kind]) for column, kind in COLUMNS.items()])
+
+
+def export_parquet(rows: List[Dict[str, Any]], folder: Path, scanned_at: datetime) -> Path:
+    """Write the rows as a new part of the Parquet dataset of folder."""
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f'part-{scanned_at:%Y%m%dT%H%M%S%f}.parquet'
+    tmp_path = folder / f'.{path.name}.tmp'
+    table = pyarrow.Table.from_pylist(rows, schema=arrow_schema())
+    pyarrow.parquet.write_table(table, tmp_path, compression='zstd')
+    tmp_path.replace(path)
+    return path
+
+
+def export_csv(rows: List[Dict[str, Any]], path: Path) -> Path:
+    """Append the rows to a csv, writing the header with the types when it is created.
+    The lists are written as json and the missing numbers as empty fields."""
+    is_new = not path.exists() or path.stat().st_size == 0
+    with open(path, 'a', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        if is_new:
+            writer.writerow(f'{column}:{kind}' for column, kind in COLUMNS.items())
+        for row in rows:
+            writer.writerow(
+                json.dumps(row[column]) if kind == 'list'
+                else row[column].isoformat() if kind == 'timestamp'
+                else '' if row[column] is None else row[column]
+                for column, kind in COLUMNS.items()
+            )
+    return path
+
+
+def columnar_format(fmt: Optional[str] = None) -> str:
+    """
+    Format of the columnar export which can be written: 'csv' when 'parquet'
+    is requested (or no format) without pyarrow installed.
+    """
+    if fmt in (None, 'parquet') and pyarrow is None:
+        if fmt == 'parquet':
+            log.warning('Parquet export requires the package pyarrow '
+                        '(poetry install --extras parquet), exporting as csv')
+        return 'csv'
+    return fmt or 'parquet'
+
+
+def export_columnar(jobs: Iterable[JobSchema], filename: str = 'upwork_jobs',
+                    fmt: Optional[str] = None) -> Path:
+    """
+    Append the jobs of a run to the columnar export.
+    :param jobs: Jobs scanned.
+    :param filename: Name of the dataset without extension.
+    :param fmt: 'parquet' or 'csv'. By default 'parquet' if pyarrow is installed,
+                'csv' is written instead of 'parquet' when it isn't.
+    :return: Path of the file written. Ex.: upwork_jobs.parquet/part-20231201T101500000000.parquet
+    """
+    fmt = columnar_format(fmt)
+    scanned_at = datetime_now()
+    rows = [job_row(job, scanned_at) for job in jobs]
+    match fmt:
+        case 'parquet':
+            path = export_parquet(rows, BASE_DIR / f'{filename}.parquet', scanned_at)
+        case 'csv':
+            path = export_csv(rows, BASE_DIR / f'{filename}.csv')
+        case _:
+            raise ValueError(f'Columnar format {fmt!r} unknown, accepted: parquet, csv')
+    log.info(f'{len(rows)} jobs appended to {path}')
+    return path
+
+
+def read_columnar(path: Path) -> List[Dict[str, Any]]:
+    """Read the rows of a columnar export (a Parquet dataset or a typed csv) with their types."""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        if pyarrow is None:
+            raise ValueError('Reading Parquet requires the package pyarrow: poetry install --extras parquet')
+        return pyarrow.parquet.read_table(path).to_pylist()
+
+    converters: Dict[str, Callable[[str], Any]] = {
+        'timestamp': datetime.fromisoformat,
+        'string': str,
+        'float': lambda value: float(value) if value else None,
+        'list': json.loads,
+    }
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = [field.rsplit(':', 1) for field in next(reader)]
+        return [{column: converters[kind](value) for (column, kind), value in zip(header, row)}
+                for row in reader]
@@ -1,4 +1,14 @@
-from datetime import datetime, timezone
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# Ex.: '59 minutes ago', 'an hour ago', 'last week', 'yesterday'
+RELATIVE_DATE = re.compile(r'(\d+|an?|last)\s+(second|minute|hour|day|week|month|year)s?(?:\s+ago)?')
+RELATIVE_UNITS = {
+    'second': timedelta(seconds=1), 'minute': timedelta(minutes=1), 'hour': timedelta(hours=1),
+    'day': timedelta(days=1), 'week': timedelta(weeks=1), 'month': timedelta(days=30),
+    'year': timedelta(days=365),
+}
 
 
 def period_to_date(period_date: str) -> datetime:
@@ -21,3 +31,39 @@ def date_to_str(date_obj: datetime) -> str:
 def datetime_now() -> datetime:
     """Get the current datetime with utc timezone"""
     return datetime.now(timezone.utc)
+
+
+def relative_to_date(text: str, now: datetime) -> Optional[datetime]:
+    """
+    Transform a relative date into the datetime it refers to.
+    Ex.: '2 hours ago' -> now - 2 hours, 'yesterday' -> now - 1 day
+    :param text: Relative date, as the posted_on of the jobs.
+    :param now: Datetime the text was read.
+    :return: Datetime or None if the text is not a relative date.
+    """
+    text = text.strip().lower()
+    if text in ('just now', 'now'):
+        return now
+    if text == 'yesterday':
+        return now - RELATIVE_UNITS['day']
+    if not (match := RELATIVE_DATE.search(text)):
+        return None
+    quantity = int(match.group(1)) if match.group(1).isdigit() else 1
+    return now - quantity * RELATIVE_UNITS[match.group(2)]
+
+
+def date_to_relative(date_obj: datetime, now: datetime) -> str:
+    """
+    Transform a datetime into the relative date shown by upwork, the
+    inverse of relative_to_date.
+    Ex.: now - 2 hours -> '2 hours ago', now - 1 day -> 'yesterday'
+    """
+    seconds = max((now - date_obj).total_seconds(), 0)
+    for unit, last in (('year', 'last year'), ('month', 'last month'), ('week', 'last week'),
+                       ('day', 'yesterday'), ('hour', ''), ('minute', '')):
+        quantity = int(seconds // RELATIVE_UNITS[unit].total_seconds())
+        if quantity == 1 and last:
+            return last
+        if quantity >= 1:
+            return f'{quantity} {unit}{"s" if quantity > 1 else ""} ago'
+    return 'just now'
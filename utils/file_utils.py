@@ -1,6 +1,24 @@
+import gzip
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional
 
-from settings import BASE_DIR, log
+from pydantic import BaseModel
+
+from settings import ARCHIVE_DIR, BASE_DIR, log
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+# Only one worker, so the pages are written in the same order they were archived.
+_archiver = ThreadPoolExecutor(max_workers=1, thread_name_prefix='archiver')
+
+# Compression of the streamed exports -> extension of the file.
+COMPRESSIONS = {'': '', 'gzip': '.gz', 'zstd': '.zst'}
 
 
 def export_json(data: str, filename: str) -> None:
@@ -20,6 +38,87 @@ def export_json(data: str, filename: str) -> None:
         log.info(f"File created with scanned data: {jsonfilepath}")
 
 
+def write_atomic(path: Path, data: str) -> None:
+    """
+    Write a file through a temporary one which replaces it at the end, so
+    the readers never find it partially written.
+    :param path: Path of the file.
+    :param data: Content of the file.
+    """
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        tmp_path.write_text(data, encoding='utf-8')
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+@contextmanager
+def locked(path: Path) -> Iterator[None]:
+    """
+    Lock a file for the rest of processes while the block is executed,
+    creating its folder and the file if they don't exist.
+    :param path: Path of the lock file. Ex.: data/changefeed/state.lock
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def open_compressed(path: Path, compression: Optional[str] = None) -> BinaryIO:
+    """
+    Open a file to be written in binary, compressed on the fly.
+    :param compression: '' (or None), 'gzip' or 'zstd', the last one
+                        requires the package zstandard.
+    """
+    match compression or '':
+        case '':
+            return open(path, 'wb')
+        case 'gzip':
+            return gzip.open(path, 'wb', compresslevel=6)  # type: ignore[return-value]
+        case 'zstd':
+            try:
+                import zstandard  # type: ignore
+            except ImportError:
+                raise ValueError('zstd compression requires the package zstandard: poetry install --extras zstd')
+            return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'))
+        case _:
+            raise ValueError(f'Compression {compression!r} unknown, accepted: {", ".join(filter(None, COMPRESSIONS))}')
+
+
+def export_ndjson(records: Iterable[BaseModel], filename: str,
+                  compression: Optional[str] = None) -> Path:
+    """
+    Write the records one by one as a json per line, so the memory used
+    doesn't grow with the quantity of them when they come from a generator.
+    The file is written through a temporary one which replaces it at the
+    end, so the readers never find it partially written.
+    :param records: Models to be exported. Ex.: JobSchema instances.
+    :param filename: Name of the file without extension. Ex.: 'upwork_jobs'
+    :param compression: '' (or None), 'gzip' or 'zstd', see open_compressed.
+    :return: Path of the file created. Ex.: upwork_jobs.ndjson.gz
+    """
+    path = BASE_DIR / f'{filename}.ndjson{COMPRESSIONS.get(compression or "", "")}'
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    count = 0
+    try:
+        with open_compressed(tmp_path, compression) as file:
+            for record in records:
+                file.write(record.model_dump_json().encode('utf-8') + b'\n')
+                count += 1
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    log.info(f"File created with {count} records: {path}")
+    return path
+
+
 def remove_folder(folder_path: Path) -> None:
     """Remove a folder recursively"""
     for file in folder_path.iterdir():
@@ -29,3 +128,34 @@ def remove_folder(folder_path: Path) -> None:
             remove_folder(file)
     else:
         folder_path.rmdir()
+
+
+def write_page(html_content: str, filename: str) -> Path:
+    """
+    Create a html file into the folder ARCHIVE_DIR with the content of a page.
+    :param html_content: String which depicts the content of a site.
+    :param filename: Name of the file without extension.
+                     Ex.: 'upwork_jobs_page'
+    :return: Path of the file created.
+    """
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    filepath = ARCHIVE_DIR / f'{filename}.html'
+    log.info(f'Creating file {filepath.name}')
+    filepath.write_text(html_content)
+    return filepath
+
+
+def archive_page(html_content: str, filename: str) -> Future:
+    """
+    Write the content of a page in background, so the disk isn't
+    in the critical path of the scanner.
+    :param html_content: String which depicts the content of a site.
+    :param filename: Name of the file without extension.
+    :return: Future which will hold the path of the file created.
+    """
+    return _archiver.submit(write_page, html_content, filename)
+
+
+def wait_archives() -> None:
+    """Block until every page sent to archive_page has been written."""
+    _archiver.submit(lambda: None).result()
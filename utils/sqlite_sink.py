@@ -0,0 +1,205 @@
+"""
+Persistence of the scans into SQLite, so months of them can be queried
+without reloading the exported files.
+"""
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from resources.job_index import job_id_of
+from resources.models import JobSchema, ProfileSchema
+from settings import DATA_DIR, log
+from utils.columnar import parse_amount, parse_rating
+from utils.date_utils import datetime_now, relative_to_date
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    job_type TEXT,
+    posted_on TEXT,
+    posted_at TEXT,
+    workload TEXT,
+    budget TEXT,
+    budget_amount REAL,
+    duration TEXT,
+    contractor_tier TEXT,
+    tier_label TEXT,
+    description TEXT,
+    verification_status TEXT,
+    rating REAL,
+    spendings REAL,
+    country TEXT,
+    first_seen_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_skills (
+    job_id TEXT NOT NULL REFERENCES jobs (job_id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (job_id, skill)
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    account TEXT PRIMARY KEY,
+    full_name TEXT,
+    job_title TEXT,
+    employer TEXT,
+    employment_status TEXT,
+    data TEXT NOT NULL,
+    first_seen_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs (posted_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_country ON jobs (country);
+CREATE INDEX IF NOT EXISTS idx_job_skills_skill ON job_skills (skill);
+"""
+
+UPSERT_JOB = """
+INSERT INTO jobs (job_id, title, link, job_type, posted_on, posted_at, workload, budget,
+                  budget_amount, duration, contractor_tier, tier_label, description,
+                  verification_status, rating, spendings, country, first_seen_at, last_seen_at)
+VALUES (:job_id, :title, :link, :job_type, :posted_on, :posted_at, :workload, :budget,
+        :budget_amount, :duration, :contractor_tier, :tier_label, :description, :verification_status,
+        :rating, :spendings, :country, :seen_at, :seen_at)
+ON CONFLICT (job_id) DO UPDATE SET
+    title = excluded.title, link = excluded.link, job_type = excluded.job_type,
+    posted_on = excluded.posted_on,
+    -- The first scan has the most precise relative date, it only becomes coarser.
+    posted_at = coalesce(jobs.posted_at, excluded.posted_at), workload = excluded.workload, budget = excluded.budget,
+    budget_amount = excluded.budget_amount, duration = excluded.duration,
+    contractor_tier = excluded.contractor_tier, tier_label = excluded.tier_label,
+    description = excluded.description, verification_status = excluded.verification_status,
+    rating = excluded.rating, spendings = excluded.spendings, country = excluded.country,
+    last_seen_at = excluded.last_seen_at
+"""
+
+UPSERT_PROFILE = """
+INSERT INTO profiles (account, full_name, job_title, employer, employment_status, data,
+                      first_seen_at, last_seen_at)
+VALUES (:account, :full_name, :job_title, :employer, :employment_status, :data, :seen_at, :seen_at)
+ON CONFLICT (account) DO UPDATE SET
+    full_name = excluded.full_name, job_title = excluded.job_title, employer = excluded.employer,
+    employment_status = excluded.employment_status, data = excluded.data,
+    last_seen_at = excluded.last_seen_at
+"""
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class SqliteSink:
+    """
+    Write the jobs and profiles scanned into a SQLite database, in batched
+    transactions with upserts by the id of the job. The database is in WAL
+    mode and waits for the locks, so several scanners can write at the same time.
+    """
+
+    def __init__(self, path: Path = DATA_DIR / 'upwork.sqlite3',
+                 batch_size: int = 500, busy_timeout: float = 30) -> None:
+        """
+        :param path: File of the database, created if it doesn't exist.
+        :param batch_size: Jobs written per transaction.
+        :param busy_timeout: Seconds waiting while another process writes.
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are opened explicitly, see transaction.
+        self.connection = sqlite3.connect(self.path, timeout=busy_timeout, isolation_level=None)
+        self.connection.execute(f'PRAGMA busy_timeout = {int(busy_timeout * 1000)}')
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transaction which takes the lock of writing from the start, so two
+        processes never wait for each other to upgrade their locks."""
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+
+    @staticmethod
+    def job_row(job: JobSchema, seen_at: datetime) -> Dict[str, Optional[object]]:
+        """
+        Columns of the job. The posted_on is relative to the scan, so it is
+        kept as posted_at, the date it refers to, or the scan if it can't be read.
+        """
+        return {
+            **job.model_dump(mode='json', exclude={'skills'}),
+            'job_id': job_id_of(str(job.link)),
+            'posted_at': (relative_to_date(job.posted_on, seen_at) or seen_at).isoformat(),
+            'budget_amount': parse_amount(job.budget),
+            'rating': parse_rating(job.rating),
+            'spendings': parse_amount(job.spendings),
+            'seen_at': seen_at.isoformat(),
+        }
+
+    def write_jobs(self, jobs: Iterable[JobSchema]) -> int:
+        """
+        Upsert the jobs and replace their skills, batch_size jobs per transaction.
+        :return: Quantity of jobs written.
+        """
+        seen_at = datetime_now()
+        count = 0
+        for batch in batched(jobs, self.batch_size):
+            rows = [self.job_row(job, seen_at) for job in batch]
+            skills = {(row['job_id'], skill) for row, job in zip(rows, batch) for skill in job.skills}
+            with self.transaction():
+                self.connection.executemany(UPSERT_JOB, rows)
+                self.connection.executemany('DELETE FROM job_skills WHERE job_id = ?',
+                                            [(row['job_id'],) for row in rows])
+                self.connection.executemany('INSERT INTO job_skills (job_id, skill) VALUES (?, ?)',
+                                            sorted(skills))
+            count += len(rows)
+        return count
+
+    def write_profile(self, profile: ProfileSchema) -> None:
+        """Upsert the profile by its account."""
+        with self.transaction():
+            self.connection.execute(UPSERT_PROFILE, {
+                'account': profile.account, 'full_name': profile.full_name,
+                'job_title': profile.job_title, 'employer': profile.employer,
+                'employment_status': profile.employment_status,
+                'data': profile.model_dump_json(), 'seen_at': datetime_now().isoformat(),
+            })
+
+    def write(self, jobs: Iterable[JobSchema], profile: Optional[ProfileSchema] = None) -> Dict[str, float]:
+        """
+        Write a scan, logging the throughput.
+        :return: Jobs written, seconds and jobs per second.
+        """
+        start = time.perf_counter()
+        count = self.write_jobs(jobs)
+        if profile is not None:
+            self.write_profile(profile)
+        seconds = time.perf_counter() - start
+        report = {'jobs': count, 'seconds': round(seconds, 4),
+                  'jobs_per_second': round(count / seconds, 1) if seconds else 0.0}
+        log.info(f'Scan written into {self.path}: {report}')
+        return report
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'SqliteSink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()